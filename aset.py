@@ -45,15 +45,14 @@ class ASet(Set[T]):
     def add(self, item: T) -> None:
         """ Adds an element to the set. Note that an element already
         present in the set should not be added.
-        :pre: the set is not full
-        :raises Exception: if the set is full.
+        :pre: the set is not full, or already contains the element
+        :raises Exception: if the set is full and the element is not in it.
         """
-        if self.is_full():
-            raise Exception("Set is full")
-        else:
-            if not item in self:
-                self.array[self.size] = item
-                self.size += 1
+        if not item in self:
+            if self.is_full():
+                raise Exception("Set is full")
+            self.array[self.size] = item
+            self.size += 1
 
 
     def remove(self, item: T) -> None:
@@ -3,12 +3,15 @@ from pokemon_base import *
 from pokemon import *
 from typing import Tuple
 from battle_mode import BattleMode
+from damage_matrix import DamageMatrix
+from fingerprint import battle_fingerprint
+from events import EventSink, TextSink, PRINT_SINK
 import random
 import math 
 """
 Unless stated otherwise, all functions in this file are O(1) best/worst case.
 """
-def attacks(attacker, defender, multiplier):
+def attacks(attacker, defender, multiplier, sink: EventSink = PRINT_SINK):
     """
     Executes an attack action between two Pokémon.
 
@@ -16,40 +19,47 @@ def attacks(attacker, defender, multiplier):
         attacker: The attacking Pokémon object.
         defender: The defending Pokémon object.
         multiplier: The multiplier applied to the attack.
+        sink (EventSink): The sink the attack is reported to (by default, it is printed).
 
     Returns:
         None
     """
-    # Perform the attack action by calling the defend method of the defender
-    # and passing the result of the attacking Pokémon's attack method multiplied by the multiplier
-    defender.defend(math.ceil(attacker.attack(defender) * multiplier))
+    if attacker.scale == 1:
+        # Perform the attack action by calling the defend method of the defender
+        # and passing the attacking Pokémon's damage (looked up from the damage matrix) multiplied by the multiplier
+        defender.defend(math.ceil(DamageMatrix.get_damage(attacker, defender) * multiplier))
+    else:
+        # In fixed-point mode the same damage is worked out with integer arithmetic, and scaled back
+        # to fixed-point units for defend
+        defender.defend(fixed_ceil_multiply(DamageMatrix.get_fixed_damage(attacker, defender), multiplier) * FIXED_POINT_SCALE)
 
-    # Print the attack message indicating the attacker, defender, and the defender's remaining health
-    print(f"{attacker.get_name()} attacks {defender.get_name()}: {defender.get_name()} has {round(defender.get_health())} health")
+    # Report the attack, with the attacker, defender, and the defender's remaining health
+    sink.attack(attacker, defender)
 
         
-def lvl_faints(lvl_up, faints):
+def lvl_faints(lvl_up, faints, sink: EventSink = PRINT_SINK):
     """
     Handles the fainting of a Pokémon.
 
     Args:
         lvl_up: The Pokémon that leveled up.
         faints: The Pokémon that fainted.
+        sink (EventSink): The sink the faint and level up are reported to (by default, they are printed).
 
     Returns:
         None
     """
-    # Print a message indicating that the faints Pokémon has fainted
-    print(f"{faints.get_name()} fainted")
+    # Report that the faints Pokémon has fainted
+    sink.faint(faints)
 
     # Level up the lvl_up Pokémon
     lvl_up.level_up()
 
-    # Print a message indicating the lvl_up Pokémon has grown to a new level
-    print(f"{lvl_up.get_name()} grew to level {lvl_up.get_level()}")
+    # Report that the lvl_up Pokémon has grown to a new level
+    sink.level_up(lvl_up)
 
 
-def battle_turn_set(faster_mon, slower_mon, faster_team, slower_team, pokedex1, pokedex2):
+def battle_turn_set(faster_mon, slower_mon, faster_team, slower_team, faster_multiplier, slower_multiplier, sink: EventSink = PRINT_SINK):
     """
     Executes a battle turn in the set mode.
 
@@ -58,25 +68,27 @@ def battle_turn_set(faster_mon, slower_mon, faster_team, slower_team, pokedex1,
         slower_mon: The Pokémon being attacked.
         faster_team: The team of the faster Pokémon.
         slower_team: The team of the slower Pokémon.
-        pokedex1: The completion percentage of the Pokédex of the faster Pokémon's trainer.
-        pokedex2: The completion percentage of the Pokédex of the slower Pokémon's trainer.
+        faster_multiplier: The multiplier the faster Pokémon attacks with (see Trainer.multiplier_against).
+        slower_multiplier: The multiplier the slower Pokémon attacks with.
+        sink (EventSink): The sink the turn is reported to (by default, it is printed).
 
     Returns:
         None
     """
     # Attack by the faster_mon on the slower_mon with a certain multiplier
-    attacks(faster_mon, slower_mon, pokedex1/pokedex2)
+    attacks(faster_mon, slower_mon, faster_multiplier, sink)
 
     # Check if the slower_mon is still alive after the attack
     if slower_mon.get_health() > 0:
         # Attack by the slower_mon on the faster_mon with a certain multiplier
-        attacks(slower_mon, faster_mon, pokedex2/pokedex1)
+        attacks(slower_mon, faster_mon, slower_multiplier, sink)
 
         # Check if the faster_mon is still alive after the attack
         if faster_mon.get_health() > 0:
             # Decrease health of both Pokémon
-            faster_mon.health -= 1
-            slower_mon.health -= 1
+            faster_mon.health -= faster_mon.scale
+            slower_mon.health -= slower_mon.scale
+            sink.end_turn(faster_mon, slower_mon)
 
             # Check the state of both Pokémon after the attacks
             if faster_mon.is_alive() and slower_mon.is_alive():
@@ -85,27 +97,27 @@ def battle_turn_set(faster_mon, slower_mon, faster_team, slower_team, pokedex1,
                 slower_team.push(slower_mon)
             elif slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where faster_mon fainted
-                lvl_faints(slower_mon, faster_mon)
+                lvl_faints(slower_mon, faster_mon, sink)
                 slower_team.push(slower_mon)
             elif not slower_mon.is_alive() and faster_mon.is_alive():
                 # Handle the case where slower_mon fainted
-                lvl_faints(faster_mon, slower_mon)
+                lvl_faints(faster_mon, slower_mon, sink)
                 faster_team.push(faster_mon) 
             elif not slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where both Pokémon fainted
-                print('Both pokemon fainted')
+                sink.both_fainted()
 
         else:
             # Handle the case where faster_mon fainted
-            lvl_faints(slower_mon, faster_mon)
+            lvl_faints(slower_mon, faster_mon, sink)
             slower_team.push(slower_mon)
     else:
         # Handle the case where slower_mon fainted
-        lvl_faints(faster_mon, slower_mon)
+        lvl_faints(faster_mon, slower_mon, sink)
         faster_team.push(faster_mon)
 
 
-def battle_turn_rotate(faster_mon, slower_mon, faster_team, slower_team, pokedex1, pokedex2):
+def battle_turn_rotate(faster_mon, slower_mon, faster_team, slower_team, faster_multiplier, slower_multiplier, sink: EventSink = PRINT_SINK):
     """
     Executes a battle turn in the rotate mode.
 
@@ -114,25 +126,27 @@ def battle_turn_rotate(faster_mon, slower_mon, faster_team, slower_team, pokedex
         slower_mon: The Pokémon being attacked.
         faster_team: The team of the faster Pokémon.
         slower_team: The team of the slower Pokémon.
-        pokedex1: The completion percentage of the Pokédex of the faster Pokémon's trainer.
-        pokedex2: The completion percentage of the Pokédex of the slower Pokémon's trainer.
+        faster_multiplier: The multiplier the faster Pokémon attacks with (see Trainer.multiplier_against).
+        slower_multiplier: The multiplier the slower Pokémon attacks with.
+        sink (EventSink): The sink the turn is reported to (by default, it is printed).
 
     Returns:
         None
     """
     # Attack by the faster_mon on the slower_mon with a certain multiplier
-    attacks(faster_mon, slower_mon, pokedex1/pokedex2) 
+    attacks(faster_mon, slower_mon, faster_multiplier, sink) 
 
     # Check if slower_mon is alive after the attack
     if slower_mon.is_alive():
         # Attack by slower_mon on faster_mon with a certain multiplier
-        attacks(slower_mon, faster_mon, pokedex2/pokedex1)
+        attacks(slower_mon, faster_mon, slower_multiplier, sink)
 
         # Check if faster_mon is alive after the attack
         if faster_mon.is_alive():
             # Decrease health of both Pokémon
-            faster_mon.health -= 1
-            slower_mon.health -= 1
+            faster_mon.health -= faster_mon.scale
+            slower_mon.health -= slower_mon.scale
+            sink.end_turn(faster_mon, slower_mon)
 
             # Check the state of both Pokémon after the attacks
             if faster_mon.is_alive() and slower_mon.is_alive():
@@ -141,23 +155,23 @@ def battle_turn_rotate(faster_mon, slower_mon, faster_team, slower_team, pokedex
                 slower_team.append(slower_mon)
             elif slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where faster_mon fainted
-                lvl_faints(slower_mon, faster_mon)
+                lvl_faints(slower_mon, faster_mon, sink)
                 slower_team.append(slower_mon)
             elif not slower_mon.is_alive() and faster_mon.is_alive():
                 # Handle the case where slower_mon fainted
-                lvl_faints(faster_mon, slower_mon)
+                lvl_faints(faster_mon, slower_mon, sink)
                 faster_team.append(faster_mon) 
             elif not slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where both Pokémon fainted
-                print('Both pokemon fainted')
+                sink.both_fainted()
 
         else:
             # Handle the case where faster_mon fainted
-            lvl_faints(slower_mon, faster_mon)
+            lvl_faints(slower_mon, faster_mon, sink)
             slower_team.append(slower_mon)
     else:
         # Handle the case where slower_mon fainted
-        lvl_faints(faster_mon, slower_mon)
+        lvl_faints(faster_mon, slower_mon, sink)
         faster_team.append(faster_mon)
 
 
@@ -166,41 +180,30 @@ def add_back_to_team(criterion, team, mon, special):
     Adds a Pokémon back to an optimised team with adjustments based on a given criterion.
 
     Args:
-        criterion (str): The criterion for adjustment ('health', 'level', 'attack', 'defence', 'speed').
-        team (list): The team to which the Pokémon is added.
+        criterion: The criterion for adjustment ('health', 'level', 'attack', 'defence', 'speed'),
+            or its key function from PokeTeam.criterion_key.
+        team (ArraySortedList): The team to which the Pokémon is added.
         mon: The Pokémon to be added back to the team.
         special (bool): A flag indicating whether to apply special adjustments.
 
     Returns:
         None
     """
+    # Work out the key for the criterion (fixed-point stats are scaled back to match the keys the team was sorted by)
+    key_of = criterion if callable(criterion) else PokeTeam.criterion_key(criterion)
+    if key_of is None:
+        return
+    key = key_of(mon)
+
     if special:
         # Apply special adjustments based on the criterion
-        if criterion == 'health':
-            team.add(ListItem(mon, mon.get_health() * (-1)))
-        elif criterion == 'level':
-            team.add(ListItem(mon, mon.get_level() * (-1)))
-        elif criterion == 'attack':
-            team.add(ListItem(mon, mon.get_attack() * (-1)))
-        elif criterion == 'defence':
-            team.add(ListItem(mon, mon.get_defence() * (-1)))
-        elif criterion == 'speed':
-            team.add(ListItem(mon, mon.get_speed() * (-1)))
+        team.add(ListItem(mon, key * (-1)))
     else:
         # Add the Pokémon back to the team without adjustments
-        if criterion == 'health':
-            team.add(ListItem(mon, mon.get_health()))
-        elif criterion == 'level':
-            team.add(ListItem(mon, mon.get_level()))
-        elif criterion == 'attack':
-            team.add(ListItem(mon, mon.get_attack()))
-        elif criterion == 'defence':
-            team.add(ListItem(mon, mon.get_defence()))
-        elif criterion == 'speed':
-            team.add(ListItem(mon, mon.get_speed()))
-
-
-def battle_turn_optimise(criterion, faster_mon, slower_mon, faster_team, slower_team, pokedex1, pokedex2, special):
+        team.add(ListItem(mon, key))
+
+
+def battle_turn_optimise(criterion, faster_mon, slower_mon, faster_team, slower_team, faster_multiplier, slower_multiplier, special, sink: EventSink = PRINT_SINK):
     """
     Executes a battle turn with optimization based on a given criterion.
 
@@ -210,26 +213,28 @@ def battle_turn_optimise(criterion, faster_mon, slower_mon, faster_team, slower_
         slower_mon: The Pokémon being attacked.
         faster_team: The team of the faster Pokémon.
         slower_team: The team of the slower Pokémon.
-        pokedex1: The completion percentage of the Pokédex of the faster Pokémon's trainer.
-        pokedex2: The completion percentage of the Pokédex of the slower Pokémon's trainer.
+        faster_multiplier: The multiplier the faster Pokémon attacks with (see Trainer.multiplier_against).
+        slower_multiplier: The multiplier the slower Pokémon attacks with.
         special: A boolean indicating whether to apply special adjustments to the team based on the criterion.
+        sink (EventSink): The sink the turn is reported to (by default, it is printed).
 
     Returns:
         None
     """
     # Attack by faster_mon on slower_mon with a certain multiplier
-    attacks(faster_mon, slower_mon, pokedex1 / pokedex2)
+    attacks(faster_mon, slower_mon, faster_multiplier, sink)
 
     # Check if slower_mon is alive after the attack
     if slower_mon.get_health() > 0:
         # Attack by slower_mon on faster_mon with a certain multiplier
-        attacks(slower_mon, faster_mon, pokedex2 / pokedex1)
+        attacks(slower_mon, faster_mon, slower_multiplier, sink)
 
         # Check if faster_mon is alive after the attack
         if faster_mon.get_health() > 0:
             # Decrease health of both Pokémon
-            faster_mon.health -= 1
-            slower_mon.health -= 1
+            faster_mon.health -= faster_mon.scale
+            slower_mon.health -= slower_mon.scale
+            sink.end_turn(faster_mon, slower_mon)
 
             # Check the state of both Pokémon after the attacks
             if faster_mon.is_alive() and slower_mon.is_alive():
@@ -238,23 +243,23 @@ def battle_turn_optimise(criterion, faster_mon, slower_mon, faster_team, slower_
                 add_back_to_team(criterion, slower_team, slower_mon, special)
             elif slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where faster_mon fainted
-                lvl_faints(slower_mon, faster_mon)
+                lvl_faints(slower_mon, faster_mon, sink)
                 add_back_to_team(criterion, slower_team, slower_mon, special)
             elif not slower_mon.is_alive() and faster_mon.is_alive():
                 # Handle the case where slower_mon fainted
-                lvl_faints(faster_mon, slower_mon)
+                lvl_faints(faster_mon, slower_mon, sink)
                 add_back_to_team(criterion, faster_team, faster_mon, special) 
             elif not slower_mon.is_alive() and not faster_mon.is_alive():
                 # Handle the case where both Pokémon fainted
-                print('Both pokemon fainted')
+                sink.both_fainted()
 
         else:
             # Handle the case where faster_mon fainted
-            lvl_faints(slower_mon, faster_mon)
+            lvl_faints(slower_mon, faster_mon, sink)
             add_back_to_team(criterion, slower_team, slower_mon, special) 
     else:
         # Handle the case where slower_mon fainted
-        lvl_faints(faster_mon, slower_mon)
+        lvl_faints(faster_mon, slower_mon, sink)
         add_back_to_team(criterion, faster_team, faster_mon, special)
 
 
@@ -264,7 +269,7 @@ class Battle:
 
     Unless stated otherwise, all methods in this class are O(1) best/worst case.
     """
-    def __init__(self, trainer_1: Trainer, trainer_2: Trainer, battle_mode: BattleMode, criterion='health') -> None:
+    def __init__(self, trainer_1: Trainer, trainer_2: Trainer, battle_mode: BattleMode, criterion='health', fixed_point=False, sink: EventSink = None) -> None:
         """
         Initializes a Battle instance.
 
@@ -273,6 +278,10 @@ class Battle:
             trainer_2 (Trainer): The second trainer participating in the battle.
             battle_mode (BattleMode): The mode of the battle (e.g., 'set' or 'rotate').
             criterion (str): The criterion used for adjustments (default is 'health').
+            fixed_point (bool): Whether to battle with exact integer (fixed-point) stats and damage.
+                The outcome is the same as battling with float stats.
+            sink (EventSink): The sink the battle is reported to. By default the battle is printed,
+                in batches of lines written when the sink is full and when the battle ends.
 
         Returns:
             None
@@ -283,12 +292,50 @@ class Battle:
         self.teams = None
         self.regen_teams = None
         self.criterion = criterion
+        self.fixed_point = fixed_point
+        self.sink = sink if sink is not None else TextSink()
 
 
     def commence_battle(self) -> Trainer | None:
         """
         Initiates the battle based on the chosen battle mode.
 
+        Returns:
+            Trainer or None: The winning trainer or None if the battle does not conclude.
+        """
+        if self.fixed_point:
+            # Switch every Pokémon to fixed-point stats for the battle, and back again afterwards
+            teams = (self.t_1.pokemon_team, self.t_2.pokemon_team)
+            members = [team[i] for team in teams for i in range(len(team))]
+            for pokemon in members:
+                pokemon.to_fixed_point()
+            try:
+                return self._run_battle()
+            finally:
+                for pokemon in members:
+                    pokemon.from_fixed_point()
+        return self._run_battle()
+
+    def _run_battle(self) -> Trainer | None:
+        """
+        Runs the battle method for the chosen battle mode, telling the sink when the battle
+        starts and finishes, and writes out what the sink holds on to when it ends.
+
+        Returns:
+            Trainer or None: The winning trainer or None if the battle does not conclude.
+        """
+        self.sink.start(self)
+        try:
+            winner = self._run_battle_mode()
+            self.sink.finish(self, winner)
+            return winner
+        finally:
+            self.sink.flush()
+
+    def _run_battle_mode(self) -> Trainer | None:
+        """
+        Runs the battle method for the chosen battle mode.
+
         Returns:
             Trainer or None: The winning trainer or None if the battle does not conclude.
         """
@@ -321,7 +368,12 @@ class Battle:
         # Let both trainers pick their teams
         self.t_1.pick_team('Random')
         self.t_2.pick_team('Random')
-        
+        self._assemble_teams()
+
+    def _assemble_teams(self) -> None:
+        """
+        Assembles the teams both trainers have picked based on the battle mode.
+        """
         # Depending on the battle mode, assemble the teams accordingly
         if self.battle_mode.value == 0:
             # For "set" battle mode, assemble teams with the "SET" strategy
@@ -348,6 +400,36 @@ class Battle:
         # Return the assembled teams
         return self.teams
 
+    def fingerprint(self) -> int:
+        """
+        Returns a stable 64-bit fingerprint of the battle setup: both teams, the battle mode, the
+        criterion and both Pokedexes, so the results of battles can be cached by their setup.
+
+        Complexity Analysis:
+            Best case is O(1), when both teams' fingerprints are attached to their containers.
+            Worst case is O(n + m), where n and m are the sizes of the teams, the first time
+            (see PokeTeam.fingerprint).
+        """
+        return battle_fingerprint(self)
+
+    def _record_faints(self, mon1, mon2) -> None:
+        """
+        Takes the Pokemon that fainted in a turn out of their teams' offence and defence vectors.
+        Every Pokemon that survives a turn goes back to its team, so fainting is the only way a
+        member leaves a team during a battle.
+
+        Args:
+            mon1: The Pokemon the first team battled with in the turn.
+            mon2: The Pokemon the second team battled with in the turn.
+
+        Complexity Analysis:
+            Best and worst case are O(t), where t is the number of PokeTypes.
+        """
+        if not mon1.is_alive():
+            self.t_1.pokemon_team.remove_member(mon1)
+        if not mon2.is_alive():
+            self.t_2.pokemon_team.remove_member(mon2)
+
 
     def set_battle(self) -> PokeTeam | None:
         """
@@ -369,33 +451,37 @@ class Battle:
         Within each iteration, there are constant-time operations such as popping, pushing, determining attack order, and resolving attacks.
         Overall, the worst-case time complexity is O(n+m), where n is the maximum number of Pokémon in one team, and m is the number of pokemon in the other team.
         """
+        multipliers = None
         while not self.teams[0].is_empty() and not self.teams[1].is_empty():
             # Pop the next Pokemon from each team
             mon1 = self.teams[0].pop() 
             mon2 = self.teams[1].pop()
-            # Register the Pokemon for each trainer
-            self.t_2.register_pokemon(mon1)
-            self.t_1.register_pokemon(mon2)
+            # Register the Pokemon for each trainer, and only work the multipliers out again if
+            # either Pokedex changed
+            if self.t_2.register_pokemon(mon1) | self.t_1.register_pokemon(mon2) or multipliers is None:
+                multipliers = (self.t_1.multiplier_against(self.t_2), self.t_2.multiplier_against(self.t_1))
+            multiplier_1, multiplier_2 = multipliers
 
             # Determine which Pokemon attacks first based on speed
             if mon1.get_speed() > mon2.get_speed():
                 # If mon1 is faster, it attacks first
-                battle_turn_set(mon1, mon2, self.teams[0], self.teams[1], self.t_1.get_pokedex_completion(), self.t_2.get_pokedex_completion())
+                battle_turn_set(mon1, mon2, self.teams[0], self.teams[1], multiplier_1, multiplier_2, self.sink)
             
             elif mon2.get_speed() > mon1.get_speed():
                 # If mon2 is faster, it attacks first
-                battle_turn_set(mon2, mon1, self.teams[1], self.teams[0], self.t_2.get_pokedex_completion(), self.t_1.get_pokedex_completion())
+                battle_turn_set(mon2, mon1, self.teams[1], self.teams[0], multiplier_2, multiplier_1, self.sink)
             
             else:
                 # If both Pokemon have the same speed, they attack simultaneously
-                attacks(mon2, mon1, (self.t_2.get_pokedex_completion()/self.t_1.get_pokedex_completion()))
-                attacks(mon1, mon2, (self.t_1.get_pokedex_completion()/self.t_2.get_pokedex_completion()))
+                attacks(mon2, mon1, multiplier_2, self.sink)
+                attacks(mon1, mon2, multiplier_1, self.sink)
                 
                 # Handle the aftermath of the simultaneous attack
                 if mon1.get_health() > 0 and mon2.get_health() > 0:
                     # If both Pokemon survive, they each lose 1 health point
-                    mon1.health -= 1
-                    mon2.health -= 1
+                    mon1.health -= mon1.scale
+                    mon2.health -= mon2.scale
+                    self.sink.end_turn(mon1, mon2)
                     
                     if mon1.get_health() > 0 and mon2.get_health() > 0:
                         # If both Pokemon still have health, push them back to their teams
@@ -404,33 +490,35 @@ class Battle:
                     
                     elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                         # If mon2 faints, handle the fainting
-                        lvl_faints(mon1, mon2)
+                        lvl_faints(mon1, mon2, self.sink)
                         self.teams[0].push(mon1)
                     
                     elif mon2.get_health() > 0 and not mon1.get_health() > 0:
                         # If mon1 faints, handle the fainting
-                        lvl_faints(mon2, mon1)
+                        lvl_faints(mon2, mon1, self.sink)
                         self.teams[1].push(mon2)
                     
                     elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                        # If both Pokemon faint, print a message
-                        print(f"{mon1.get_name()} fainted")
-                        print(f"{mon2.get_name()} fainted")
+                        # If both Pokemon faint, report both faints
+                        self.sink.faint(mon1)
+                        self.sink.faint(mon2)
                         
                 elif not mon1.get_health() > 0 and mon2.get_health() > 0:
                     # If mon1 faints, handle the fainting
-                    lvl_faints(mon2, mon1)
+                    lvl_faints(mon2, mon1, self.sink)
                     self.teams[1].push(mon2)
                 
                 elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                     # If mon2 faints, handle the fainting
-                    lvl_faints(mon1, mon2)
+                    lvl_faints(mon1, mon2, self.sink)
                     self.teams[0].push(mon1)
 
                 elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                    # If both Pokemon faint, print a message
-                    print(f"{mon1.get_name()} fainted")
-                    print(f"{mon2.get_name()} fainted")
+                    # If both Pokemon faint, report both faints
+                    self.sink.faint(mon1)
+                    self.sink.faint(mon2)
+            # Take the Pokemon that fainted out of their teams' type vectors
+            self._record_faints(mon1, mon2)
         # Return the winning trainer or None if it's a tie
         if self.teams[0].is_empty() and self.teams[1].is_empty():
             return None
@@ -461,33 +549,37 @@ class Battle:
         Overall, the worst-case time complexity is O(n+m), where n is the maximum number of Pokémon in one team, and m is the number of pokemon in the other team.
         """
 
+        multipliers = None
         while not self.teams[0].is_empty() and not self.teams[1].is_empty():
             # Serve the next Pokemon from each team
             mon1 = self.teams[0].serve() 
             mon2 = self.teams[1].serve()
-            # Register the Pokemon for each trainer
-            self.t_2.register_pokemon(mon1)
-            self.t_1.register_pokemon(mon2)
+            # Register the Pokemon for each trainer, and only work the multipliers out again if
+            # either Pokedex changed
+            if self.t_2.register_pokemon(mon1) | self.t_1.register_pokemon(mon2) or multipliers is None:
+                multipliers = (self.t_1.multiplier_against(self.t_2), self.t_2.multiplier_against(self.t_1))
+            multiplier_1, multiplier_2 = multipliers
 
             # Determine which Pokemon attacks first based on speed
             if mon1.get_speed() > mon2.get_speed():
                 # If mon1 is faster, it attacks first
-                battle_turn_rotate(mon1, mon2, self.teams[0], self.teams[1], self.t_1.get_pokedex_completion(), self.t_2.get_pokedex_completion())
+                battle_turn_rotate(mon1, mon2, self.teams[0], self.teams[1], multiplier_1, multiplier_2, self.sink)
                 
             elif mon2.get_speed() > mon1.get_speed():
                 # If mon2 is faster, it attacks first
-                battle_turn_rotate(mon2, mon1, self.teams[1], self.teams[0], self.t_2.get_pokedex_completion(), self.t_1.get_pokedex_completion())
+                battle_turn_rotate(mon2, mon1, self.teams[1], self.teams[0], multiplier_2, multiplier_1, self.sink)
             
             else:
                 # If both Pokemon have the same speed, they attack simultaneously
-                attacks(mon2, mon1, (self.t_2.get_pokedex_completion()/self.t_1.get_pokedex_completion()))
-                attacks(mon1, mon2, (self.t_1.get_pokedex_completion()/self.t_2.get_pokedex_completion()))
+                attacks(mon2, mon1, multiplier_2, self.sink)
+                attacks(mon1, mon2, multiplier_1, self.sink)
                 
                 # Handle the aftermath of the simultaneous attack
                 if mon1.get_health() > 0 and mon2.get_health() > 0:
                     # If both Pokemon survive, they each lose 1 health point
-                    mon1.health -= 1
-                    mon2.health -= 1
+                    mon1.health -= mon1.scale
+                    mon2.health -= mon2.scale
+                    self.sink.end_turn(mon1, mon2)
                     
                     if mon1.get_health() > 0 and mon2.get_health() > 0:
                         # If both Pokemon still have health, append them back to their teams
@@ -496,33 +588,35 @@ class Battle:
                     
                     elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                         # If mon2 faints, handle the fainting
-                        lvl_faints(mon1, mon2)
+                        lvl_faints(mon1, mon2, self.sink)
                         self.teams[0].append(mon1)
                     
                     elif mon2.get_health() > 0 and not mon1.get_health() > 0:
                         # If mon1 faints, handle the fainting
-                        lvl_faints(mon2, mon1)
+                        lvl_faints(mon2, mon1, self.sink)
                         self.teams[1].append(mon2)
                     
                     elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                        # If both Pokemon faint, print a message
-                        print(f"{mon1.get_name()} fainted")
-                        print(f"{mon2.get_name()} fainted")
+                        # If both Pokemon faint, report both faints
+                        self.sink.faint(mon1)
+                        self.sink.faint(mon2)
                         
                 elif not mon1.get_health() > 0 and mon2.get_health() > 0:
                     # If mon1 faints, handle the fainting
-                    lvl_faints(mon2, mon1)
+                    lvl_faints(mon2, mon1, self.sink)
                     self.teams[1].append(mon2)
                 
                 elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                     # If mon2 faints, handle the fainting
-                    lvl_faints(mon1, mon2)
+                    lvl_faints(mon1, mon2, self.sink)
                     self.teams[0].append(mon1)
 
                 elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                    # If both Pokemon faint, print a message
-                    print(f"{mon1.get_name()} fainted")
-                    print(f"{mon2.get_name()} fainted")
+                    # If both Pokemon faint, report both faints
+                    self.sink.faint(mon1)
+                    self.sink.faint(mon2)
+            # Take the Pokemon that fainted out of their teams' type vectors
+            self._record_faints(mon1, mon2)
         # Return the winning trainer or None if it's a tie
         if self.teams[0].is_empty() and self.teams[1].is_empty():
             return None
@@ -553,6 +647,9 @@ class Battle:
         Within each iteration, there are constant-time operations such as popping, pushing, determining attack order, and resolving attacks.
         Overall, the worst-case time complexity is O(n+m), where n is the maximum number of Pokémon in one team, and m is the number of pokemon in the other team.
         """
+        # Look the criterion up once for the whole battle
+        criterion_key = PokeTeam.criterion_key(self.criterion)
+        multipliers = None
         while not self.teams[0].is_empty() and not self.teams[1].is_empty():
 
             # Serve the next Pokemon from each team
@@ -561,63 +658,68 @@ class Battle:
             mon2 = self.teams[1][0].value
             self.teams[1].delete_at_index(0)
         
-            # Register the Pokemon for each trainer
-            self.t_2.register_pokemon(mon1)
-            self.t_1.register_pokemon(mon2)
+            # Register the Pokemon for each trainer, and only work the multipliers out again if
+            # either Pokedex changed
+            if self.t_2.register_pokemon(mon1) | self.t_1.register_pokemon(mon2) or multipliers is None:
+                multipliers = (self.t_1.multiplier_against(self.t_2), self.t_2.multiplier_against(self.t_1))
+            multiplier_1, multiplier_2 = multipliers
             
             # Determine which Pokemon attacks first based on speed
             if mon1.get_speed() > mon2.get_speed():
                 # If mon1 is faster, it attacks first
-                battle_turn_optimise(self.criterion, mon1, mon2, self.teams[0], self.teams[1], self.t_1.get_pokedex_completion(), self.t_2.get_pokedex_completion(), self.t_1.pokemon_team.reversed)
+                battle_turn_optimise(criterion_key, mon1, mon2, self.teams[0], self.teams[1], multiplier_1, multiplier_2, self.t_1.pokemon_team.reversed, self.sink)
             
             elif mon1.get_speed() < mon2.get_speed():
                 # If mon2 is faster, it attacks first
-                battle_turn_optimise(self.criterion, mon2, mon1, self.teams[1], self.teams[0], self.t_2.get_pokedex_completion(), self.t_1.get_pokedex_completion(), self.t_1.pokemon_team.reversed)
+                battle_turn_optimise(criterion_key, mon2, mon1, self.teams[1], self.teams[0], multiplier_2, multiplier_1, self.t_1.pokemon_team.reversed, self.sink)
                 
             else:
                 # If both Pokemon have the same speed, they attack simultaneously
-                attacks(mon2, mon1, (self.t_2.get_pokedex_completion()/self.t_1.get_pokedex_completion()))
-                attacks(mon1, mon2, (self.t_1.get_pokedex_completion()/self.t_2.get_pokedex_completion()))
+                attacks(mon2, mon1, multiplier_2, self.sink)
+                attacks(mon1, mon2, multiplier_1, self.sink)
                 
                 # Handle the aftermath of the simultaneous attack
                 if mon1.get_health() > 0 and mon2.get_health() > 0:
-                    mon1.health -= 1
-                    mon2.health -= 1
+                    mon1.health -= mon1.scale
+                    mon2.health -= mon2.scale
+                    self.sink.end_turn(mon1, mon2)
                     
                     if mon1.get_health() > 0 and mon2.get_health() > 0:
                         # If both Pokemon still have health, add them back to their teams
-                        add_back_to_team(self.criterion, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
-                        add_back_to_team(self.criterion, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
+                        add_back_to_team(criterion_key, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
+                        add_back_to_team(criterion_key, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
                     
                     elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                         # If mon2 faints, handle the fainting
-                        lvl_faints(mon1, mon2)
-                        add_back_to_team(self.criterion, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
+                        lvl_faints(mon1, mon2, self.sink)
+                        add_back_to_team(criterion_key, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
                     
                     elif mon2.get_health() > 0 and not mon1.get_health() > 0:
                         # If mon1 faints, handle the fainting
-                        lvl_faints(mon2, mon1)
-                        add_back_to_team(self.criterion, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
+                        lvl_faints(mon2, mon1, self.sink)
+                        add_back_to_team(criterion_key, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
                     
                     elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                        # If both Pokemon faint, print a message
-                        print(f"{mon1.get_name()} fainted")
-                        print(f"{mon2.get_name()} fainted")
+                        # If both Pokemon faint, report both faints
+                        self.sink.faint(mon1)
+                        self.sink.faint(mon2)
                         
                 elif not mon1.get_health() > 0 and mon2.get_health() > 0:
                     # If mon1 faints, handle the fainting
-                    lvl_faints(mon2, mon1)
-                    add_back_to_team(self.criterion, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
+                    lvl_faints(mon2, mon1, self.sink)
+                    add_back_to_team(criterion_key, self.teams[1], mon2, self.t_1.pokemon_team.reversed)
                 
                 elif mon1.get_health() > 0 and not mon2.get_health() > 0:
                     # If mon2 faints, handle the fainting
-                    lvl_faints(mon1, mon2)
-                    add_back_to_team(self.criterion, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
+                    lvl_faints(mon1, mon2, self.sink)
+                    add_back_to_team(criterion_key, self.teams[0], mon1, self.t_1.pokemon_team.reversed)
 
                 elif not mon2.get_health() > 0 and not mon1.get_health() > 0:
-                    # If both Pokemon faint, print a message
-                    print(f"{mon1.get_name()} fainted")
-                    print(f"{mon2.get_name()} fainted")
+                    # If both Pokemon faint, report both faints
+                    self.sink.faint(mon1)
+                    self.sink.faint(mon2)
+            # Take the Pokemon that fainted out of their teams' type vectors
+            self._record_faints(mon1, mon2)
 
         # Return the winning trainer or None if it's a tie
         if self.teams[0].is_empty() and self.teams[1].is_empty():
@@ -0,0 +1,207 @@
+"""
+This module contains BinaryLogSink, which records a battle as a compact binary log, and replay,
+which rebuilds the end of a battle (the state of every Pokemon, the surviving teams and the
+winner) from its log and its starting teams, without running the battle again.
+
+A log is a header followed by fixed-size records:
+- The header holds the battle mode, the size of both teams and a fingerprint of the starting
+  teams, so a log can only be replayed with the teams it was recorded with.
+- Every attack, faint, level up, evolution and end of turn is one record, which names the
+  Pokemon by its member number (its index in the first team, or the size of the first team plus
+  its index in the second) and holds its health afterwards, in fixed-point units.
+- The last records are the result, and one record for each surviving member in team order,
+  holding its final state, so replaying a log also checks it.
+
+Unless stated otherwise, all functions in this file are O(1) best/worst case.
+"""
+import struct
+from enum import IntEnum
+from typing import NamedTuple
+from events import EventSink
+from fingerprint import combine, fixed_health, pokemon_fingerprint
+from pokemon_pool import PokemonPool
+
+MAGIC = b"PKBL"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHHQ")  # magic, version, battle mode, size of each team, fingerprint of the starting teams
+RECORD = struct.Struct("<BBHHi")    # kind, stage, member, other member or level, health in fixed-point units
+MAX_MEMBERS = 1 << 16               # Member numbers are stored in 2 bytes
+
+
+class RecordKind(IntEnum):
+    """
+    The kinds of record in a battle log.
+    """
+    ATTACK = 0    # member was attacked by the other member
+    FAINT = 1     # member fainted
+    LEVEL_UP = 2  # member grew to the level, without evolving
+    EVOLVE = 3    # member grew to the level and evolved to the stage
+    END_TURN = 4  # member lost 1 health for surviving the turn
+    RESULT = 5    # stage is the winning team (0 or 1, or 2 for a tie); member and other are the number of survivors in each team
+    MEMBER = 6    # member survived with the stage, level (in other) and health
+
+
+def starting_fingerprint(teams) -> int:
+    """
+    Returns the fingerprint of the starting teams of a battle.
+
+    Args:
+        teams: The members of both teams, each in index order.
+
+    Complexity Analysis:
+        Best and worst case are O(n + m), where n and m are the sizes of the teams.
+    """
+    return combine(*(pokemon_fingerprint(pokemon) for team in teams for pokemon in team))
+
+
+class BinaryLogSink(EventSink):
+    """
+    A sink that records a battle as a binary log (see the module docstring), taking 18 bytes
+    for the header and 10 bytes for each record.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a sink with an empty log.
+
+        Attributes:
+            log (bytearray): The log of the last battle started.
+            members (dict): The member number of each Pokemon in the battle.
+            stages (list): The stage of each member, to tell evolutions from level ups.
+        """
+        self.log = bytearray()
+        self.members = {}
+        self.stages = []
+
+    def start(self, battle) -> None:
+        """
+        Starts a new log, with a header for the battle.
+
+        Raises:
+            ValueError: If the teams have too many members to number in 2 bytes.
+
+        Complexity Analysis:
+            Best and worst case are O(n + m), where n and m are the sizes of the teams.
+        """
+        teams = [list(battle.t_1.pokemon_team), list(battle.t_2.pokemon_team)]
+        if len(teams[0]) + len(teams[1]) > MAX_MEMBERS:
+            raise ValueError(f"Battles with more than {MAX_MEMBERS} Pokemon cannot be logged")
+        self.members = {}
+        self.stages = []
+        for pokemon in teams[0] + teams[1]:
+            self.members[pokemon] = len(self.members)
+            self.stages.append(pokemon.get_stage())
+        self.log = bytearray(HEADER.pack(MAGIC, VERSION, battle.battle_mode.value, len(teams[0]), len(teams[1]),
+                                         starting_fingerprint(teams)))
+
+    def attack(self, attacker, defender) -> None:
+        self.log += RECORD.pack(RecordKind.ATTACK, 0, self.members[defender], self.members[attacker], fixed_health(defender))
+
+    def faint(self, pokemon) -> None:
+        self.log += RECORD.pack(RecordKind.FAINT, 0, self.members[pokemon], 0, fixed_health(pokemon))
+
+    def level_up(self, pokemon) -> None:
+        member = self.members[pokemon]
+        stage = pokemon.get_stage()
+        kind = RecordKind.LEVEL_UP if stage == self.stages[member] else RecordKind.EVOLVE
+        self.stages[member] = stage
+        self.log += RECORD.pack(kind, stage, member, pokemon.get_level(), fixed_health(pokemon))
+
+    def end_turn(self, first, second) -> None:
+        self.log += RECORD.pack(RecordKind.END_TURN, 0, self.members[first], 0, fixed_health(first))
+        self.log += RECORD.pack(RecordKind.END_TURN, 0, self.members[second], 0, fixed_health(second))
+
+    def finish(self, battle, winner) -> None:
+        """
+        Ends the log with the result and the final state of every surviving member.
+
+        Complexity Analysis:
+            Best and worst case are O(n + m), where n and m are the sizes of the teams.
+        """
+        survivors = [list(battle.t_1.pokemon_team), list(battle.t_2.pokemon_team)]
+        winning_team = 0 if winner is battle.t_1 else 1 if winner is battle.t_2 else 2
+        self.log += RECORD.pack(RecordKind.RESULT, winning_team, len(survivors[0]), len(survivors[1]), 0)
+        for pokemon in survivors[0] + survivors[1]:
+            self.log += RECORD.pack(RecordKind.MEMBER, pokemon.get_stage(), self.members[pokemon],
+                                    pokemon.get_level(), fixed_health(pokemon))
+
+
+class ReplayResult(NamedTuple):
+    """
+    The end of a replayed battle.
+
+    Attributes:
+        winner (int): The index of the winning team (0 or 1), or None for a tie.
+        teams (tuple): The surviving members of each team, in index order, as handles into pool.
+        members (list): Every member, by member number, as handles into pool.
+        pool (PokemonPool): The pool holding the final state of every member.
+    """
+    winner: int
+    teams: tuple
+    members: list
+    pool: PokemonPool
+
+
+def replay(log, teams) -> ReplayResult:
+    """
+    Rebuilds the end of a battle from its log and its starting teams, by applying the change each
+    record makes to the pool the members are copied into.
+
+    Args:
+        log: The log, as recorded by a BinaryLogSink.
+        teams: The members of both teams, each in index order, as they were when the battle
+            started (for example, teams regenerated from the same rosters and assembled the same
+            way). They are copied, not changed.
+
+    Returns:
+        ReplayResult: The winner, the surviving teams and the final state of every member.
+
+    Raises:
+        ValueError: If the log is not a battle log, was recorded with different teams, or is
+            inconsistent with itself.
+
+    Complexity Analysis:
+        Best and worst case are O(n + m + r), where n and m are the sizes of the teams, and r is
+        the number of records.
+    """
+    log = memoryview(log)
+    magic, version, _, size_1, size_2, fingerprint = HEADER.unpack_from(log)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a battle log")
+    teams = [list(team) for team in teams]
+    if (len(teams[0]), len(teams[1])) != (size_1, size_2) or starting_fingerprint(teams) != fingerprint:
+        raise ValueError("The teams are not the ones the battle was logged with")
+
+    pool = PokemonPool()
+    for pokemon in teams[0] + teams[1]:
+        pool.add_pokemon(pokemon)
+    health = pool.health
+
+    winner = None
+    counts = None
+    survivors = []
+    for kind, stage, member, other, value in RECORD.iter_unpack(log[HEADER.size:]):
+        if kind == RecordKind.ATTACK or kind == RecordKind.END_TURN or kind == RecordKind.FAINT:
+            health[member] = value
+        elif kind == RecordKind.LEVEL_UP or kind == RecordKind.EVOLVE:
+            if kind == RecordKind.EVOLVE:
+                pool.evolve(member)
+            if pool.stage[member] != stage:
+                raise ValueError(f"Member {member} is at stage {pool.stage[member]}, not {stage}")
+            pool.level[member] = other
+            health[member] = value
+        elif kind == RecordKind.RESULT:
+            winner = stage if stage < 2 else None
+            counts = (member, other)
+        elif kind == RecordKind.MEMBER:
+            if (pool.stage[member], pool.level[member], health[member]) != (stage, other, value):
+                raise ValueError(f"Member {member} does not end the battle as the log says")
+            survivors.append(pool.handle(member))
+        else:
+            raise ValueError(f"Unknown record kind {kind}")
+    if counts is None or len(survivors) != counts[0] + counts[1]:
+        raise ValueError("The log does not end with the result of the battle")
+
+    members = [pool.handle(member) for member in range(len(pool))]
+    return ReplayResult(winner, (survivors[:counts[0]], survivors[counts[0]:]), members, pool)
@@ -0,0 +1,91 @@
+"""
+This module contains a NumPy version of the damage rules in Pokemon.attack, Pokemon.defend and
+battle.attacks, which works on whole arrays of attackers and defenders in one call.
+
+Every function gives bit-for-bit the same values as the scalar methods, as all of the
+arithmetic is done in float64 in the same order as the scalar code.
+
+Unless stated otherwise, all functions in this file are O(n) best/worst case, where n is the
+number of matchups.
+"""
+import numpy as np
+from pokemon_base import TypeEffectiveness
+
+
+def roster_stats(pokemon_list) -> tuple:
+    """
+    Collects the stats the damage rules use from a sequence of Pokemon.
+
+    Args:
+        pokemon_list: The Pokemon to collect stats from.
+
+    Returns:
+        tuple: The battle powers, defences and type values of the Pokemon, as NumPy arrays.
+    """
+    battle_power = np.array([pokemon.get_battle_power() for pokemon in pokemon_list], dtype=np.float64)
+    defence = np.array([pokemon.get_defence() for pokemon in pokemon_list], dtype=np.float64)
+    poketype = np.array([pokemon.get_poketype().value for pokemon in pokemon_list], dtype=np.intp)
+    return battle_power, defence, poketype
+
+
+def attack_many(battle_power, attack_types, defence, defend_types) -> np.ndarray:
+    """
+    Calculates the damage of each attacker against the defender at the same position,
+    the same way as Pokemon.attack.
+
+    Args:
+        battle_power: The battle powers of the attacking Pokemon.
+        attack_types: The type values of the attacking Pokemon.
+        defence: The defences of the defending Pokemon.
+        defend_types: The type values of the defending Pokemon.
+
+    Returns:
+        np.ndarray: The damage of each attack, including type effectiveness.
+    """
+    battle_power = np.asarray(battle_power, dtype=np.float64)
+    defence = np.asarray(defence, dtype=np.float64)
+
+    # The three damage formulas, chosen by how the defence compares to the battle power
+    damage = np.where(defence < battle_power / 2,
+                      np.ceil(battle_power - defence),
+                      np.where(defence < battle_power,
+                               np.ceil((battle_power * 5 / 8) - (defence / 4)),
+                               np.ceil(battle_power / 4)))
+
+    multiplier = TypeEffectiveness.get_effectiveness_many(np.asarray(attack_types, dtype=np.intp),
+                                                          np.asarray(defend_types, dtype=np.intp))
+    return damage * multiplier
+
+
+def defend_many(damage, defence) -> np.ndarray:
+    """
+    Calculates the health each defender loses from the given damage, the same way as Pokemon.defend.
+
+    Args:
+        damage: The damage dealt to each defending Pokemon.
+        defence: The defences of the defending Pokemon.
+
+    Returns:
+        np.ndarray: The health lost by each defending Pokemon.
+    """
+    damage = np.asarray(damage, dtype=np.float64)
+    return np.where(damage < np.asarray(defence, dtype=np.float64), damage / 2, damage)
+
+
+def resolve_attacks(battle_power, attack_types, defence, defend_types, multiplier) -> np.ndarray:
+    """
+    Calculates the health each defender loses when attacked with the given pokedex multiplier,
+    the same way as battle.attacks.
+
+    Args:
+        battle_power: The battle powers of the attacking Pokemon.
+        attack_types: The type values of the attacking Pokemon.
+        defence: The defences of the defending Pokemon.
+        defend_types: The type values of the defending Pokemon.
+        multiplier: The pokedex multiplier of each attack, or one multiplier for all of them.
+
+    Returns:
+        np.ndarray: The health lost by each defending Pokemon.
+    """
+    damage = np.ceil(attack_many(battle_power, attack_types, defence, defend_types) * np.asarray(multiplier, dtype=np.float64))
+    return defend_many(damage, defence)
@@ -0,0 +1,174 @@
+"""
+This module contains DamageMatrix, a precomputed table of the damage every species and
+evolution stage deals to every other one.
+
+The damage from Pokemon.attack only depends on the attacker's battle power and type and the
+defender's defence and type. A Pokemon made from its species and evolved normally has the stats
+in its species' stage tables, so the damage for each pair of species and stages can be worked out
+once, stored on disk, and looked up during battles instead of being recalculated on every attack.
+Pokemon whose stats have been changed some other way are not looked up.
+"""
+import array
+from data_cache import data_path, load_cached
+from pokemon_base import TYPE_EFFECTIVENESS_CSV, FIXED_POINT_SCALE, EVOLUTION_STAGES
+from pokemon import Pokemon, SPECIES_CSV
+
+DAMAGE_MATRIX_CACHE = data_path("damage_matrix.bin")
+DAMAGE_MATRIX_SOURCES = [SPECIES_CSV, data_path("pokemon_base.py"), data_path("pokemon.py"), TYPE_EFFECTIVENESS_CSV]
+DAMAGE_MATRIX_CACHE_VERSION = 2
+
+
+class DamageMatrix:
+    """
+    Represents the damage (before the pokedex multiplier) that every species and stage deals to
+    every other one. Rows and columns are indexed by species code, species id * STAGES + stage.
+
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+    STAGES = EVOLUTION_STAGES  # Evolution stages per species
+    SPECIES = list(Pokemon.SPECIES)  # The species registered when the matrix module is loaded
+    SPECIES_COUNT = len(SPECIES)
+    SIZE = SPECIES_COUNT * STAGES
+    TABLE = None  # Loaded on first use, see load_table
+    FIXED_TABLE = None  # TABLE in fixed-point units, see load_fixed_table
+    # The stats each row was built from, indexed by species code
+    BATTLE_POWER = [power for species in SPECIES for power in species.SPECIES_DATA.stage_battle_power]
+    DEFENCE = [defence for species in SPECIES for defence in species.SPECIES_DATA.stage_defence]
+    FIXED_BATTLE_POWER = [int(power * FIXED_POINT_SCALE) for power in BATTLE_POWER]
+    FIXED_DEFENCE = [int(defence * FIXED_POINT_SCALE) for defence in DEFENCE]
+
+    @classmethod
+    def build_table(cls) -> array.array:
+        """
+        Builds the damage matrix by calling Pokemon.attack for every pair of species codes.
+
+        Every species gets a row for all STAGES stages, with the stage's stats taken from the
+        species' stage tables, so species that stop evolving early still have complete rows.
+
+        Returns:
+            array.array: The matrix as one flat buffer of doubles, indexed by attacker code * SIZE + defender code.
+
+        Complexity Analysis:
+            Best and worst case are O(n^2), where n is SIZE.
+        """
+        staged = []
+        for species in cls.SPECIES:
+            for stage in range(cls.STAGES):
+                pokemon = species()
+                pokemon.battle_power = species.SPECIES_DATA.stage_battle_power[stage]
+                pokemon.defence = species.SPECIES_DATA.stage_defence[stage]
+                staged.append(pokemon)
+        return array.array("d", [attacker.attack(defender) for attacker in staged for defender in staged])
+
+    @classmethod
+    def load_table(cls) -> array.array:
+        """
+        Loads the damage matrix into TABLE if it has not been loaded yet, building it (and
+        storing it on disk) only when the stored copy is missing or out of date.
+
+        Returns:
+            array.array: The flat damage matrix.
+
+        Complexity Analysis:
+            Best case is O(1) when the matrix is already loaded.
+            Worst case is O(n^2), where n is SIZE, when the matrix has to be built.
+        """
+        if cls.TABLE is None:
+            cls.TABLE = load_cached(DAMAGE_MATRIX_CACHE, DAMAGE_MATRIX_SOURCES, cls.build_table,
+                                    DAMAGE_MATRIX_CACHE_VERSION)
+        return cls.TABLE
+
+    @classmethod
+    def load_fixed_table(cls) -> array.array:
+        """
+        Loads the damage matrix in fixed-point units (see pokemon_base.FIXED_POINT_SCALE) into
+        FIXED_TABLE if it has not been loaded yet. Every damage is a multiple of 0.5, so the
+        fixed-point values are exact.
+
+        Returns:
+            array.array: The flat damage matrix, as 64-bit integers.
+
+        Complexity Analysis:
+            Best case is O(1) when the matrix is already loaded.
+            Worst case is O(n^2), where n is SIZE.
+        """
+        if cls.FIXED_TABLE is None:
+            cls.FIXED_TABLE = array.array("q", [int(damage * FIXED_POINT_SCALE) for damage in cls.load_table()])
+        return cls.FIXED_TABLE
+
+    @classmethod
+    def species_code(cls, pokemon) -> int:
+        """
+        Returns the species code of a Pokemon.
+
+        Args:
+            pokemon (Pokemon): The Pokemon.
+
+        Returns:
+            int: The row of the Pokemon in the matrix, or None if its species is not in the matrix.
+        """
+        species_id = pokemon.SPECIES_ID
+        if species_id is None or species_id >= cls.SPECIES_COUNT:
+            return None
+        return species_id * cls.STAGES + pokemon.stage
+
+    @classmethod
+    def get_damage(cls, attacker, defender) -> float:
+        """
+        Returns the damage the attacker deals to the defender, the same as attacker.attack(defender).
+        Falls back to attacker.attack(defender) when either Pokemon is not one of the species, or
+        its stats are not the ones in its species' stage tables.
+
+        Args:
+            attacker (Pokemon): The attacking Pokemon.
+            defender (Pokemon): The defending Pokemon.
+
+        Returns:
+            float: The damage, including type effectiveness but not the pokedex multiplier.
+        """
+        table = cls.TABLE
+        if table is None:
+            table = cls.load_table()
+        attacker_index = attacker.SPECIES_ID
+        defender_index = defender.SPECIES_ID
+        if attacker_index is None or defender_index is None or \
+                attacker_index >= cls.SPECIES_COUNT or defender_index >= cls.SPECIES_COUNT:
+            # Pokemon that are not one of the species cannot be looked up
+            return attacker.attack(defender)
+        stages = cls.STAGES
+        attacker_code = attacker_index * stages + attacker.stage
+        defender_code = defender_index * stages + defender.stage
+        if attacker.battle_power != cls.BATTLE_POWER[attacker_code] or defender.defence != cls.DEFENCE[defender_code]:
+            # Stats that differ from the stage tables are not in the matrix
+            return attacker.attack(defender)
+        return table[attacker_code * cls.SIZE + defender_code]
+
+    @classmethod
+    def get_fixed_damage(cls, attacker, defender) -> int:
+        """
+        Returns the damage the attacker deals to the defender in fixed-point units, the same as
+        attacker.attack(defender) when both Pokemon are in fixed-point mode. Falls back to
+        attacker.attack(defender) in the same cases as get_damage.
+
+        Args:
+            attacker (Pokemon): The attacking Pokemon.
+            defender (Pokemon): The defending Pokemon.
+
+        Returns:
+            int: The damage, including type effectiveness but not the pokedex multiplier.
+        """
+        table = cls.FIXED_TABLE
+        if table is None:
+            table = cls.load_fixed_table()
+        attacker_index = attacker.SPECIES_ID
+        defender_index = defender.SPECIES_ID
+        if attacker_index is None or defender_index is None or \
+                attacker_index >= cls.SPECIES_COUNT or defender_index >= cls.SPECIES_COUNT:
+            return attacker.attack(defender)
+        stages = cls.STAGES
+        attacker_code = attacker_index * stages + attacker.stage
+        defender_code = defender_index * stages + defender.stage
+        if attacker.battle_power != cls.FIXED_BATTLE_POWER[attacker_code] or \
+                defender.defence != cls.FIXED_DEFENCE[defender_code]:
+            return attacker.attack(defender)
+        return table[attacker_code * cls.SIZE + defender_code]
@@ -0,0 +1,95 @@
+"""
+This module contains helpers for keeping a precompiled binary copy of data that is
+built from source files (such as the CSV tables that ship with the game), so that
+the source only has to be parsed once rather than in every process.
+
+The binary copy stores a hash of the source contents next to the built data, and is
+rebuilt whenever the source files change.
+"""
+import hashlib
+import os
+import pickle
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def data_path(file_name: str) -> str:
+    """
+    Returns the absolute path of a data file that ships alongside the package, so data
+    can be found no matter what the current working directory is.
+
+    Args:
+        file_name (str): The name of the data file.
+
+    Returns:
+        str: The absolute path of the data file.
+    """
+    return os.path.join(BASE_DIR, file_name)
+
+
+def source_digest(*source_paths: str, version: int = 0) -> bytes:
+    """
+    Returns a hash of the contents of the given source files.
+
+    Args:
+        source_paths (str): The files the cached data is built from.
+        version (int): The format version of the built data.
+
+    Returns:
+        bytes: The SHA-256 digest of the contents of all the files.
+
+    Complexity Analysis:
+        Best and worst case are O(n), where n is the total size of the files.
+    """
+    digest = hashlib.sha256(version.to_bytes(4, "little"))
+    for path in source_paths:
+        with open(path, "rb") as source_file:
+            digest.update(source_file.read())
+    return digest.digest()
+
+
+def load_cached(cache_path: str, source_paths, build, version: int = 0):
+    """
+    Returns the data built from the source files, reading it from the binary copy at
+    cache_path when that copy was built from the same source contents and format version.
+
+    If the binary copy is missing, stale or unreadable, the data is rebuilt by calling
+    build() and the copy is rewritten. Failing to write the copy (for example, in a
+    read-only install) is not an error; the data is simply rebuilt next time.
+
+    Args:
+        cache_path (str): The path of the binary copy.
+        source_paths (list): The files the data is built from.
+        build (callable): Builds the data from the source files when called with no arguments.
+        version (int): The format version of the built data, to be increased whenever build()
+            starts returning data in a different shape.
+
+    Returns:
+        Any: The built data.
+
+    Complexity Analysis:
+        Best case is O(n), where n is the size of the source files, when the binary copy is up to date.
+        Worst case is the cost of build() when the binary copy has to be rebuilt.
+    """
+    digest = source_digest(*source_paths, version=version)
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_digest, data = pickle.load(cache_file)
+        if cached_digest == digest:
+            return data
+    except (OSError, EOFError, AttributeError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+
+    data = build()
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as cache_file:
+            pickle.dump((digest, data), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        # Replace the old copy in one step so other processes never read half a file
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return data
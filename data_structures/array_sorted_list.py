@@ -10,7 +10,11 @@ __author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ig
 __docformat__ = 'reStructuredText'
 
 class ArraySortedList(SortedList[T]):
-    """ SortedList ADT implemented with arrays. """
+    """ SortedList ADT implemented with arrays.
+
+    Attributes:
+         tracker: told about every item added or deleted (see fingerprint.TeamFingerprint), or None
+    """
     MIN_CAPACITY = 1
 
     def __init__(self, max_capacity: int) -> None:
@@ -22,10 +26,79 @@ class ArraySortedList(SortedList[T]):
         # initialising the internal array
         size = max(self.MIN_CAPACITY, max_capacity)
         self.array = ArrayR(size)
+        self.tracker = None
 
     def reset(self):
         """ Reset the list. """
         SortedList.__init__(self)
+        if self.tracker is not None:
+            self.tracker.clear()
+
+    def clear(self) -> None:
+        """ Clear the list. """
+        SortedList.clear(self)
+        if self.tracker is not None:
+            self.tracker.clear()
+
+    @classmethod
+    def from_items(cls, items) -> 'ArraySortedList[T]':
+        """ Build a list holding all the given items, in exactly the order adding
+            them one by one would leave them in, without moving any items around.
+
+            Items with different keys just go in key order. Where an added item
+            lands among the items with the same key depends on where the binary
+            search of _index_to_add meets them, which only depends on how many
+            items there are and how many have a smaller or the same key, so the
+            search is replayed on those counts (kept in a Fenwick tree over the
+            distinct keys). O(n log n) for n items, plus O(g) per item for each
+            item with g others of the same key.
+        """
+        keys = sorted({item.key for item in items})
+        rank = {key: i for i, key in enumerate(keys)}
+        counts = [0] * (len(keys) + 1)  # Fenwick tree of how many items have each key
+        groups = [[] for _ in keys]     # the items with each key, in list order
+
+        def count_below(r: int) -> int:
+            """ Number of items added so far with a key of rank below r. """
+            total = 0
+            while r > 0:
+                total += counts[r]
+                r -= r & -r
+            return total
+
+        for added, item in enumerate(items):
+            r = rank[item.key]
+            smaller, same = count_below(r), count_below(r + 1)
+
+            # replay _index_to_add, comparing positions instead of keys
+            low = 0
+            high = added - 1
+            position = None
+            while low <= high and position is None:
+                mid = (low + high) // 2
+                if mid < smaller:
+                    low = mid + 1
+                elif mid >= same:
+                    high = mid - 1
+                else:
+                    position = mid
+            if position is None:
+                position = low
+            groups[r].insert(position - smaller, item)
+
+            r += 1
+            while r < len(counts):
+                counts[r] += 1
+                r += r & -r
+
+        sorted_list = cls(len(items))
+        i = 0
+        for group in groups:
+            for item in group:
+                sorted_list.array[i] = item
+                i += 1
+        sorted_list.length = i
+        return sorted_list
 
     def __getitem__(self, index: int) -> T:
         """ Magic method. Return the element at a given position. """
@@ -85,6 +158,8 @@ class ArraySortedList(SortedList[T]):
         item = self.array[index]
         self.length -= 1
         self._shuffle_left(index)
+        if self.tracker is not None:
+            self.tracker.delete(index)
         return item
 
     def index(self, item: ListItem) -> int:
@@ -108,6 +183,8 @@ class ArraySortedList(SortedList[T]):
 
         self[position] = item
         self.length += 1
+        if self.tracker is not None:
+            self.tracker.insert(position, item)
 
     def _index_to_add(self, item: ListItem) -> int:
         """ Find the position where the new item should be placed. """
@@ -124,3 +201,111 @@ class ArraySortedList(SortedList[T]):
                 return mid
 
         return low
+
+
+class OffsetArraySortedList(ArraySortedList[T]):
+    """ SortedList ADT implemented with an array whose items start at an offset.
+
+    Deleting the first item only moves the offset, so it is O(1), and inserting or
+    deleting anywhere else moves whichever side of the position is shorter, so it
+    is O(min(i, n - i)). Items are kept in exactly the same order as ArraySortedList
+    would keep them.
+
+    Attributes:
+         start (int): position in the array of the first item
+    """
+
+    def __init__(self, max_capacity: int) -> None:
+        """ OffsetArraySortedList object initialiser. """
+        ArraySortedList.__init__(self, max_capacity)
+        self.start = 0
+
+    def reset(self):
+        """ Reset the list. """
+        ArraySortedList.reset(self)
+        self.start = 0
+
+    def clear(self) -> None:
+        """ Clear the list. """
+        ArraySortedList.clear(self)
+        self.start = 0
+
+    def __getitem__(self, index: int) -> T:
+        """ Magic method. Return the element at a given position.
+            Negative positions count from the end of the list.
+        """
+        if index < 0:
+            index += len(self)
+        return self.array[self.start + index]
+
+    def __setitem__(self, index: int, item: ListItem) -> None:
+        """ Magic method. Insert the item at a given position,
+            if possible (!). Shift the shorter side of the list to make room.
+        """
+        if self.is_empty() or \
+                (index == 0 and item.key <= self[index].key) or \
+                (index == len(self) and self[index - 1].key <= item.key) or \
+                (index > 0 and self[index - 1].key <= item.key <= self[index].key):
+
+            if self.is_full():
+                self._resize()
+
+            room_left = self.start > 0
+            room_right = self.start + len(self) < len(self.array)
+            if room_left and (index < len(self) - index or not room_right):
+                # Move the items before the position one place to the left
+                self.start -= 1
+                for i in range(self.start, self.start + index):
+                    self.array[i] = self.array[i + 1]
+            else:
+                # Move the items from the position one place to the right
+                for i in range(self.start + len(self), self.start + index, -1):
+                    self.array[i] = self.array[i - 1]
+            self.array[self.start + index] = item
+        else:
+            # the list isn't empty and the item's position is wrong wrt. its neighbours
+            raise IndexError('Element should be inserted in sorted order')
+
+    def __contains__(self, item: ListItem):
+        """ Checks if value is in the list. """
+        for i in range(len(self)):
+            if self[i] == item:
+                return True
+        return False
+
+    def _resize(self) -> None:
+        """ Resize the list, leaving the same free space at both ends. """
+        # doubling the size of our list
+        new_array = ArrayR(2 * len(self.array))
+        new_start = (len(new_array) - self.length) // 2
+
+        # copying the contents
+        for i in range(self.length):
+            new_array[new_start + i] = self.array[self.start + i]
+
+        # referring to the new array
+        self.array = new_array
+        self.start = new_start
+
+    def delete_at_index(self, index: int) -> ListItem:
+        """ Delete item at a given position, moving the shorter side of the list. """
+        if index >= len(self):
+            raise IndexError('No such index in the list')
+        item = self[index]
+        if index < len(self) - 1 - index:
+            # Move the items before the position one place to the right
+            for i in range(self.start + index, self.start, -1):
+                self.array[i] = self.array[i - 1]
+            self.array[self.start] = None
+            self.start += 1
+        else:
+            # Move the items after the position one place to the left
+            for i in range(self.start + index, self.start + len(self) - 1):
+                self.array[i] = self.array[i + 1]
+            self.array[self.start + len(self) - 1] = None
+        self.length -= 1
+        if self.is_empty():
+            self.start = 0
+        if self.tracker is not None:
+            self.tracker.delete(index)
+        return item
@@ -93,10 +93,9 @@ class BSet(Set[int]):
 
     def __len__(self) -> int:
         """
-        Size computation. The most expensive operation.
-        Use int.bit_length(your_integer) to calculate the bit length.
+        Size computation, as the number of set bits (popcount) of the integer.
         """
-        return bin(self.elems).count('1')
+        return self.elems.bit_count()
 
     def __str__(self):
         """ Construct a nice string representation. """
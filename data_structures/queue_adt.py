@@ -49,9 +49,13 @@ class CircularQueue(Queue[T]):
 
     Attributes:
          length (int): number of elements in the stack (inherited)
-         front (int): index of the element at the front of the queue
-         rear (int): index of the first empty space at the back of the queue
+         front (int): index of the first element in the array
+         rear (int): index of the first empty space after the last element in the array
          array (ArrayR[T]): array storing the elements of the queue
+         reversed (bool): True if the queue runs from rear to front of the array, so the
+             element at the front of the queue is the one before rear
+         tracker: told about every element appended or served and every change to the order
+             of the elements (see fingerprint.TeamFingerprint), or None
 
     ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
     """
@@ -62,6 +66,8 @@ class CircularQueue(Queue[T]):
         self.front = 0
         self.rear = 0
         self.array = ArrayR(max(self.MIN_CAPACITY,max_capacity))
+        self.reversed = False
+        self.tracker = None
 
 
     def append(self, item: T) -> None:
@@ -72,9 +78,15 @@ class CircularQueue(Queue[T]):
         if self.is_full():
             raise Exception("Queue is full")
 
-        self.array[self.rear] = item
+        if self.reversed:
+            self.front = (self.front - 1) % len(self.array)
+            self.array[self.front] = item
+        else:
+            self.array[self.rear] = item
+            self.rear = (self.rear + 1) % len(self.array)
         self.length += 1
-        self.rear = (self.rear + 1) % len(self.array)
+        if self.tracker is not None:
+            self.tracker.insert(self.length - 1, item)
 
     def serve(self) -> T:
         """ Deletes and returns the element at the queue's front.
@@ -85,19 +97,96 @@ class CircularQueue(Queue[T]):
             raise Exception("Queue is empty")
 
         self.length -= 1
-        item = self.array[self.front]
-        self.front = (self.front+1) % len(self.array)
+        if self.reversed:
+            self.rear = (self.rear - 1) % len(self.array)
+            item = self.array[self.rear]
+        else:
+            item = self.array[self.front]
+            self.front = (self.front+1) % len(self.array)
+        if self.tracker is not None:
+            self.tracker.delete(0)
         return item
 
     def is_full(self) -> bool:
         """ True if the queue is full and no element can be appended. """
         return len(self) == len(self.array)
 
+    def __getitem__(self, index: int) -> T:
+        """ Returns the element at position index counting from the front (0 is the front),
+        without serving anything. Negative indices count from the rear.
+        :complexity: O(1)
+        :raises IndexError: if the index is out of range
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Queue index out of range")
+        return self.array[self._position(index)]
+
+    def __iter__(self):
+        """ Iterates over the elements from the front to the rear, without serving anything.
+        :complexity: O(n), where n is the number of elements
+        """
+        for i in range(self.length):
+            yield self.array[self._position(i)]
+
+    def _position(self, index: int) -> int:
+        """ Returns the position in the array of the element at position index of the queue. """
+        if self.reversed:
+            return (self.rear - 1 - index) % len(self.array)
+        return (self.front + index) % len(self.array)
+
+    def reverse(self) -> None:
+        """ Reverses the order of the whole queue, by switching the direction it runs in the array.
+        :complexity: O(1)
+        """
+        self.reversed = not self.reversed
+        if self.tracker is not None:
+            self.tracker.reverse()
+
+    def rotate(self, k: int) -> None:
+        """ Moves the first k elements to the rear of the queue, in order, as serving and
+        appending each of them would.
+        :complexity: O(1) when the queue is full, otherwise O(k)
+        """
+        if self.is_empty():
+            return
+        k %= len(self)
+        if self.is_full():
+            # Every slot is in use, so rotating only moves where the queue starts
+            self.front = (self.front + (-k if self.reversed else k)) % len(self.array)
+            self.rear = self.front
+            if self.tracker is not None:
+                self.tracker.rotate(k)
+        else:
+            for _ in range(k):
+                self.append(self.serve())
+
+    def reverse_block(self, start: int, k: int) -> None:
+        """ Reverses the order of the k elements from position start of the queue, in place.
+        :complexity: O(k)
+        :raises IndexError: if the block does not fit in the queue
+        """
+        if start < 0 or k < 0 or start + k > len(self):
+            raise IndexError("Block out of range")
+        low = start
+        high = start + k - 1
+        while low < high:
+            low_position, high_position = self._position(low), self._position(high)
+            self.array[low_position], self.array[high_position] = self.array[high_position], self.array[low_position]
+            low += 1
+            high -= 1
+        if self.tracker is not None:
+            self.tracker.reverse_block(start, k)
+
     def clear(self) -> None:
         """ Clears all elements from the queue. """
         Queue.__init__(self)
         self.front = 0
         self.rear = 0
+        self.reversed = False
+        if self.tracker is not None:
+            self.tracker.clear()
 
 
 class TestQueue(unittest.TestCase):
@@ -184,6 +273,43 @@ class TestQueue(unittest.TestCase):
             self.assertEqual(len(queue), 0)
             self.assertTrue(queue.is_empty())
 
+    def test_getitem_and_iter(self):
+        for queue, length in zip(self.queues, self.lengths):
+            self.assertEqual(list(queue), list(range(length)))
+            self.assertEqual([queue[i] for i in range(length)], list(range(length)))
+            self.assertRaises(IndexError, queue.__getitem__, length)
+        # Wrap the large queue around the end of its array
+        for i in range(self.LARGE):
+            self.large_queue.append(self.large_queue.serve() + self.LARGE)
+        self.large_queue.serve()
+        self.large_queue.append(-1)
+        self.assertEqual(list(self.large_queue), list(range(self.LARGE + 1, 2 * self.LARGE)) + [-1])
+        self.assertEqual(self.large_queue[-1], -1)
+
+    def test_reverse_rotate_and_block(self):
+        for queue, length in zip(self.queues, self.lengths):
+            expected = list(range(length))
+            queue.reverse()
+            expected.reverse()
+            self.assertEqual(list(queue), expected)
+            queue.rotate(3)
+            expected = expected[3 % max(length, 1):] + expected[:3 % max(length, 1)]
+            self.assertEqual(list(queue), expected)
+            queue.append(-1)
+            expected.append(-1)
+            self.assertEqual(queue.serve(), expected.pop(0))
+            queue.reverse_block(min(1, len(queue)), max(0, min(3, len(queue) - 1)))
+            expected[1:4] = expected[1:4][::-1]
+            self.assertEqual(list(queue), expected)
+        # Rotating a full queue only moves where it starts
+        full = CircularQueue(4)
+        for i in range(4):
+            full.append(i)
+        full.reverse()
+        full.rotate(1)
+        self.assertEqual(list(full), [2, 1, 0, 3])
+        self.assertEqual([full.serve() for _ in range(4)], [2, 1, 0, 3])
+
 if __name__ == '__main__':
     testtorun = TestQueue()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
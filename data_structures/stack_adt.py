@@ -54,6 +54,8 @@ class ArrayStack(Stack[T]):
     Attributes:
          length (int): number of elements in the stack (inherited)
          array (ArrayR[T]): array storing the elements of the queue
+         tracker: told about every element pushed or popped and every change to the order of
+             the elements (see fingerprint.TeamFingerprint), or None
 
     ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
     """
@@ -65,6 +67,7 @@ class ArrayStack(Stack[T]):
         """
         Stack.__init__(self)
         self.array = ArrayR(max(self.MIN_CAPACITY, max_capacity))
+        self.tracker = None
 
     def is_full(self) -> bool:
         """ True if the stack is full and no element can be pushed. """
@@ -79,6 +82,8 @@ class ArrayStack(Stack[T]):
             raise Exception("Stack is full")
         self.array[len(self)] = item
         self.length += 1
+        if self.tracker is not None:
+            self.tracker.insert(0, item)
 
     def pop(self) -> T:
         """ Pops the element at the top of the stack.
@@ -88,6 +93,8 @@ class ArrayStack(Stack[T]):
         if self.is_empty():
             raise Exception("Stack is empty")
         self.length -= 1
+        if self.tracker is not None:
+            self.tracker.delete(0)
         return self.array[self.length]
 
     def peek(self) -> T:
@@ -99,6 +106,47 @@ class ArrayStack(Stack[T]):
             raise Exception("Stack is empty")
         return self.array[self.length-1]
 
+    def __getitem__(self, index: int) -> T:
+        """ Returns the element at position index counting from the top (0 is the top),
+        without popping anything. Negative indices count from the bottom.
+        :complexity: O(1)
+        :raises IndexError: if the index is out of range
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Stack index out of range")
+        return self.array[self.length - 1 - index]
+
+    def __iter__(self):
+        """ Iterates over the elements from the top to the bottom, without popping anything.
+        :complexity: O(n), where n is the number of elements
+        """
+        for i in range(self.length - 1, -1, -1):
+            yield self.array[i]
+
+    def reverse_top(self, k: int) -> None:
+        """ Reverses the order of the top k elements in place, leaving the rest as they are.
+        :complexity: O(k)
+        :raises ValueError: if there are fewer than k elements
+        """
+        if not 0 <= k <= len(self):
+            raise ValueError("Cannot reverse more elements than the stack has")
+        low = self.length - k
+        high = self.length - 1
+        while low < high:
+            self.array[low], self.array[high] = self.array[high], self.array[low]
+            low += 1
+            high -= 1
+        if self.tracker is not None:
+            self.tracker.reverse_block(0, k)
+
+    def clear(self) -> None:
+        """ Clears all elements from the stack. """
+        Stack.clear(self)
+        if self.tracker is not None:
+            self.tracker.clear()
+
 class TestStack(unittest.TestCase):
     """ Tests for the above class."""
     EMPTY = 0
@@ -183,6 +231,23 @@ class TestStack(unittest.TestCase):
             self.assertEqual(len(stack), 0)
             self.assertTrue(stack.is_empty())
 
+    def test_getitem_and_iter(self):
+        for stack, length in zip(self.stacks, self.lengths):
+            expected = list(range(length - 1, -1, -1))
+            self.assertEqual(list(stack), expected)
+            self.assertEqual([stack[i] for i in range(length)], expected)
+            self.assertEqual(len(stack), length)
+            self.assertRaises(IndexError, stack.__getitem__, length)
+        self.assertEqual(self.large_stack[-1], 0)
+
+    def test_reverse_top(self):
+        self.large_stack.reverse_top(3)
+        self.assertEqual(list(self.large_stack), [7, 8, 9, 6, 5, 4, 3, 2, 1, 0])
+        self.large_stack.reverse_top(len(self.large_stack))
+        self.assertEqual(list(self.large_stack), [0, 1, 2, 3, 4, 5, 6, 9, 8, 7])
+        self.empty_stack.reverse_top(0)
+        self.assertRaises(ValueError, self.roomy_stack.reverse_top, 6)
+
 if __name__ == '__main__':
     testtorun = TestStack()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
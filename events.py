@@ -0,0 +1,228 @@
+"""
+This module contains the event sinks that battles and the battle tower report what happens to
+(attacks, faints, level ups and results), instead of printing it.
+
+- NullSink ignores every event, without formatting anything, for headless battles.
+- TextSink formats every event as the line battles used to print, and writes the lines in
+  batches (by default to whatever sys.stdout is when it flushes).
+- StructuredSink records every event as an Event, for analysing battles afterwards.
+
+Unless stated otherwise, all methods in this file are O(1) best/worst case.
+"""
+import sys
+from enum import Enum
+from typing import NamedTuple
+
+
+class EventKind(Enum):
+    """
+    The kinds of event a sink is told about.
+    """
+    ATTACK = 0
+    FAINT = 1
+    LEVEL_UP = 2
+    BOTH_FAINTED = 3
+    PLAYER_WINS = 4
+    ENEMY_WINS = 5
+    OUT_OF_LIVES = 6
+    DEFEATED = 7
+    END_TURN = 8
+
+
+class Event(NamedTuple):
+    """
+    One event, as recorded by a StructuredSink.
+
+    Attributes:
+        kind (EventKind): The kind of event.
+        subject (str): The Pokemon (or Trainer) the event is about, if any.
+        target (str): The Pokemon attacked, for attacks, or the second Pokemon at the end of a turn.
+        value: The health the attacked Pokemon is left with, the level a Pokemon grew to, or
+            the number of enemies defeated.
+    """
+    kind: EventKind
+    subject: str = None
+    target: str = None
+    value: float = None
+
+
+class EventSink:
+    """
+    Receives the events of battles. Every method does nothing, so a sink only overrides the
+    events it is interested in.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def start(self, battle) -> None:
+        """
+        A battle is about to start, with its teams assembled.
+        """
+
+    def finish(self, battle, winner) -> None:
+        """
+        A battle has finished, and winner (None for a tie) has won it.
+        """
+
+    def attack(self, attacker, defender) -> None:
+        """
+        A Pokemon has attacked another one, leaving it with its current health.
+        """
+
+    def faint(self, pokemon) -> None:
+        """
+        A Pokemon has fainted.
+        """
+
+    def level_up(self, pokemon) -> None:
+        """
+        A Pokemon has grown to its current level.
+        """
+
+    def end_turn(self, first, second) -> None:
+        """
+        Both Pokemon in a turn have survived it, and lost 1 health each.
+        """
+
+    def both_fainted(self) -> None:
+        """
+        Both Pokemon in a turn have fainted.
+        """
+
+    def battle_result(self, player_wins: bool) -> None:
+        """
+        The player of the battle tower has won or lost a battle.
+        """
+
+    def out_of_lives(self, trainer, is_player: bool) -> None:
+        """
+        A Trainer in the battle tower has run out of lives.
+        """
+
+    def defeated(self, count: int) -> None:
+        """
+        The player of the battle tower has defeated count enemies so far.
+        """
+
+    def flush(self) -> None:
+        """
+        Writes out any events the sink is holding on to.
+        """
+
+
+class NullSink(EventSink):
+    """
+    A sink that ignores every event, so battles do no formatting or output at all.
+    """
+
+
+class TextSink(EventSink):
+    """
+    A sink that formats every event as one line of text, exactly as battles used to print it.
+    Lines are kept in a buffer and written to the stream in one go when the buffer is full and
+    whenever the sink is flushed (battles flush their sink when they end).
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self, stream=None, buffer_lines: int = 1024) -> None:
+        """
+        Initializes a sink with an empty buffer.
+
+        Args:
+            stream: The stream to write to, or None for whatever sys.stdout is when flushing.
+            buffer_lines (int): The number of lines to keep before writing them (0 writes every
+                line straight away).
+
+        Attributes:
+            stream: The stream to write to, or None for sys.stdout.
+            buffer_lines (int): The number of lines to keep before writing them.
+            lines (list): The lines not written yet.
+        """
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self.lines = []
+
+    def write(self, line: str) -> None:
+        """
+        Adds a line to the buffer, writing the buffer out if it is full.
+        """
+        self.lines.append(line)
+        if len(self.lines) > self.buffer_lines:
+            self.flush()
+
+    def attack(self, attacker, defender) -> None:
+        self.write(f"{attacker.get_name()} attacks {defender.get_name()}: {defender.get_name()} has {round(defender.get_health() / defender.scale)} health")
+
+    def faint(self, pokemon) -> None:
+        self.write(f"{pokemon.get_name()} fainted")
+
+    def level_up(self, pokemon) -> None:
+        self.write(f"{pokemon.get_name()} grew to level {pokemon.get_level()}")
+
+    def both_fainted(self) -> None:
+        self.write('Both pokemon fainted')
+
+    def battle_result(self, player_wins: bool) -> None:
+        self.write('You win!' if player_wins else 'Enemy wins.')
+
+    def out_of_lives(self, trainer, is_player: bool) -> None:
+        self.write("You are out of lives" if is_player else f"{trainer.get_name()} is out of lives")
+
+    def defeated(self, count: int) -> None:
+        self.write(f"Defeated enemies: {count}")
+
+    def flush(self) -> None:
+        """
+        Writes every line in the buffer to the stream.
+
+        Complexity Analysis:
+            Best and worst case are O(k), where k is the total length of the lines.
+        """
+        if self.lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+class StructuredSink(EventSink):
+    """
+    A sink that records every event as an Event.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a sink with no events.
+
+        Attributes:
+            events (list): The events recorded, in order.
+        """
+        self.events = []
+
+    def attack(self, attacker, defender) -> None:
+        self.events.append(Event(EventKind.ATTACK, attacker.get_name(), defender.get_name(),
+                                 defender.get_health() / defender.scale))
+
+    def faint(self, pokemon) -> None:
+        self.events.append(Event(EventKind.FAINT, pokemon.get_name()))
+
+    def level_up(self, pokemon) -> None:
+        self.events.append(Event(EventKind.LEVEL_UP, pokemon.get_name(), value=pokemon.get_level()))
+
+    def end_turn(self, first, second) -> None:
+        self.events.append(Event(EventKind.END_TURN, first.get_name(), second.get_name()))
+
+    def both_fainted(self) -> None:
+        self.events.append(Event(EventKind.BOTH_FAINTED))
+
+    def battle_result(self, player_wins: bool) -> None:
+        self.events.append(Event(EventKind.PLAYER_WINS if player_wins else EventKind.ENEMY_WINS))
+
+    def out_of_lives(self, trainer, is_player: bool) -> None:
+        self.events.append(Event(EventKind.OUT_OF_LIVES, trainer.get_name()))
+
+    def defeated(self, count: int) -> None:
+        self.events.append(Event(EventKind.DEFEATED, value=count))
+
+
+# The sink the battle functions report to when they are not given one, which prints every line
+PRINT_SINK = TextSink(buffer_lines=0)
@@ -0,0 +1,366 @@
+"""
+This module contains stable 64-bit fingerprints of Pokemon, teams and battle setups, which
+caches and dedup filters can key on instead of serialising a team.
+
+A fingerprint only depends on battle-relevant state, never on object identity or on Python's
+salted string hashes, so the same state has the same fingerprint in every process and on every
+run. A team's fingerprint covers the order of its members, and follows the changes to its
+container one at a time, so it does not have to be worked out again (see TeamFingerprint).
+
+Unless stated otherwise, all functions in this file are O(1) best/worst case.
+"""
+import hashlib
+from pokemon_base import FIXED_POINT_SCALE
+from pokemon import species_code
+from data_structures.stack_adt import ArrayStack
+from data_structures.queue_adt import CircularQueue
+from data_structures.array_sorted_list import ArraySortedList
+
+MASK = (1 << 64) - 1
+
+# The container a team is held in, as its order means something different in each
+CONTAINER_KINDS = ((ArrayStack, 1), (CircularQueue, 2), (ArraySortedList, 3))
+
+# The order of a team is hashed as a polynomial in ORDER_BASE modulo ORDER_MODULUS, a prime, so
+# every power of ORDER_BASE (including negative ones) can be worked out (see TeamFingerprint)
+ORDER_MODULUS = (1 << 61) - 1
+ORDER_BASE = 0x1D8E4E27C47D124F % ORDER_MODULUS
+
+
+def mix(value: int) -> int:
+    """
+    Scrambles a 64-bit value (the splitmix64 finaliser), so that close values give unrelated results.
+
+    Args:
+        value (int): The value, which is reduced to 64 bits.
+
+    Returns:
+        int: The scrambled 64-bit value.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+def combine(*values: int) -> int:
+    """
+    Returns the fingerprint of a sequence of integers, which depends on their order.
+
+    Complexity Analysis:
+        Best and worst case are O(k), where k is the number of values.
+    """
+    fingerprint = len(values)
+    for value in values:
+        fingerprint = mix(fingerprint ^ (value & MASK))
+    return fingerprint
+
+
+def text_fingerprint(text: str) -> int:
+    """
+    Returns the fingerprint of a string.
+
+    Complexity Analysis:
+        Best and worst case are O(k), where k is the length of the string.
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def fixed_health(pokemon) -> int:
+    """
+    Returns the health of a Pokemon in fixed-point units, whatever mode its stats are stored in.
+    """
+    return int(pokemon.get_health() * (FIXED_POINT_SCALE // pokemon.scale))
+
+
+def pokemon_fingerprint(pokemon) -> int:
+    """
+    Returns the fingerprint of the battle-relevant state of a Pokemon: its species and stage,
+    health and level. Health is compared in fixed-point units, so a Pokemon has the same
+    fingerprint whatever mode its stats are stored in.
+
+    Args:
+        pokemon (Pokemon): The Pokemon.
+
+    Returns:
+        int: The 64-bit fingerprint.
+    """
+    return combine(species_code(pokemon.SPECIES_ID, pokemon.get_stage()), fixed_health(pokemon), pokemon.get_level())
+
+
+def container_kind(container) -> int:
+    """
+    Returns the kind of container a team is held in (see CONTAINER_KINDS, 0 for none).
+    """
+    for container_class, kind in CONTAINER_KINDS:
+        if isinstance(container, container_class):
+            return kind
+    return 0
+
+
+class TeamFingerprint:
+    """
+    The fingerprint of a team held in a container, which depends on the state of every member
+    and on their order, kept up to date as the container changes.
+
+    The order is covered by a polynomial hash: the member at position i of the team adds its
+    term times ORDER_BASE^i, modulo ORDER_MODULUS. Each member is kept at an integer coordinate
+    (its position in the container's array, give or take an offset), so a member joining or
+    leaving at either end only changes one term, and one in the middle moves the members on its
+    shorter side, as OffsetArraySortedList does. The sums of the terms times ORDER_BASE^c and
+    ORDER_BASE^-c, for each member's coordinate c, give the hash read either way round, so
+    reversing the team is O(1).
+
+    The fingerprint attaches itself to the container as its tracker, and the container tells
+    it about every member it gains or loses and every change to its order (see ArrayStack,
+    CircularQueue and ArraySortedList). A member whose state changes while it stays in the
+    container (rather than being taken out and put back, as battles do) must be passed to update.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self, container, members) -> None:
+        """
+        Initializes the fingerprint of a team, and attaches it to the team's container.
+
+        Args:
+            container: The container the team is held in, such as PokeTeam.team.
+            members: The Pokemon in the team, in order.
+
+        Attributes:
+            container: The container the team is held in.
+            kind (int): The kind of container (see CONTAINER_KINDS).
+            unwrap (bool): True if the container holds the members in ListItems.
+            members (dict): The member and term at each coordinate.
+            coordinates (dict): The coordinate of each member.
+            low (int): The coordinate of the member at the start of the container's array.
+            forward (int): The sum of each member's term times ORDER_BASE^coordinate.
+            backward (int): The sum of each member's term times ORDER_BASE^-coordinate.
+            reversed (bool): True if the team reads the container's array from the end.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        self.container = container
+        self.kind = container_kind(container)
+        self.unwrap = isinstance(container, ArraySortedList)
+        self.members = {}
+        self.coordinates = {}
+        self.low = 0
+        self.forward = 0
+        self.backward = 0
+        self.reversed = False
+        for pokemon in members:
+            self._place(self.low + len(self.members), pokemon)
+        if self.kind != 0:
+            container.tracker = self
+
+    def __len__(self) -> int:
+        """
+        Returns the number of members in the team.
+        """
+        return len(self.members)
+
+    def _place(self, coordinate: int, pokemon) -> None:
+        """
+        Puts a member at a coordinate, with the term for its current state.
+        """
+        term = pokemon_fingerprint(pokemon) % ORDER_MODULUS
+        self.members[coordinate] = (pokemon, term)
+        self.coordinates[pokemon] = coordinate
+        self.forward = (self.forward + term * pow(ORDER_BASE, coordinate, ORDER_MODULUS)) % ORDER_MODULUS
+        self.backward = (self.backward + term * pow(ORDER_BASE, -coordinate, ORDER_MODULUS)) % ORDER_MODULUS
+
+    def _take(self, coordinate: int):
+        """
+        Takes the member at a coordinate out of the team, and returns it.
+        """
+        pokemon, term = self.members.pop(coordinate)
+        del self.coordinates[pokemon]
+        self.forward = (self.forward - term * pow(ORDER_BASE, coordinate, ORDER_MODULUS)) % ORDER_MODULUS
+        self.backward = (self.backward - term * pow(ORDER_BASE, -coordinate, ORDER_MODULUS)) % ORDER_MODULUS
+        return pokemon
+
+    def _move(self, first: int, last: int, step: int) -> None:
+        """
+        Moves the members with coordinates from first to last (inclusive) by step (1 or -1).
+
+        Complexity Analysis:
+            Best and worst case are O(k), where k is the number of members moved.
+        """
+        # Move the member nearest the free coordinate first, so none is overwritten
+        order = range(last, first - 1, -1) if step > 0 else range(first, last + 1)
+        for coordinate in order:
+            self._place(coordinate + step, self._take(coordinate))
+
+    def _coordinate(self, index: int) -> int:
+        """
+        Returns the coordinate of the member at a position of the team.
+        """
+        if self.reversed:
+            return self.low + len(self.members) - 1 - index
+        return self.low + index
+
+    def insert(self, index: int, item) -> None:
+        """
+        Records a member joining the team at a position, moving the members after it back.
+
+        Args:
+            index (int): The position of the new member.
+            item: The new member, as the container holds it.
+
+        Complexity Analysis:
+            Best and worst case are O(min(i, n - i)), where i is the position and n is the
+            size of the team.
+        """
+        self._insert(index, item.value if self.unwrap else item)
+
+    def _insert(self, index: int, pokemon) -> None:
+        """
+        Records a member joining the team at a position, given the Pokemon itself (see insert).
+        """
+        length = len(self.members)
+        # The number of members before the new one in the container's array
+        before = length - index if self.reversed else index
+        if before < length - before:
+            self._move(self.low, self.low + before - 1, -1)
+            self.low -= 1
+        else:
+            self._move(self.low + before, self.low + length - 1, 1)
+        self._place(self.low + before, pokemon)
+
+    def delete(self, index: int) -> None:
+        """
+        Records the member at a position leaving the team, moving the members after it forward.
+
+        Complexity Analysis:
+            Best and worst case are O(min(i, n - i)), where i is the position and n is the
+            size of the team.
+        """
+        length = len(self.members)
+        coordinate = self._coordinate(index)
+        self._take(coordinate)
+        before = coordinate - self.low
+        if before < length - 1 - before:
+            self._move(self.low, coordinate - 1, 1)
+            self.low += 1
+        else:
+            self._move(coordinate + 1, self.low + length - 1, -1)
+
+    def reverse(self) -> None:
+        """
+        Records the order of the whole team being reversed.
+        """
+        self.reversed = not self.reversed
+
+    def reverse_block(self, start: int, k: int) -> None:
+        """
+        Records the order of the k members from position start being reversed.
+
+        Complexity Analysis:
+            Best and worst case are O(k).
+        """
+        for i in range(k // 2):
+            first, second = self._coordinate(start + i), self._coordinate(start + k - 1 - i)
+            pokemon = self._take(first)
+            self._place(first, self._take(second))
+            self._place(second, pokemon)
+
+    def rotate(self, k: int) -> None:
+        """
+        Records the first k members moving to the end of the team, in order.
+
+        Complexity Analysis:
+            Best and worst case are O(min(k, n - k)), where n is the size of the team, as
+            moving the first k members to the end is the same as moving the last n - k to
+            the start.
+        """
+        length = len(self.members)
+        if length == 0:
+            return
+        k %= length
+        if k <= length - k:
+            for _ in range(k):
+                pokemon = self.members[self._coordinate(0)][0]
+                self.delete(0)
+                self._insert(length - 1, pokemon)
+        else:
+            for _ in range(length - k):
+                pokemon = self.members[self._coordinate(length - 1)][0]
+                self.delete(length - 1)
+                self._insert(0, pokemon)
+
+    def clear(self) -> None:
+        """
+        Records every member leaving the team.
+        """
+        self.members.clear()
+        self.coordinates.clear()
+        self.low = self.forward = self.backward = 0
+        self.reversed = False
+
+    def update(self, pokemon) -> None:
+        """
+        Records a change in the state of a member (its health, level or stage).
+
+        Args:
+            pokemon (Pokemon): The member, in its new state.
+
+        Raises:
+            KeyError: If the Pokemon is not a member of the team.
+        """
+        coordinate = self.coordinates[pokemon]
+        self._place(coordinate, self._take(coordinate))
+
+    def order_hash(self) -> int:
+        """
+        Returns the hash of the terms of the members in order, the sum of the term at each
+        position i times ORDER_BASE^i.
+        """
+        if self.reversed:
+            return self.backward * pow(ORDER_BASE, self.low + len(self.members) - 1, ORDER_MODULUS) % ORDER_MODULUS
+        return self.forward * pow(ORDER_BASE, -self.low, ORDER_MODULUS) % ORDER_MODULUS
+
+    def value(self) -> int:
+        """
+        Returns the 64-bit fingerprint of the team: the state of each member, in order, and the
+        kind of container the team is held in (as its order means something different in each).
+        """
+        return combine(self.kind, len(self.members), self.order_hash())
+
+    def recompute(self) -> int:
+        """
+        Returns the fingerprint worked out again from the current state of every member, which
+        is the same as value when every change to the team has been recorded.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        order_hash = 0
+        for i in range(len(self.members) - 1, -1, -1):
+            term = pokemon_fingerprint(self.members[self._coordinate(i)][0]) % ORDER_MODULUS
+            order_hash = (order_hash * ORDER_BASE + term) % ORDER_MODULUS
+        return combine(self.kind, len(self.members), order_hash)
+
+
+def battle_fingerprint(battle) -> int:
+    """
+    Returns the fingerprint of a battle setup: both teams (including whether their specials
+    have been used, see PokeTeam.fingerprint), the battle mode, the criterion and both Pokedexes.
+
+    Args:
+        battle (Battle): The battle.
+
+    Returns:
+        int: The 64-bit fingerprint.
+
+    Complexity Analysis:
+        Best case is O(k), where k is the length of the criterion, when both teams' fingerprints
+        are attached to their containers. Worst case is O(n + m + k), where n and m are the sizes
+        of the teams, the first time (see PokeTeam.fingerprint).
+    """
+    return combine(battle.t_1.pokemon_team.fingerprint(),
+                   battle.t_2.pokemon_team.fingerprint(),
+                   battle.battle_mode.value,
+                   text_fingerprint(str(battle.criterion)),
+                   battle.t_1.pokedex.elems,
+                   battle.t_2.pokedex.elems)
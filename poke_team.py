@@ -3,10 +3,14 @@ from battle_mode import *
 import random
 from typing import List
 from aset import *
+from data_structures.bset import BSet
+from fingerprint import TeamFingerprint, combine
 from data_structures.stack_adt import *
 from data_structures.queue_adt import *
 from data_structures.sorted_list_adt import *
 from data_structures.array_sorted_list import *
+import array
+import io
 
 class PokeTeam:
     """
@@ -16,24 +20,76 @@ class PokeTeam:
     Unless stated otherwise, all methods in this class are O(1) best/worst case.
     """
     random.seed(20)  # Set the random seed for reproducibility
-    TEAM_LIMIT = 6  # Maximum number of Pokémon allowed in the team
+    TEAM_LIMIT = 6  # Maximum number of Pokémon allowed in the team, unless a team is given its own size
     POKE_LIST = get_all_pokemon_types()  # List of all available Pokémon types
+    INSTANCE_POOL = SpeciesPool()  # Pokemon instances that teams no longer use, shared by all teams
+    NAME_INDEX = build_name_index()  # The species code of every name, evolved names included
+    REGEN_HEALTH = build_regen_health(POKE_LIST)  # The health each species code is regenerated with
+    ROSTER_TYPECODE = 'B' if len(Pokemon.SPECIES) * EVOLUTION_STAGES <= 256 else 'H'  # Smallest array type that fits every species code
+    # The sort key of a Pokemon for each criterion (fixed-point stats are scaled back, so keys
+    # are the same whatever mode the Pokemon's stats are stored in)
+    CRITERION_KEYS = {
+        'health': lambda pokemon: pokemon.get_health() / pokemon.scale,
+        'attack': lambda pokemon: pokemon.get_battle_power() / pokemon.scale,
+        'level': lambda pokemon: pokemon.get_level(),
+        'defence': lambda pokemon: pokemon.get_defence() / pokemon.scale,
+        'speed': lambda pokemon: pokemon.get_speed() / pokemon.scale,
+    }
 
     
-    def __init__(self):
+    def __init__(self, team_size: int = None):
         """
         Initializes a new instance of the PokeTeam class.
 
+        Args:
+            team_size (int): The number of Pokémon in the team, which may be more than TEAM_LIMIT
+                (for example, to stress-test battles with teams of thousands). By default the team
+                has TEAM_LIMIT Pokémon, read whenever the team is chosen.
+
         Attributes:
+            team_size (int): The number of Pokémon in the team, or None to use TEAM_LIMIT.
             team (ArrayR): An array representing the Pokémon team.
-            regen_team (ArrayR): An array representing the regenerated Pokémon team.
+            roster (array): The species code of each Pokémon the team was chosen with, which the team is regenerated from.
+            pool (PokemonPool): The pool the team's Pokémon are stored in, or None if they are Pokémon objects.
+            pool_indices (array): The indices of the team's Pokémon in the pool, when there is a pool.
             reversed (bool): A flag indicating if the team is reversed for the optimise battle special method.
+            offence_vector (array): For each PokeType, the sum of the effectiveness of every member attacking that type.
+            defence_vector (array): For each PokeType, the sum of the effectiveness of that type attacking every member.
+            member_fingerprint (TeamFingerprint): The fingerprint of the team, attached to its container the first
+                time it is asked for and kept up to date by the container from then on.
         """
+        self.team_size = team_size
         self.team = None
-        self.regen_team = None
+        self.roster = None
+        self.pool = None
+        self.pool_indices = None
         self.reversed = None
+        self.offence_vector = array.array('d', [0.0] * len(PokeType))
+        self.defence_vector = array.array('d', [0.0] * len(PokeType))
+        self.member_fingerprint = None
 
 
+    @staticmethod
+    def criterion_key(criterion):
+        """
+        Returns the function giving the sort key of a Pokemon for the given criterion, so the
+        criterion is only looked up once however many Pokemon are sorted by it.
+
+        Args:
+            criterion (str): The criterion ('health', 'attack', 'level', 'defence' or 'speed').
+
+        Returns:
+            The key function, or None if the criterion is unknown.
+        """
+        return PokeTeam.CRITERION_KEYS.get(criterion)
+
+    def get_team_size(self) -> int:
+        """
+        Returns the number of Pokémon the team is chosen with: its own team size if it was
+        given one, otherwise TEAM_LIMIT.
+        """
+        return PokeTeam.TEAM_LIMIT if self.team_size is None else self.team_size
+
     def choose_manually(self):
         """
         Choose Pokemon manually.
@@ -52,27 +108,34 @@ class PokeTeam:
             Best and worst case are O(n), where n is the length of the team.
         """
         # Choose Pokemon manually
-        length = PokeTeam.TEAM_LIMIT
-        # length = int(input(f"How many pokemon will be in this team? (limit {PokeTeam.TEAM_LIMIT})"))
+        length = self.get_team_size()
+        # length = int(input(f"How many pokemon will be in this team? (limit {self.get_team_size()})"))
         # The optional method of choosing the length of the team manually
     
-        if length > PokeTeam.TEAM_LIMIT:
-            print(f"This exceeds the team limit of {PokeTeam.TEAM_LIMIT}")
+        if length > self.get_team_size():
+            print(f"This exceeds the team limit of {self.get_team_size()}")
             self.choose_manually()
         elif length == '' or length == 0:
             print("There needs to be at least one pokemon in this team")
             self.choose_manually()
         else:
-            # Initialize team and regen_team arrays
+            # Initialize the team array and the roster
             self.team = ArrayR(length)
-            self.regen_team = ArrayR(length)
+            self.roster = array.array(PokeTeam.ROSTER_TYPECODE)
+            self.pool = self.pool_indices = None
+            self._clear_type_vectors()
             for i in range(length):
                 choice = input(f"Enter the name of Pokemon {i + 1}")
-                pokemon_class = globals().get(choice)
-                if pokemon_class in PokeTeam.POKE_LIST:
-                    # Add Pokemon to team and regen_team arrays
-                    self.team[i] = pokemon_class()
-                    self.regen_team[i] = pokemon_class()
+                pokemon_class = Pokemon.SPECIES_BY_NAME.get(choice)
+                stage = 0
+                if pokemon_class is None and choice in PokeTeam.NAME_INDEX:
+                    # The name of a Pokemon (such as "Mr. Mime", or an evolved name such as "Ivysaur")
+                    pokemon_class, stage = from_species_code(PokeTeam.NAME_INDEX[choice])
+                if pokemon_class is not None:
+                    # Add Pokemon to the team and record it in the roster
+                    self.team[i] = PokeTeam.INSTANCE_POOL.borrow(pokemon_class, stage)
+                    self.roster.append(species_code(pokemon_class.SPECIES_ID, stage))
+                    self.add_member(self.team[i])
                 else:
                     print("That Pokemon does not exist")
 
@@ -86,75 +149,274 @@ class PokeTeam:
         Complexity Analysis: 
             Best and worst case are O(n), where n is the length of the team.
         """
-        length = PokeTeam.TEAM_LIMIT
-        #length = int(input(f"How many pokemon will be in this team? (limit {PokeTeam.TEAM_LIMIT})"))
+        length = self.get_team_size()
+        #length = int(input(f"How many pokemon will be in this team? (limit {self.get_team_size()})"))
         #The optional method of choosing the length of the team manually
 
-        if length > PokeTeam.TEAM_LIMIT:
-            print(f"This exceeds the team limit of {PokeTeam.TEAM_LIMIT}")
+        if length > self.get_team_size():
+            print(f"This exceeds the team limit of {self.get_team_size()}")
             self.choose_randomly()
         elif length == '' or length == 0:
             print("There needs to be at least one pokemon in this team")
             self.choose_randomly()
         else:
             self.team = ArrayR(length)
-            self.regen_team = ArrayR(length)
+            self.roster = array.array(PokeTeam.ROSTER_TYPECODE)
+            self.pool = self.pool_indices = None
+            self._clear_type_vectors()
             for i in range(length):
                 random_pokemon = random.choice(PokeTeam.POKE_LIST)
-                self.team[i] = random_pokemon()
-                self.regen_team[i] = random_pokemon()
+                self.team[i] = PokeTeam.INSTANCE_POOL.borrow(random_pokemon)
+                self.roster.append(species_code(random_pokemon.SPECIES_ID, 0))
+                self.add_member(self.team[i])
+
+    def choose_from_roster(self, roster) -> None:
+        """
+        Choose Pokemon from a roster of species codes, making a new Pokemon at the base state of
+        each species and stage.
+
+        Args:
+            roster: The species code of each Pokemon, such as one record from generate_many.
+
+        Raises:
+            ValueError: If there are more Pokemon than the team size, or none at all.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the length of the team.
+        """
+        length = len(roster)
+        if length > self.get_team_size():
+            raise ValueError(f"This exceeds the team limit of {self.get_team_size()}")
+        if length == 0:
+            raise ValueError("There needs to be at least one pokemon in this team")
+        self.roster = array.array(PokeTeam.ROSTER_TYPECODE, roster)
+        self.pool = self.pool_indices = None
+        self.team = ArrayR(length)
+        self._clear_type_vectors()
+        for i in range(length):
+            self.team[i] = self._make_member(i)
+            self.add_member(self.team[i])
+
+    @staticmethod
+    def generate_many(count: int, size: int = None, rng=None) -> "TeamRecords":
+        """
+        Generates many random teams at once, as compact records of species codes rather than
+        Pokemon objects. Every species id is drawn in one vectorised NumPy call, picking species
+        uniformly from POKE_LIST just like choose_randomly. A record only becomes a team of
+        Pokemon when TeamRecords.team is called for it.
+
+        Args:
+            count (int): The number of teams.
+            size (int): The number of Pokemon in each team, TEAM_LIMIT by default.
+            rng: A numpy.random.Generator, or a seed for one. The same seed always gives the same teams.
+
+        Returns:
+            TeamRecords: The records of the teams.
+
+        Complexity Analysis:
+            Best and worst case are O(count * size).
+        """
+        # Only callers that generate teams in bulk need NumPy
+        import numpy
+        if size is None:
+            size = PokeTeam.TEAM_LIMIT
+        if not isinstance(rng, numpy.random.Generator):
+            rng = numpy.random.default_rng(rng)
+        poke_list = PokeTeam.POKE_LIST
+        codes = numpy.array([species_code(poke_list[i].SPECIES_ID, 0) for i in range(len(poke_list))],
+                            dtype=numpy.dtype(PokeTeam.ROSTER_TYPECODE))
+        return TeamRecords(codes[rng.integers(0, len(poke_list), size=(count, size))])
+
+    def choose_from_pool(self, pool, indices) -> None:
+        """
+        Choose Pokemon from a PokemonPool.
+
+        The team is made of handles for the Pokemon at the given indices of the pool, so the
+        Pokemon's state stays in the pool and battles update it there. Regenerating the team
+        resets the same entries of the pool.
+
+        Args:
+            pool (PokemonPool): The pool the Pokemon are stored in.
+            indices: The indices of the chosen Pokemon in the pool.
+
+        Raises:
+            ValueError: If there are more Pokemon than the team size, or none at all.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the length of the team.
+        """
+        length = len(indices)
+        if length > self.get_team_size():
+            raise ValueError(f"This exceeds the team limit of {self.get_team_size()}")
+        if length == 0:
+            raise ValueError("There needs to be at least one pokemon in this team")
+        self.team = ArrayR(length)
+        self.roster = array.array(PokeTeam.ROSTER_TYPECODE)
+        self.pool = pool
+        self.pool_indices = array.array('Q', indices)
+        self._clear_type_vectors()
+        for i, index in enumerate(indices):
+            self.team[i] = pool.handle(index)
+            self.roster.append(species_code(pool.species[index], pool.stage[index]))
+            self.add_member(self.team[i])
+
+    def _give_back_members(self) -> None:
+        """
+        Gives the Pokemon currently in the team back to INSTANCE_POOL, so later teams can reuse them.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the length of the team.
+        """
+        if self.team is None or self.pool is not None:
+            return
+        for member in self:
+            if member is not None:
+                PokeTeam.INSTANCE_POOL.give_back(member)
+
+    def _make_member(self, i: int):
+        """
+        Makes a new Pokemon for position i of the roster, at the base state of its species and stage.
+
+        Args:
+            i (int): The position in the roster.
+
+        Returns:
+            Pokemon: A new Pokemon, or a handle for the reset entry of the pool for pool teams.
+        """
+        species, stage = from_species_code(self.roster[i])
+        if self.pool is not None:
+            index = self.pool_indices[i]
+            self.pool.reset(index, species, stage)
+            return self.pool.handle(index)
+        return PokeTeam.INSTANCE_POOL.borrow(species, stage)
+
+    def _clear_type_vectors(self) -> None:
+        """
+        Resets the offence and defence vectors for an empty team.
+
+        Complexity Analysis:
+            Best and worst case are O(t), where t is the number of PokeTypes.
+        """
+        for i in range(len(self.offence_vector)):
+            self.offence_vector[i] = 0.0
+            self.defence_vector[i] = 0.0
+
+    def _update_type_vectors(self, pokemon, sign: int) -> None:
+        """
+        Adds (sign 1) or removes (sign -1) a Pokemon's effectiveness against every type to the team's vectors.
+
+        Args:
+            pokemon (Pokemon): The Pokemon joining or leaving the team.
+            sign (int): 1 if the Pokemon joins the team, -1 if it leaves.
+
+        Complexity Analysis:
+            Best and worst case are O(t), where t is the number of PokeTypes.
+        """
+        table = TypeEffectiveness.load_table()
+        type_count = TypeEffectiveness.TYPE_COUNT
+        member_type = pokemon.get_poketype().value
+        offence_row = member_type * type_count
+        for other_type in range(type_count):
+            self.offence_vector[other_type] += sign * table[offence_row + other_type]
+            self.defence_vector[other_type] += sign * table[other_type * type_count + member_type]
+
+    def add_member(self, pokemon) -> None:
+        """
+        Records a Pokemon joining the team in the team's offence and defence vectors.
+        A Pokemon keeps its type when it evolves, so evolving does not change the vectors.
+
+        Args:
+            pokemon (Pokemon): The Pokemon joining the team.
+
+        Complexity Analysis:
+            Best and worst case are O(t), where t is the number of PokeTypes.
+        """
+        self._update_type_vectors(pokemon, 1)
+
+    def remove_member(self, pokemon) -> None:
+        """
+        Records a Pokemon leaving the team in the team's offence and defence vectors.
+
+        Args:
+            pokemon (Pokemon): The Pokemon leaving the team.
+
+        Complexity Analysis:
+            Best and worst case are O(t), where t is the number of PokeTypes.
+        """
+        self._update_type_vectors(pokemon, -1)
+
+    def update_member(self, pokemon) -> None:
+        """
+        Records a change in the health, level or stage of a member that stays in the team's
+        container. Members taken out of the container and put back (as battles do) are recorded
+        when they are put back, so only changes made to a member in place need recording here.
+
+        Args:
+            pokemon (Pokemon): The member, in its new state.
+        """
+        if self.member_fingerprint is not None and self.member_fingerprint.container is self.team:
+            self.member_fingerprint.update(pokemon)
+
+    def offence_against(self, poketype: PokeType) -> float:
+        """
+        Returns how well the team attacks the given type.
+
+        Args:
+            poketype (PokeType): The defending type.
+
+        Returns:
+            float: The sum of the effectiveness of every member attacking the type.
+        """
+        return self.offence_vector[poketype.value]
+
+    def defence_against(self, poketype: PokeType) -> float:
+        """
+        Returns how vulnerable the team is to the given type.
+
+        Args:
+            poketype (PokeType): The attacking type.
+
+        Returns:
+            float: The sum of the effectiveness of the type attacking every member.
+        """
+        return self.defence_vector[poketype.value]
 
       
-    def regenerate_team(self, battle_mode, criterion=None) -> None:
+    def regenerate_team(self, battle_mode, criterion=None, recycle: bool = False) -> None:
         """
         Regenerates the team of Pokemon based on the given battle mode and criterion.
 
+        The team is rebuilt from its roster, so every member starts again as a new Pokemon of the
+        species and stage it was chosen with. The Pokemon left in the old team are not changed,
+        so anything still holding on to them can keep using them.
+
         Args:
             battle_mode: The mode of battle.
             criterion: The criterion for optimizing the team (optional).
+            recycle (bool): Whether to give the Pokemon left in the old team back to
+                INSTANCE_POOL, to be reset and reused. Only pass True when the caller owns the
+                team and nothing else refers to its members (see BattleTower.next_battle).
 
         Returns:
             None
 
         Complexity Analysis: 
-            Best and worst case are O(n*m*k), 
-            where:
-                - n is the size of the team
-                - m is the number of different Pokemon
-                - k is the maximum length of the evolution line among all Pokemon types
-            The method iterates through each Pokémon in the regen team, resulting in a time complexity proportional to the size of the team.
-            Within each iteration, it iterates through each Pokémon in the predefined list of Pokémon (PokeTeam.POKE_LIST). 
-            This results in a time complexity proportional to the number of different Pokémon types (m).
-            For each Pokémon, it checks if the Pokémon in the regenerated team belongs to its evolution line. 
-            If it does, it performs evolution operations, which are constant-time operations.
-            The overall complexity also considers the maximum length of the evolution line among all Pokémon types (k), as it affects the number of evolution operations performed for each Pokémon.
-        """
-        for regen_pokemon in self.regen_team:
-            # Iterate through each Pokemon in the regenerated team
-            for list_pokemon in PokeTeam.POKE_LIST:
-                # Iterate through each Pokemon type
-                list_pokemon_class = list_pokemon()
-                # Create an instance of the Pokemon type
-                if regen_pokemon.name in list_pokemon_class.get_evolution():
-                    # Check if the Pokemon is in the evolution line of the current Pokemon type
-                    health = list_pokemon_class.health
-                    # Store the current health
-                    evo_multiplier = list_pokemon_class.get_evolution().index(regen_pokemon.name)
-                    # Get the evolution multiplier based on the index of the Pokemon in the evolution line
-                    if evo_multiplier == 1:
-                        # Check if the Pokemon is at the first evolution stage
-                        list_pokemon_class._evolve()
-                        # Evolve the Pokemon once
-                    if evo_multiplier == 2:
-                        # Check if the Pokemon is at the second evolution stage
-                        list_pokemon_class._evolve()
-                        list_pokemon_class._evolve()
-                        # Evolve the Pokemon twice
-                    regen_pokemon.health = health
-                    # Reset the health to the stored value
-        
-        self.team = self.regen_team
-        # Update the team with the regenerated team
+            Best and worst case are O(n), where n is the size of the team, as each Pokémon's
+            health is looked up in REGEN_HEALTH by its species code.
+        """
+        if recycle:
+            self._give_back_members()
+        self.team = ArrayR(len(self.roster))
+        # Every member of the roster is back in the team, including those that fainted
+        self._clear_type_vectors()
+        for i in range(len(self.roster)):
+            # Rebuild each Pokemon in the roster
+            regen_pokemon = self._make_member(i)
+            regen_pokemon.health = PokeTeam.REGEN_HEALTH[self.roster[i]] * regen_pokemon.scale
+            # Reset the health to the base health of the species (in fixed-point units for pool Pokemon)
+            self.team[i] = regen_pokemon
+            self.add_member(regen_pokemon)
+
         if battle_mode == BattleMode.SET:
             # Assemble the team in 'SET' mode
             self.assemble_team(BattleMode.SET)
@@ -194,9 +456,10 @@ class PokeTeam:
             assembled_team = CircularQueue(self.__len__())
         elif battle_mode.value == 2:
             # Use ArraySortedList for OPTIMISE mode
-            assembled_team = ArraySortedList(self.__len__())
+            assembled_team = OffsetArraySortedList(self.__len__())
         
         # Iterate over the team and add Pokemon to the assembled_team
+        members = []
         for i in range(self.__len__()):
             if self.team[i] is not None:
                 if battle_mode.value == 0:
@@ -206,10 +469,12 @@ class PokeTeam:
                     # Add Pokemon to CircularQueue
                     assembled_team.append(self.team[i])
                 elif battle_mode.value == 2:
-                    # Add Pokemon to ArraySortedList
-                    assembled_team.add(ListItem(self.team[i], i))
+                    # Collect the Pokemon for the ArraySortedList, keyed by their position
+                    members.append(ListItem(self.team[i], i))
             else:
                 break
+        if battle_mode.value == 2:
+            assembled_team = OffsetArraySortedList.from_items(members)
         
         # Update the team with the assembled_team
         self.team = assembled_team
@@ -226,27 +491,21 @@ class PokeTeam:
             None
 
         Complexity Analysis: 
-            Best and worst case are O(n), where n is the size of the team.
+            Best and worst case are O(n log n), where n is the size of the team, as the team is
+            sorted in one go (in the same order as adding them one by one).
         """
-        # Initialize an ArraySortedList to store the assigned team
-        assigned_team = ArraySortedList(self.__len__())
+        # Look the criterion up once (an unknown criterion leaves the team empty)
+        key_of = self.criterion_key(criterion)
+        members = []
         # Iterate through the team
         for i in range(self.__len__()):
             # Check if the team member is not None
-            if not self.team[i] == None:
-                # Add Pokemon to the assigned team based on the given criterion
-                if criterion == 'health':
-                    assigned_team.add(ListItem(self.team.__getitem__(i).value, self.team.__getitem__(i).value.get_health()))
-                elif criterion == 'attack':
-                    assigned_team.add(ListItem(self.team.__getitem__(i).value, self.team.__getitem__(i).value.get_attack()))
-                elif criterion == 'level':
-                    assigned_team.add(ListItem(self.team.__getitem__(i).value, self.team.__getitem__(i).value.get_level()))
-                elif criterion == 'defence':
-                    assigned_team.add(ListItem(self.team.__getitem__(i).value, self.team.__getitem__(i).value.get_defence()))
-                elif criterion == 'speed':
-                    assigned_team.add(ListItem(self.team.__getitem__(i).value, self.team.__getitem__(i).value.get_speed()))
-        # Update the team with the assigned team
-        self.team = assigned_team
+            if key_of is not None and not self.team[i] == None:
+                # Key the Pokemon by the given criterion
+                pokemon = self.team[i].value
+                members.append(ListItem(pokemon, key_of(pokemon)))
+        # Update the team with the assigned team, sorted by key
+        self.team = OffsetArraySortedList.from_items(members)
       
     
     def special(self, battle_mode):
@@ -259,65 +518,45 @@ class PokeTeam:
         Returns:
             None
 
-        Complexity Analysis: 
-            Best case is O(3), and worst case is O(n), where n is the size of the team.
+        Complexity Analysis:
+            In SET and ROTATE mode the team is changed in place, by reversing at most 3 members,
+            moving where the queue starts and switching the direction of the queue.
+            Best case is O(1), for SET, and for ROTATE when the queue is full (as it is when the
+            team has just been assembled), as moving its start is O(1).
+            Worst case is O(n), where n is the length of the team, for ROTATE when the queue is
+            not full, as moving its start serves and appends n - 3 members.
+            In OPTIMISE mode the sorted list is rebuilt with negated keys, which is O(n log n)
+            (see ArraySortedList.from_items).
         """
         if battle_mode.value == 0:
-            # Perform special operation for battle mode 0
-            temp_stack1 = ArrayStack(self.__len__())
-            temp_stack2 = ArrayStack(self.__len__())
-            if self.__len__() > 3:
-                for i in range(3):
-                    temp_stack1.push(self.team.pop())
-                for i in range(3):
-                    temp_stack2.push(temp_stack1.pop())
-                for i in range(3):
-                    self.team.push(temp_stack2.pop())
-            else:
-                for i in range(self.__len__()):
-                    temp_stack1.push(self.team.pop())
-                for i in range(self.__len__()):
-                    temp_stack2.push(temp_stack1.pop())
-                for i in range(self.__len__()):
-                    self.team.push(temp_stack2.pop())
-                    
+            # Reverse the order of the top 3 members (or of the whole team, if it is smaller)
+            self.team.reverse_top(min(3, self.__len__()))
+
         if battle_mode.value == 1:
-            # Perform special operation for battle mode 1
-            temp_stack = ArrayStack(self.__len__())
+            # Keep the first 3 members in place and reverse the order of the rest: reversing
+            # the whole queue and moving the last 3 members (now first, reversed) back to the
+            # front leaves them reversed, so they are reversed once more
             length = self.__len__()
             if length > 3:
-                for i in range(3):
-                    item = self.team.serve()
-                    self.team.append(item)
-                for i in range(length - 3):
-                    item = self.team.serve() 
-                    temp_stack.push(item)
-                for i in range(length - 3):
-                    item = temp_stack.pop()
-                    self.team.append(item)
-            else:
-                pass
-            
+                self.team.reverse()
+                self.team.rotate(length - 3)
+                self.team.reverse_block(0, 3)
+
         if battle_mode.value == 2:
-            # Perform special operation for battle mode 2
+            # Sort the team in descending order of its key, by negating the keys. The members are
+            # added in reverse order of position, as they used to be added one by one, so members
+            # with the same key end up in the same order as they always have
             length = self.__len__()
-            temp_stack1 = ArrayStack(length)
-            temp_stack2 = ArrayStack(length)
-            temp_sortedlist = ArraySortedList(length)
-            for i in range(length):
-                temp_stack1.push(self.team[i].value)
-                temp_stack2.push((self.team[i].key)*(-1))
-            for i in range(length):
-                temp_sortedlist.add(ListItem(temp_stack1.pop(), temp_stack2.pop()))
-            
-            self.team = temp_sortedlist
-            
+            self.team = OffsetArraySortedList.from_items(
+                [ListItem(self.team[i].value, self.team[i].key * (-1)) for i in range(length - 1, -1, -1)])
+
         self.reversed = True
      
    
     def __getitem__(self, index: int):
         """
-        Retrieves the item at the specified index from the team.
+        Retrieves the Pokemon at the specified index from the team, without changing the team.
+        Index 0 is the top of a stack, the front of a queue and the first item of a sorted list.
 
         Args:
             index (int): The index of the item to retrieve.
@@ -325,45 +564,30 @@ class PokeTeam:
         Returns:
             Any: The item at the specified index.
 
-        Variables:
-            temp_array (ArrayR): Temporary array to store items.
-            temp_stack (ArrayStack): Temporary stack for operations.
-            item (Any): Current item being processed.
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if isinstance(self.team, ArraySortedList):
+            # Sorted lists hold the Pokemon in ListItems
+            return self.team[index].value
+        return self.team[index]
+
+    def __iter__(self):
+        """
+        Iterates over the Pokemon in the team in index order, without changing the team.
 
         Complexity Analysis: 
             Best and worst case are O(n), where n is the size of the team.
         """
-        temp_array = ArrayR(self.__len__())
-
-        if isinstance(self.team, ArrayStack):
-            # If the team is implemented as an ArrayStack
-            temp_stack = ArrayStack(self.__len__())
-            for i in range(self.__len__()):
-                item = self.team.pop()
-                temp_array[i] = item
-                temp_stack.push(item)
-            for i in range(len(temp_stack)):
-                item = temp_stack.pop()
-                self.team.push(item)
-            return temp_array[index]
-
-        elif isinstance(self.team, CircularQueue):
-            # If the team is implemented as a CircularQueue
-            for i in range(self.__len__()):
-                item = self.team.serve()
-                temp_array[i] = item
-                self.team.append(item)
-            return temp_array[index]
-
-        elif isinstance(self.team, ArraySortedList):
-            # If the team is implemented as an ArraySortedList
-            return self.team[index].value
-            
+        if isinstance(self.team, ArraySortedList):
+            for i in range(len(self.team)):
+                yield self.team[i].value
         elif isinstance(self.team, ArrayR):
-            # If the team is implemented as an ArrayR
-            return self.team[index]
+            for i in range(len(self.team)):
+                yield self.team[i]
+        else:
+            yield from self.team
 
-   
     def __len__(self):
         """
         Returns the length of the team.
@@ -374,49 +598,140 @@ class PokeTeam:
         return len(self.team)
 
     
+    def fingerprint(self) -> int:
+        """
+        Returns a stable 64-bit fingerprint of the team: the species, stage, health and level of
+        each member, in index order, the kind of container the team is held in and whether its
+        special has been used.
+
+        The first call for a container attaches a TeamFingerprint to it, which the container
+        keeps up to date as members are added, removed and reordered. A member changed while it
+        stays in the container must be passed to update_member, or the fingerprint goes stale.
+
+        Complexity Analysis:
+            Best case is O(1), when the fingerprint is attached to the team's container.
+            Worst case is O(n), where n is the size of the team, the first time it is called
+            after the team is put in a new container.
+        """
+        if self.member_fingerprint is None or self.member_fingerprint.container is not self.team:
+            self.member_fingerprint = TeamFingerprint(self.team, [pokemon for pokemon in self if pokemon is not None])
+        return combine(self.member_fingerprint.value(), bool(self.reversed))
+
+    def render(self, stream) -> None:
+        """
+        Writes the team to a file-like object, one Pokemon at a time in index order, without
+        changing the team.
+
+        Each Pokemon is followed by a new line, except in sorted list (OPTIMISE) teams, which
+        have always been written without one.
+
+        Args:
+            stream: Any object with a write(str) method, such as an open file or io.StringIO.
+
+        Complexity Analysis: 
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        if self.team is None:
+            return
+        end = "" if isinstance(self.team, ArraySortedList) else "\n"
+        for pokemon in self:
+            stream.write(str(pokemon))
+            stream.write(end)
+
     def __str__(self):
         """
-        Returns a string representation of the team.
+        Returns a string representation of the team, as written by render.
 
         Returns:
             str: A string representing the team.
 
-        Variables:
-            team_str (str): String representation of the team.
-            temp_stack (ArrayStack): Temporary stack for operations.
-            item (Any): Current item being processed.
-
         Complexity Analysis: 
             Best and worst case are O(n), where n is the size of the team.
         """
-        team_str = ""
-        if isinstance(self.team, ArrayStack):
-            # If the team is implemented as an ArrayStack
-            temp_stack = ArrayStack(self.__len__())
-            for i in range(self.__len__()):
-                item = self.team.pop()
-                team_str += str(item) + "\n"
-                temp_stack.push(item)
-            for i in range(len(temp_stack)):
-                item = temp_stack.pop()
-                self.team.push(item)
-        
-        elif isinstance(self.team, CircularQueue):
-            # If the team is implemented as a CircularQueue
-            for i in range(self.__len__()):
-                item = self.team.serve()
-                team_str += str(item) + "\n"
-                self.team.append(item)
-        elif isinstance(self.team, ArraySortedList):
-            # If the team is implemented as an ArraySortedList
-            for i in range(self.__len__()):
-                team_str += str(self.team[i].value)
-        elif isinstance(self.team, ArrayR):
-            # If the team is implemented as an ArrayR
-            for i in range(self.__len__()):
-                team_str += str(self.team[i]) + "\n"
-        
-        return team_str
+        team_str = io.StringIO()
+        self.render(team_str)
+        return team_str.getvalue()
+
+
+class TeamRecords:
+    """
+    Holds many teams as records of species codes, one row of a 2D NumPy array per team, as
+    made by PokeTeam.generate_many. A few bytes per Pokemon, so millions of teams fit in memory.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self, codes) -> None:
+        """
+        Initializes the records.
+
+        Args:
+            codes: A 2D NumPy array with the roster of one team in each row.
+        """
+        self.codes = codes
+
+    def __len__(self) -> int:
+        """
+        Returns the number of teams.
+        """
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> bytes:
+        """
+        Returns the roster of the team at the given index as species codes.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        return self.codes[index].tobytes()
+
+    def team(self, index: int) -> PokeTeam:
+        """
+        Makes the team at the given index into a PokeTeam of new Pokemon.
+
+        Args:
+            index (int): The index of the team.
+
+        Returns:
+            PokeTeam: The team, chosen but not yet assembled.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        roster = self.codes[index]
+        poketeam = PokeTeam(len(roster))
+        poketeam.choose_from_roster(roster.tolist())
+        return poketeam
+
+    def trainer(self, index: int, name: str) -> "Trainer":
+        """
+        Makes a Trainer whose team is the team at the given index, with its Pokemon registered in the pokedex.
+
+        Args:
+            index (int): The index of the team.
+            name (str): The name of the Trainer.
+
+        Returns:
+            Trainer: The Trainer.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the size of the team.
+        """
+        trainer = Trainer(name, len(self.codes[index]))
+        trainer.pokemon_team = self.team(index)
+        for pokemon in trainer.pokemon_team:
+            trainer.register_pokemon(pokemon)
+        return trainer
+
+
+def completion_ratio_table(completions) -> tuple:
+    """
+    Returns the ratio of every pair of Pokedex completions, where entry [a][b] is the multiplier a
+    Trainer with a types registered attacks a Trainer with b types registered with (None if b is 0).
+
+    Complexity Analysis:
+        Best and worst case are O(t^2), where t is the number of types.
+    """
+    return tuple(tuple(completion / other if other else None for other in completions) for completion in completions)
 
 
 class Trainer:
@@ -425,24 +740,31 @@ class Trainer:
 
     Unless stated otherwise, all methods in this class are O(1) best/worst case.
     """
-    def __init__(self, name: str) -> None:
+    COMPLETIONS = tuple(round(float(count / 15), 2) for count in range(len(PokeType) + 1))  # The completion of a Pokedex with each number of types
+    COMPLETION_RATIOS = completion_ratio_table(COMPLETIONS)  # The attack multiplier between each pair of numbers of types
+
+    def __init__(self, name: str, team_size: int = None) -> None:
         """
         Initializes a Trainer with a name, a Pokemon team, and a Pokedex.
 
         Args:
             name (str): The name of the Trainer.
+            team_size (int): The number of Pokemon in the Trainer's team, or None for PokeTeam.TEAM_LIMIT.
         
         Attributes:
             name (str): The name of the Trainer.
             pokemon_team (PokeTeam): The Trainer's Pokemon team.
-            pokedex (ASet): The Trainer's Pokedex containing captured Pokemon types.
+            pokedex (BSet): The Trainer's Pokedex containing captured Pokemon types, as a bit set
+                where bit i is set if a Pokemon whose PokeType value is i has been registered.
+            pokedex_count (int): The number of types in the Pokedex, kept up to date by register_pokemon.
 
         Returns:
             None
         """
         self.name = name
-        self.pokemon_team = PokeTeam()
-        self.pokedex = ASet(15)
+        self.pokemon_team = PokeTeam(team_size)
+        self.pokedex = BSet(len(PokeType))
+        self.pokedex_count = 0
 
     
     def pick_team(self, method: str) -> None:
@@ -487,7 +809,7 @@ class Trainer:
         return self.name
 
     
-    def register_pokemon(self, pokemon: Pokemon) -> None:
+    def register_pokemon(self, pokemon: Pokemon) -> bool:
         """
         Registers a captured Pokemon in the Trainer's Pokedex.
 
@@ -495,9 +817,15 @@ class Trainer:
             pokemon (Pokemon): The captured Pokemon.
 
         Returns:
-            None
+            bool: True if the Pokemon's type was new to the Pokedex, so its completion changed.
         """
-        self.pokedex.add(pokemon.poketype)
+        # BSet elements start at 1, so type i is stored as i + 1 (bit i of the mask)
+        known = self.pokedex.elems
+        self.pokedex.add(pokemon.poketype.value + 1)
+        if self.pokedex.elems == known:
+            return False
+        self.pokedex_count += 1
+        return True
 
     
     def get_pokedex_completion(self) -> float:
@@ -507,7 +835,65 @@ class Trainer:
         Returns:
             float: The completion percentage of the Pokedex.
         """
-        return round(float((self.pokedex.__len__()) / 15), 2)
+        return self.COMPLETIONS[self.pokedex_count]
+
+    def multiplier_against(self, other: 'Trainer') -> float:
+        """
+        Returns the multiplier the Trainer's Pokemon attack the other Trainer's Pokemon with:
+        the Trainer's Pokedex completion divided by the other Trainer's.
+
+        Args:
+            other (Trainer): The Trainer being attacked.
+
+        Returns:
+            float: The attack multiplier.
+
+        Raises:
+            ZeroDivisionError: If the other Trainer's Pokedex is empty.
+        """
+        multiplier = self.COMPLETION_RATIOS[self.pokedex_count][other.pokedex_count]
+        if multiplier is None:
+            raise ZeroDivisionError(f"{other.name} has not registered any Pokemon")
+        return multiplier
+
+    @staticmethod
+    def pokedex_union(trainers) -> BSet:
+        """
+        Returns the types registered in the Pokedex of any of the given Trainers.
+
+        Args:
+            trainers: The Trainers.
+
+        Returns:
+            BSet: The union of their Pokedexes.
+
+        Complexity Analysis:
+            Best and worst case are O(k), where k is the number of Trainers.
+        """
+        union = BSet()
+        for trainer in trainers:
+            union.elems |= trainer.pokedex.elems
+        return union
+
+    @staticmethod
+    def pokedex_intersection(trainers) -> BSet:
+        """
+        Returns the types registered in the Pokedex of every one of the given Trainers.
+
+        Args:
+            trainers: The Trainers (if there are none, every type is in the result).
+
+        Returns:
+            BSet: The intersection of their Pokedexes.
+
+        Complexity Analysis:
+            Best and worst case are O(k), where k is the number of Trainers.
+        """
+        intersection = BSet()
+        intersection.elems = (1 << len(PokeType)) - 1
+        for trainer in trainers:
+            intersection.elems &= trainer.pokedex.elems
+        return intersection
 
     
     def __str__(self) -> str:
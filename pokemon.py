@@ -1,1015 +1,350 @@
-from pokemon_base import *
-import inspect
-
-class Bulbasaur(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 45
-        self.level = 1
-        self.poketype = PokeType.GRASS
-        self.battle_power = 14
-        self.evolution_line = ["Bulbasaur", "Ivysaur", "Venusaur"]
-        self.name = "Bulbasaur"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 4.5
-
-class Charmander(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 39
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 22
-        self.evolution_line = ["Charmander", "Charmeleon", "Charizard"]
-        self.name = "Charmander"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 65
-
-class Squirtle(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 44
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 10
-        self.evolution_line = ["Squirtle", "Wartortle", "Blastoise"]
-        self.name = "Squirtle"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 43
-
-class Caterpie(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 20
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 7
-        self.evolution_line = ["Caterpie", "Metapod", "Butterfree"]
-        self.name = "Caterpie"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 30
-
-class Weedle(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 25
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 9
-        self.evolution_line = ["Weedle", "Kakuna", "Beedrill"]
-        self.name = "Weedle"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 50
-
-class Pidgey(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.FLYING
-        self.battle_power = 21
-        self.evolution_line = ["Pidgey", "Pidgeotto", "Pidgeot"]
-        self.name = "Pidgey"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 56
-
-class Rattata(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 15
-        self.evolution_line = ["Rattata", "Raticate"]
-        self.name = "Rattata"
-        self.experience = 0
-        self.defence = 5
-        self.speed = 72
-
-class Spearow(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.FLYING
-        self.battle_power = 19
-        self.evolution_line = ["Spearow", "Fearow"]
-        self.name = "Spearow"
-        self.experience = 0
-        self.defence = 9
-        self.speed = 70
-
-class Ekans(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 15
-        self.evolution_line = ["Ekans", "Arbok"]
-        self.name = "Ekans"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 55
-
-class Pikachu(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.ELECTRIC
-        self.battle_power = 30
-        self.evolution_line = ["Pikachu", "Raichu"]
-        self.name = "Pikachu"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 90
-
-class Sandshrew(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.GROUND
-        self.battle_power = 30
-        self.evolution_line = ["Sandshrew", "Sandslash"]
-        self.name = "Sandshrew"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 40
-
-class NidoranM(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 46
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 23
-        self.evolution_line = ["Nidoran(M)", "Nidorino", "Nidoking"]
-        self.name = "Nidoran(M)"
-        self.experience = 0
-        self.defence = 7
-        self.speed = 41
+"""
+This module contains every Pokemon species.
 
-class NidoranF(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 55
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 20
-        self.evolution_line = ["Nidoran(F)", "Nidorina", "Nidoqueen"]
-        self.name = "Nidoran(F)"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 56
-
-class Clefairy(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 70
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 17
-        self.evolution_line = ["Clefairy", "Clefable"]
-        self.name = "Clefairy"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 35
-
-class Vulpix(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 38
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 21
-        self.evolution_line = ["Vulpix", "Ninetales"]
-        self.name = "Vulpix"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 65
-
-class Jigglypuff(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 67
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 13
-        self.evolution_line = ["Jigglypuff", "Wigglytuff"]
-        self.name = "Jigglypuff"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 20
-
-class Zubat(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 20
-        self.evolution_line = ["Zubat", "Golbat"]
-        self.name = "Zubat"
-        self.experience = 0
-        self.defence = 7
-        self.speed = 80
-
-class Oddish(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 45
-        self.level = 1
-        self.poketype = PokeType.GRASS
-        self.battle_power = 18
-        self.evolution_line = ["Oddish", "Gloom", "Vileplume"]
-        self.name = "Oddish"
-        self.experience = 0
-        self.defence = 7
-        self.speed = 30
-
-class Paras(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 23
-        self.evolution_line = ["Paras", "Parasect"]
-        self.name = "Paras"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 25
-
-class Venonat(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 60
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 30
-        self.evolution_line = ["Venonat", "Venomoth"]
-        self.name = "Venonat"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 45
-
-class Diglett(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 10
-        self.level = 1
-        self.poketype = PokeType.GROUND
-        self.battle_power = 29
-        self.evolution_line = ["Diglett", "Dugtrio"]
-        self.name = "Diglett"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 95
-
-class Meowth(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 20
-        self.evolution_line = ["Meowth", "Persian"]
-        self.name = "Meowth"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 90
-
-class Psyduck(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 20
-        self.evolution_line = ["Psyduck", "Golduck"]
-        self.name = "Psyduck"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 55
-
-class Mankey(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.FIGHTING
-        self.battle_power = 35
-        self.evolution_line = ["Mankey", "Primeape"]
-        self.name = "Mankey"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 70
-
-class Growlithe(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 55
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 24
-        self.evolution_line = ["Growlithe", "Arcanine"]
-        self.name = "Growlithe"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 60
-
-class Poliwag(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 20
-        self.evolution_line = ["Poliwag", "Poliwhirl", "Poliwrath"]
-        self.name = "Poliwag"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 90
-
-class Abra(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 25
-        self.level = 1
-        self.poketype = PokeType.PSYCHIC
-        self.battle_power = 10
-        self.evolution_line = ["Abra", "Kadabra", "Alakazam"]
-        self.name = "Abra"
-        self.experience = 0
-        self.defence = 5
-        self.speed = 90
-
-class Machop(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 55
-        self.level = 1
-        self.poketype = PokeType.FIGHTING
-        self.battle_power = 30
-        self.evolution_line = ["Machop", "Machoke", "Machamp"]
-        self.name = "Machop"
-        self.experience = 0
-        self.defence = 26
-        self.speed = 35
-
-class Bellsprout(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.GRASS
-        self.battle_power = 26
-        self.evolution_line = ["Bellsprout", "Weepinbell", "Victreebel"]
-        self.name = "Bellsprout"
-        self.experience = 0
-        self.defence = 13
-        self.speed = 40
-
-class Tentacool(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 25
-        self.evolution_line = ["Tentacool", "Tentacruel"]
-        self.name = "Tentacool"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 70
-
-class Geodude(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.ROCK
-        self.battle_power = 7
-        self.evolution_line = ["Geodude", "Graveler", "Golem"]
-        self.name = "Geodude"
-        self.experience = 0
-        self.defence = 35
-        self.speed = 20
-
-class Ponyta(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 25
-        self.evolution_line = ["Ponyta", "Rapidash"]
-        self.name = "Ponyta"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 90
-
-class Slowpoke(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 66
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 8
-        self.evolution_line = ["Slowpoke", "Slowbro"]
-        self.name = "Slowpoke"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 15
-
-class Magnemite(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 25
-        self.level = 1
-        self.poketype = PokeType.ELECTRIC
-        self.battle_power = 20
-        self.evolution_line = ["Magnemite", "Magneton"]
-        self.name = "Magnemite"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 45
-
-class Farfetchd(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 52
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 17
-        self.evolution_line = ["Farfetchd"]
-        self.name = "Farfetchd"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 60
-
-class Doduo(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.FLYING
-        self.battle_power = 30
-        self.evolution_line = ["Doduo", "Dodrio"]
-        self.name = "Doduo"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 75
-
-class Seel(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.ICE
-        self.battle_power = 45
-        self.evolution_line = ["Seel", "Dewgong"]
-        self.name = "Seel"
-        self.experience = 0
-        self.defence = 25
-        self.speed = 65
-
-class Grimer(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 80
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 30
-        self.evolution_line = ["Grimer", "Muk"]
-        self.name = "Grimer"
-        self.experience = 0
-        self.defence = 25
-        self.speed = 25
-
-class Shellder(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 20
-        self.evolution_line = ["Shellder", "Cloyster"]
-        self.name = "Shellder"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 40
-
-class Gastly(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.GHOST
-        self.battle_power = 25
-        self.evolution_line = ["Gastly", "Haunter", "Gengar"]
-        self.name = "Gastly"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 80
-
-class Onix(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.ROCK
-        self.battle_power = 45
-        self.evolution_line = ["Onix", "Steelix"]
-        self.name = "Onix"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 30
-
-class Drowzee(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 60
-        self.level = 1
-        self.poketype = PokeType.PSYCHIC
-        self.battle_power = 25
-        self.evolution_line = ["Drowzee", "Hypno"]
-        self.name = "Drowzee"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 42
-
-class Krabby(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 22
-        self.evolution_line = ["Krabby", "Kingler"]
-        self.name = "Krabby"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 50
-
-class Voltorb(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.ELECTRIC
-        self.battle_power = 30
-        self.evolution_line = ["Voltorb", "Electrode"]
-        self.name = "Voltorb"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 100
-
-class Exeggcute(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 60
-        self.level = 1
-        self.poketype = PokeType.GRASS
-        self.battle_power = 17
-        self.evolution_line = ["Exeggcute", "Exeggutor"]
-        self.name = "Exeggcute"
-        self.experience = 0
-        self.defence = 7
-        self.speed = 20
-
-class Cubone(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.GROUND
-        self.battle_power = 18
-        self.evolution_line = ["Cubone", "Marowak"]
-        self.name = "Cubone"
-        self.experience = 0
-        self.defence = 8
-        self.speed = 35
-
-class Hitmonlee(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.FIGHTING
-        self.battle_power = 25
-        self.evolution_line = ["Hitmonlee"]
-        self.name = "Hitmonlee"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 87
-
-class Hitmonchan(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 50
-        self.level = 1
-        self.poketype = PokeType.FIGHTING
-        self.battle_power = 30
-        self.evolution_line = [ "Hitmonchan"]
-        self.name = "Hitmonchan"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 76
-
-class Lickitung(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 90
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 55
-        self.evolution_line = ["Lickitung"]
-        self.name = "Lickitung"
-        self.experience = 0
-        self.defence = 35
-        self.speed = 30
-
-class Koffing(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.POISON
-        self.battle_power = 35
-        self.evolution_line = ["Koffing", "Weezing"]
-        self.name = "Koffing"
-        self.experience = 0
-        self.defence = 25
-        self.speed = 35
-
-class Rhyhorn(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 80
-        self.level = 1
-        self.poketype = PokeType.GROUND
-        self.battle_power = 45
-        self.evolution_line = ["Rhyhorn", "Rhydon"]
-        self.name = "Rhyhorn"
-        self.experience = 0
-        self.defence = 50
-        self.speed = 25
-
-class Chansey(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 150
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 5
-        self.evolution_line = ["Chansey", "Blissey"]
-        self.name = "Chansey"
-        self.experience = 0
-        self.defence = 5
-        self.speed = 50
-
-class Tangela(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.GRASS
-        self.battle_power = 28
-        self.evolution_line = ["Tangela"]
-        self.name = "Tangela"
-        self.experience = 0
-        self.defence = 24
-        self.speed = 30
-
-class Kangaskhan(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 88
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 32
-        self.evolution_line = ["Kangaskhan"]
-        self.name = "Kangaskhan"
-        self.experience = 0
-        self.defence = 60
-        self.speed = 70
-
-class Horsea(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 10
-        self.evolution_line = ["Horsea", "Seadra"]
-        self.name = "Horsea"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 60
-
-class Goldeen(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 45
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 11
-        self.evolution_line = ["Goldeen", "Seaking"]
-        self.name = "Goldeen"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 65
-
-class Staryu(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 10
-        self.evolution_line = ["Staryu", "Starmie"]
-        self.name = "Staryu"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 85
-
-class MrMime(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 40
-        self.level = 1
-        self.poketype = PokeType.PSYCHIC
-        self.battle_power = 10
-        self.evolution_line = ["Mr. Mime"]
-        self.name = "Mr. Mime"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 30
-
-class Scyther(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 70
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 20
-        self.evolution_line = ["Scyther"]
-        self.name = "Scyther"
-        self.experience = 0
-        self.defence = 15
-        self.speed = 105
-
-class Jynx(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.ICE
-        self.battle_power = 20
-        self.evolution_line = ["Jynx"]
-        self.name = "Jynx"
-        self.experience = 0
-        self.defence = 35
-        self.speed = 95
-
-class Electabuzz(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.ELECTRIC
-        self.battle_power = 15
-        self.evolution_line = ["Electabuzz"]
-        self.name = "Electabuzz"
-        self.experience = 0
-        self.defence = 12
-        self.speed = 100
-
-class Magmar(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 20
-        self.evolution_line = ["Magmar"]
-        self.name = "Magmar"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 80
-
-class Pinsir(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.BUG
-        self.battle_power = 20
-        self.evolution_line = ["Pinsir"]
-        self.name = "Pinsir"
-        self.experience = 0
-        self.defence = 35
-        self.speed = 85
-
-class Tauros(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 75
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 15
-        self.evolution_line = ["Tauros"]
-        self.name = "Tauros"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 110
-
-class Magikarp(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 20
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 5
-        self.evolution_line = ["Magikarp", "Gyarados"]
-        self.name = "Magikarp"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 80
-
-class Lapras(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 90
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 12
-        self.evolution_line = ["Lapras"]
-        self.name = "Lapras"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 60
-
-class Ditto(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 48
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 10
-        self.evolution_line = ["Ditto"]
-        self.name = "Ditto"
-        self.experience = 0
-        self.defence = 48
-        self.speed = 50
-
-class Eevee(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 55
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 10
-        self.evolution_line = ["Eevee"]
-        self.name = "Eevee"
-        self.experience = 0
-        self.defence = 35
-        self.speed = 55
-
-class Porygon(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 65
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 12
-        self.evolution_line = ["Porygon"]
-        self.name = "Porygon"
-        self.experience = 0
-        self.defence = 7
-        self.speed = 60
-
-class Omanyte(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 35
-        self.level = 1
-        self.poketype = PokeType.WATER
-        self.battle_power = 12
-        self.evolution_line = ["Omanyte", "Omastar"]
-        self.name = "Omanyte"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 40
-
-class Kabuto(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 30
-        self.level = 1
-        self.poketype = PokeType.ROCK
-        self.battle_power = 10
-        self.evolution_line = ["Kabuto", "Kabutops"]
-        self.name = "Kabuto"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 55
-
-class Aerodactyl(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 80
-        self.level = 1
-        self.poketype = PokeType.ROCK
-        self.battle_power = 25
-        self.evolution_line = ["Aerodactyl"]
-        self.name = "Aerodactyl"
-        self.experience = 0
-        self.defence = 5
-        self.speed = 130
-
-class Snorlax(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 85
-        self.level = 1
-        self.poketype = PokeType.NORMAL
-        self.battle_power = 20
-        self.evolution_line = ["Munchlax", "Snorlax"]
-        self.name = "Snorlax"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 30
-
-class Articuno(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 90
-        self.level = 1
-        self.poketype = PokeType.ICE
-        self.battle_power = 30
-        self.evolution_line = ["Articuno"]
-        self.name = "Articuno"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 85
-
-class Zapdos(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 90
-        self.level = 1
-        self.poketype = PokeType.ELECTRIC
-        self.battle_power = 30
-        self.evolution_line = ["Zapdos"]
-        self.name = "Zapdos"
-        self.experience = 0
-        self.defence = 20
-        self.speed = 100
+The stats of each species are kept in pokemon_species.csv (and read through a precompiled
+binary copy), and a Species subclass is made for each row, so every species can still be
+used by its class name, e.g. Bulbasaur().
+"""
+from pokemon_base import *
+from data_cache import data_path, load_cached
+from data_structures.stack_adt import ArrayStack
+from typing import NamedTuple
+import csv
+
+SPECIES_CSV = data_path("pokemon_species.csv")
+SPECIES_CACHE = data_path("pokemon_species.bin")
+SPECIES_CACHE_VERSION = 1
+
+
+def read_species_table() -> list:
+    """
+    Parses the species table from its CSV file.
+
+    Returns:
+        list: One tuple per species, of (class name, name, type name, health, battle power,
+            defence, speed, evolution line), in the order the species are defined.
+
+    Complexity Analysis:
+        Best and worst case are O(n), where n is the number of species.
+    """
+    def parse_stat(value: str):
+        # Whole stats are ints, as they were in the hand-written classes
+        return int(value) if value.isdigit() else float(value)
+
+    with open(SPECIES_CSV, "r") as csvfile:
+        csvreader = csv.reader(csvfile)
+        next(csvreader)
+        return [(class_name, name, poketype, parse_stat(health), parse_stat(battle_power), parse_stat(defence),
+                 parse_stat(speed), tuple(evolution_line.split("|")))
+                for class_name, name, poketype, health, battle_power, defence, speed, evolution_line in csvreader]
+
+
+class SpeciesData(NamedTuple):
+    """
+    The data that is the same for every Pokemon of a species, shared by all of them.
+
+    The stage_ tables hold the base stats at each of the EVOLUTION_STAGES stages, worked out the
+    same way as evolving does (so species that stop evolving early still have every stage), and
+    names holds the name at each stage the species can reach.
+    """
+    class_name: str
+    name: str
+    poketype: PokeType
+    health: int
+    battle_power: int
+    defence: int
+    speed: int
+    evolution_line: tuple
+    names: tuple
+    final_stage: int
+    stage_health: tuple
+    stage_battle_power: tuple
+    stage_defence: tuple
+    stage_speed: tuple
+
+
+class Species(Pokemon, register=False):
+    """
+    Represents a Pokemon whose stats come from the species table. Every species is a subclass
+    of Species, with its row of the table in SPECIES_DATA, and its type and evolution line
+    shared as class attributes.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+    __slots__ = ()
+
+    SPECIES_DATA = None
+
+    def __init__(self):
+        """
+        Initializes a new Pokemon of the species at its first stage, straight from SPECIES_DATA.
+        """
+        self.reset()
+
+    def reset(self, stage: int = 0) -> None:
+        """
+        Restores the Pokemon to the state of a new Pokemon of its species, so the instance can be reused.
+
+        Args:
+            stage (int): The evolution stage to restore the Pokemon at, with the base stats of that stage.
+
+        Raises:
+            ValueError: If the species cannot reach the stage.
+        """
+        species_data = self.SPECIES_DATA
+        if stage == 0:
+            self.health = species_data.health
+            self.battle_power = species_data.battle_power
+            self.name = species_data.name
+            self.defence = species_data.defence
+            self.speed = species_data.speed
+        elif 0 < stage <= species_data.final_stage:
+            self.health = species_data.stage_health[stage]
+            self.battle_power = species_data.stage_battle_power[stage]
+            self.name = species_data.names[stage]
+            self.defence = species_data.stage_defence[stage]
+            self.speed = species_data.stage_speed[stage]
+        else:
+            raise ValueError(f"{species_data.name} cannot reach stage {stage}")
+        self.level = 1
+        self.experience = 0
+        self.stage = stage
+        self.scale = 1
+
+    def level_up(self) -> None:
+        """
+        Increases the level of the Pokemon by 1, and evolves the Pokemon if it is not at
+        the final stage of its evolution line.
+        """
+        self.level += 1
+        if self.stage < self.SPECIES_DATA.final_stage:
+            self._evolve()
+
+    def _evolve(self) -> None:
+        """
+        Evolves the Pokemon to the next stage in its evolution line, taking its name for that
+        stage from the species tables and increasing its current stats by 50%.
+        """
+        species_data = self.SPECIES_DATA
+        if self.stage >= species_data.final_stage:
+            print('This pokemon cannot evolve any further')
+            return
+
+        self.stage += 1
+        self.name = species_data.names[self.stage]
+        self._increase_stats()
+
+
+class SpeciesPool:
+    """
+    Keeps Pokemon instances that are no longer used, one free list per species, so new Pokemon
+    can reuse them instead of allocating new instances.
+
+    Borrowed Pokemon are reset to the state of a new Pokemon of their species, and only Pokemon
+    that nothing else refers to any more should be given back.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        """
+        Initializes an empty pool.
+
+        Args:
+            capacity (int): The most instances kept for each species; any more given back are dropped.
+
+        Attributes:
+            free (list): The free list (an ArrayStack) of each species id, or None before the first is given back.
+            hits (int): The number of Pokemon borrowed by reusing an instance.
+            misses (int): The number of Pokemon borrowed by making a new instance.
+        """
+        self.capacity = capacity
+        self.free = [None] * len(Pokemon.SPECIES)
+        self.hits = 0
+        self.misses = 0
+
+    def borrow(self, species: type, stage: int = 0) -> Species:
+        """
+        Returns a new Pokemon of the given species at the given stage, reusing a free instance if there is one.
+
+        Args:
+            species (type): The species class.
+            stage (int): The evolution stage of the Pokemon.
+
+        Returns:
+            Species: The Pokemon.
+        """
+        species_id = species.SPECIES_ID
+        free = self.free[species_id] if species_id < len(self.free) else None
+        if free is not None and not free.is_empty():
+            pokemon = free.pop()
+            pokemon.reset(stage)
+            self.hits += 1
+            return pokemon
+        self.misses += 1
+        pokemon = species()
+        if stage:
+            pokemon.reset(stage)
+        return pokemon
+
+    def give_back(self, pokemon) -> None:
+        """
+        Gives a Pokemon that is no longer used back to the pool. Pokemon that are not made from
+        the species table, and Pokemon beyond the capacity of their species, are dropped.
+
+        Args:
+            pokemon (Pokemon): The Pokemon.
+        """
+        if not isinstance(pokemon, Species):
+            return
+        species_id = pokemon.SPECIES_ID
+        if species_id >= len(self.free):
+            self.free.extend([None] * (species_id + 1 - len(self.free)))
+        free = self.free[species_id]
+        if free is None:
+            free = self.free[species_id] = ArrayStack(self.capacity)
+        if not free.is_full():
+            free.push(pokemon)
+
+    def hit_rate(self) -> float:
+        """
+        Returns the share of borrowed Pokemon that reused an instance, or 0.0 before any are borrowed.
+        """
+        borrowed = self.hits + self.misses
+        return self.hits / borrowed if borrowed else 0.0
+
+    def clear(self) -> None:
+        """
+        Drops every free instance and resets the hit and miss counts.
+
+        Complexity Analysis:
+            Best and worst case are O(m), where m is the number of species.
+        """
+        self.free = [None] * len(Pokemon.SPECIES)
+        self.hits = 0
+        self.misses = 0
+
+
+def species_code(species_id: int, stage: int) -> int:
+    """
+    Returns the code of a species at an evolution stage, one small integer that identifies both.
+
+    Args:
+        species_id (int): The species id.
+        stage (int): The evolution stage.
+
+    Returns:
+        int: The species code, species id * EVOLUTION_STAGES + stage.
+    """
+    return species_id * EVOLUTION_STAGES + stage
+
+
+def from_species_code(code: int) -> tuple:
+    """
+    Returns the species class and evolution stage of a species code.
+
+    Args:
+        code (int): The species code.
+
+    Returns:
+        tuple: The species class and the evolution stage.
+    """
+    species_id, stage = divmod(code, EVOLUTION_STAGES)
+    return Pokemon.SPECIES[species_id], stage
+
+
+def make_species(row: tuple) -> type:
+    """
+    Makes the Species subclass for one row of the species table. Making the class registers it as a species.
+
+    Args:
+        row (tuple): The row of the species table, as returned by read_species_table.
+
+    Returns:
+        type: The species class.
+    """
+    class_name, name, poketype, health, battle_power, defence, speed, evolution_line = row
+
+    def stage_stats(stat) -> tuple:
+        # Multiplied one stage at a time, exactly as evolving does
+        stats = [stat]
+        for _ in range(EVOLUTION_STAGES - 1):
+            stats.append(stats[-1] * EVOLUTION_MULTIPLIER)
+        return tuple(stats)
+
+    names = evolution_line[evolution_line.index(name):]
+    species_data = SpeciesData(class_name, name, PokeType[poketype], health, battle_power, defence, speed, evolution_line,
+                               names, len(names) - 1, stage_stats(health), stage_stats(battle_power),
+                               stage_stats(defence), stage_stats(speed))
+    return type(class_name, (Species,), {"__slots__": (), "SPECIES_DATA": species_data, "poketype": species_data.poketype,
+                                         "evolution_line": species_data.evolution_line,
+                                         "__module__": __name__, "__qualname__": class_name})
+
+
+for species_row in load_cached(SPECIES_CACHE, [SPECIES_CSV], read_species_table, SPECIES_CACHE_VERSION):
+    globals()[species_row[0]] = make_species(species_row)
+del species_row
+
+
+def get_all_pokemon_types() -> ArrayR:
+    """
+    Returns every species class, ordered by class name (the order random teams have always been picked from).
+
+    Complexity Analysis:
+        Best and worst case are O(n log n), where n is the number of species.
+    """
+    species = sorted(Pokemon.SPECIES, key=lambda species_class: species_class.__name__)
+    all_pokemon = ArrayR(len(species))
+    for i in range(len(species)):
+        all_pokemon[i] = species[i]
+    return all_pokemon
 
-class Moltres(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 90
-        self.level = 1
-        self.poketype = PokeType.FIRE
-        self.battle_power = 25
-        self.evolution_line = ["Moltres"]
-        self.name = "Moltres"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 90
 
-class Dratini(Pokemon):
-    def __init__(self):
-        super().__init__()
-        self.health = 41
-        self.level = 1
-        self.poketype = PokeType.DRAGON
-        self.battle_power = 12
-        self.evolution_line = ["Dratini", "Dragonair", "Dragonite"]
-        self.name = "Dratini"
-        self.experience = 0
-        self.defence = 10
-        self.speed = 86
-
-def get_all_pokemon_types():
-    all_pokemon = ArrayR(77)
-    i = 0
-    for name, cls in inspect.getmembers(inspect.getmodule(inspect.currentframe()), inspect.isclass):
-        if name not in ['ABC', 'PokeType', 'Pokemon', 'TypeEffectiveness', 'Enum', 'ArrayR']:
-            all_pokemon[i] = cls
-            i += 1
-    return all_pokemon
+def build_name_index() -> dict:
+    """
+    Maps every name a Pokemon can have, including the names it evolves into, to the species code
+    of the species and stage with that name.
+
+    Returns:
+        dict: The species code of each name.
+
+    Complexity Analysis:
+        Best and worst case are O(n), where n is the number of species, as evolution lines have at most EVOLUTION_STAGES names.
+    """
+    name_index = {}
+    # Species are added first at their own first stage, so a name that is both a species and
+    # another species' evolution maps to the species itself
+    for stage in range(EVOLUTION_STAGES):
+        for species in Pokemon.SPECIES:
+            names = species.SPECIES_DATA.names
+            if stage < len(names):
+                name_index.setdefault(names[stage], species_code(species.SPECIES_ID, stage))
+    return name_index
+
+
+def build_regen_health(species_list) -> ArrayR:
+    """
+    Works out the health every species code is given when its team is regenerated: the base
+    health of the last species in species_list whose evolution line contains its name.
+
+    Args:
+        species_list: The species classes, in the order they are searched.
+
+    Returns:
+        ArrayR: The health of each species code, or None for stages the species cannot reach.
+
+    Complexity Analysis:
+        Best and worst case are O(n^2 * k), where n is the number of species and k is the
+        maximum length of the evolution line, but it only has to be done once.
+    """
+    regen_health = ArrayR(len(Pokemon.SPECIES) * EVOLUTION_STAGES)
+    for species in Pokemon.SPECIES:
+        species_data = species.SPECIES_DATA
+        for stage in range(len(species_data.names)):
+            health = species_data.health
+            for i in range(len(species_list)):
+                if species_data.names[stage] in species_list[i].evolution_line:
+                    health = species_list[i].SPECIES_DATA.health
+            regen_health[species_code(species.SPECIES_ID, stage)] = health
+    return regen_health
 
 
 if __name__ == '__main__':
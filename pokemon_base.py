@@ -4,23 +4,86 @@ This module contains PokeType, TypeEffectiveness and an abstract version of the
 from abc import ABC
 from enum import Enum
 from data_structures.referential_array import ArrayR
+from data_cache import data_path, load_cached
+import array
 import csv
 import math
 
-with open("type_effectiveness.csv", "r") as csvfile:
-    csvreader = csv.reader(csvfile)
-    next(csvreader)
-    type_effectiveness = list(csvreader)
+TYPE_EFFECTIVENESS_CSV = data_path("type_effectiveness.csv")
+TYPE_EFFECTIVENESS_CACHE = data_path("type_effectiveness.bin")
+TYPE_EFFECTIVENESS_CACHE_VERSION = 2
 
-type_effectiveness = [[float(value) for value in row] for row in type_effectiveness]
+# In fixed-point mode, stats and health are stored as integers in units of 1 / FIXED_POINT_SCALE.
+# All base stats are multiples of 0.5, and a Pokemon evolves at most twice (multiplying by 1.5
+# each time), so every value the float version can reach is a multiple of 1/8.
+FIXED_POINT_BITS = 3
+FIXED_POINT_SCALE = 1 << FIXED_POINT_BITS
+FLOAT_PRECISION = 53  # Significant bits of a float
 
-num_rows = len(type_effectiveness)
-num_columns = len(type_effectiveness[0])
+EVOLUTION_STAGES = 3  # Longest evolution line
+EVOLUTION_MULTIPLIER = 1.5  # Each evolution increases the stats by 50%
 
-effectiveness_array = ArrayR(num_rows)
 
-for i in range(num_rows): #O(n) best/worst case, where n is the number of rows in the array
-    effectiveness_array[i] = type_effectiveness[i]
+def read_type_effectiveness() -> list:
+    """
+    Parses the type effectiveness chart from its CSV file.
+
+    Returns:
+        list: One list of float multipliers per attacking type, in PokeType order.
+
+    Complexity Analysis:
+        Best and worst case are O(n^2), where n is the number of types.
+    """
+    with open(TYPE_EFFECTIVENESS_CSV, "r") as csvfile:
+        csvreader = csv.reader(csvfile)
+        next(csvreader)
+        return [[float(value) for value in row] for row in csvreader]
+
+
+def fixed_ceil_multiply(value: int, multiplier: float) -> int:
+    """
+    Returns math.ceil(value / FIXED_POINT_SCALE * multiplier) for a fixed-point value, worked out
+    with integer arithmetic only.
+
+    The product is rounded to FLOAT_PRECISION significant bits (to nearest, ties to even) before
+    taking the ceiling, exactly as the float multiplication does, so the result is always the same
+    as the float version, even when the exact product is a whole number.
+
+    Args:
+        value (int): A non-negative fixed-point value.
+        multiplier (float): A non-negative multiplier.
+
+    Returns:
+        int: The ceiling of the product, in whole units.
+    """
+    numerator, denominator = multiplier.as_integer_ratio()
+    product = value * numerator
+    shift = denominator.bit_length() - 1 + FIXED_POINT_BITS  # The product is divided by 2 ** shift
+
+    extra_bits = product.bit_length() - FLOAT_PRECISION
+    if extra_bits > 0:
+        # Round the product to the precision of a float
+        quotient, remainder = divmod(product, 1 << extra_bits)
+        half = 1 << (extra_bits - 1)
+        if remainder > half or (remainder == half and quotient & 1):
+            quotient += 1
+        product = quotient << extra_bits
+
+    return -((-product) >> shift)
+
+
+def build_effectiveness_table() -> array.array:
+    """
+    Builds the flat type effectiveness table, where the multiplier of attack type a against
+    defend type d is stored at index a * TypeEffectiveness.TYPE_COUNT + d.
+
+    Returns:
+        array.array: The multipliers as one contiguous buffer of doubles.
+
+    Complexity Analysis:
+        Best and worst case are O(n^2), where n is the number of types.
+    """
+    return array.array("d", [value for row in read_type_effectiveness() for value in row])
 
 class PokeType(Enum):
     """
@@ -48,7 +111,29 @@ class TypeEffectiveness:
     Represents the type effectiveness of one Pokemon type against another.
     Unless stated otherwise, all methods in this class are O(1) best/worst case.
     """
-    EFFECT_TABLE = effectiveness_array
+    EFFECT_TABLE = None  # Loaded on first use, see load_table
+    TYPE_COUNT = 15  # Row length of EFFECT_TABLE
+
+    @classmethod
+    def load_table(cls) -> array.array:
+        """
+        Loads the type effectiveness chart into EFFECT_TABLE if it has not been loaded yet.
+
+        The chart is stored as one flat buffer of doubles indexed by attack * TYPE_COUNT + defend.
+        It is read from the precompiled binary copy when that copy matches the contents of
+        the CSV file, and the CSV is only parsed (and the copy rewritten) when it does not.
+
+        Returns:
+            array.array: The flat chart.
+
+        Complexity Analysis:
+            Best case is O(1) when the chart is already loaded.
+            Worst case is O(n^2), where n is the number of types, when the CSV has to be parsed.
+        """
+        if cls.EFFECT_TABLE is None:
+            cls.EFFECT_TABLE = load_cached(TYPE_EFFECTIVENESS_CACHE, [TYPE_EFFECTIVENESS_CSV],
+                                            build_effectiveness_table, TYPE_EFFECTIVENESS_CACHE_VERSION)
+        return cls.EFFECT_TABLE
 
     @classmethod
     def get_effectiveness(cls, attack_type: PokeType, defend_type: PokeType) -> float:
@@ -62,8 +147,53 @@ class TypeEffectiveness:
         Returns:
             float: The effectiveness of the attack, as a float value between 0 and 4.
         """
-        return cls.EFFECT_TABLE[attack_type.value][defend_type.value]
-        
+        table = cls.EFFECT_TABLE
+        if table is None:
+            table = cls.load_table()
+        return table[attack_type.value * cls.TYPE_COUNT + defend_type.value]
+
+    @classmethod
+    def get_effectiveness_many(cls, attack_types, defend_types):
+        """
+        Returns the effectiveness of each attack type against the defend type at the same position.
+
+        Types may be given as PokeTypes or as their integer values. When either argument is a
+        NumPy array of type values, all matchups are looked up with one vectorised gather and a
+        NumPy array is returned (a single type is broadcast against the whole array).
+
+        Parameters:
+            attack_types: The types of the attacking Pokemon.
+            defend_types: The types of the defending Pokemon.
+
+        Returns:
+            array.array: The effectiveness of each matchup, as doubles.
+
+        Raises:
+            ValueError: If the two sequences have different lengths.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the number of matchups.
+        """
+        table = cls.EFFECT_TABLE
+        if table is None:
+            table = cls.load_table()
+
+        if hasattr(attack_types, "dtype") or hasattr(defend_types, "dtype"):
+            # Only callers that already pass NumPy arrays need NumPy
+            import numpy
+            attack_types = numpy.asarray(attack_types)
+            defend_types = numpy.asarray(defend_types)
+            # A single type is broadcast, but two sequences must match up one to one
+            if attack_types.ndim and defend_types.ndim and len(attack_types) != len(defend_types):
+                raise ValueError("attack_types and defend_types must have the same length")
+            flat_table = numpy.frombuffer(table, dtype=numpy.float64)
+            return flat_table[attack_types * cls.TYPE_COUNT + defend_types]
+
+        if len(attack_types) != len(defend_types):
+            raise ValueError("attack_types and defend_types must have the same length")
+        type_count = cls.TYPE_COUNT
+        return array.array("d", [table[getattr(attack, "value", attack) * type_count + getattr(defend, "value", defend)]
+                                 for attack, defend in zip(attack_types, defend_types)])
 
     def __len__(self) -> int:
         """
@@ -72,24 +202,16 @@ class TypeEffectiveness:
         return len(PokeType)
     
 
-class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-attributes
+class BasePokemon(ABC): # pylint: disable=too-few-public-methods
     """
-    Represents a base Pokemon class with properties and methods common to all Pokemon.
+    Represents the properties and methods common to all Pokemon, whatever stores their state.
     Unless stated otherwise, all methods in this class are O(1) best/worst case.
+
+    BasePokemon has no per-instance storage of its own (its __slots__ are empty), so each subclass
+    decides where the state lives: Pokemon keeps it in __slots__ on the instance, and
+    pokemon_pool.PokemonHandle reads and writes it in the arrays of a PokemonPool.
     """
-    def __init__(self):
-        """
-        Initializes a new instance of the Pokemon class.
-        """
-        self.health = None
-        self.level = None
-        self.poketype = None
-        self.battle_power = None
-        self.evolution_line = None
-        self.name = None
-        self.experience = None
-        self.defence = None
-        self.speed = None
+    __slots__ = ()
 
     def get_name(self) -> str:
         """
@@ -102,7 +224,7 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
 
     def get_health(self) -> int:
         """
-        Returns the current health of the Pokemon.
+        Returns the current health of the Pokemon (in fixed-point units while in fixed-point mode).
 
         Returns:
             int: The current health of the Pokemon.
@@ -161,10 +283,19 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
         Returns the evolution line of the Pokemon.
 
         Returns:
-            list: The evolution of the Pokemon.
+            Sequence: The evolution of the Pokemon (shared by the whole species, so it must not be changed).
         """
         return self.evolution_line
 
+    def get_stage(self) -> int:
+        """
+        Returns the evolution stage of the Pokemon.
+
+        Returns:
+            int: The number of times the Pokemon has evolved.
+        """
+        return self.stage
+
     def get_battle_power(self) -> int:
         """
         Returns the battle power of the Pokemon.
@@ -188,6 +319,9 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
             damage (int): The base damage inflicted by the attacking Pokemon.
             multiplier (float): The type effectiveness multiplier for the attack.
         """
+        if self.scale != 1:
+            return self._fixed_attack(other_pokemon)
+
         if other_pokemon.get_defence() < self.get_battle_power() / 2:
         # If the defending Pokemon's defence is less than half of the attacking Pokemon's battle power
             damage = math.ceil(self.get_battle_power() - other_pokemon.get_defence())
@@ -208,6 +342,29 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
             
         return attack_damage
 
+    def _fixed_attack(self, other_pokemon) -> int:
+        """
+        Fixed-point version of attack, which gives the same damage using integer arithmetic only.
+
+        Args:
+            other_pokemon (Pokemon): The Pokemon that this Pokemon is attacking, also in fixed-point mode.
+
+        Returns:
+            int: The damage that this Pokemon inflicts on the other Pokemon, in fixed-point units.
+        """
+        battle_power = self.battle_power
+        defence = other_pokemon.defence
+        if 2 * defence < battle_power:
+            damage = -((defence - battle_power) >> FIXED_POINT_BITS)
+        elif defence < battle_power:
+            # ceil((5 * battle_power / 8 - defence / 4) / FIXED_POINT_SCALE)
+            damage = -((2 * defence - 5 * battle_power) >> (FIXED_POINT_BITS + 3))
+        else:
+            damage = -((-battle_power) >> (FIXED_POINT_BITS + 2))
+
+        # Type multipliers are all multiples of 0.5, so the scaled damage is a whole number
+        return int(damage * FIXED_POINT_SCALE * TypeEffectiveness.get_effectiveness(self.poketype, other_pokemon.poketype))
+
 
     def defend(self, damage: int) -> None:
         """
@@ -215,11 +372,17 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
         the Pokemon's defence into account.
 
         Args:
-            damage (int): The amount of damage to be inflicted on the Pokemon.
+            damage (int): The amount of damage to be inflicted on the Pokemon, in fixed-point units
+                while the Pokemon is in fixed-point mode (as attack returns it).
         
         Returns:
             None
         """
+        if self.scale != 1:
+            # In fixed-point mode the damage is already in the same units as the health and defence
+            self.health -= damage // 2 if damage < self.defence else damage
+            return
+
         # Calculate effective damage after considering the Pokemon's defense
         effective_damage = damage / 2 if damage < self.get_defence() else damage
         
@@ -264,20 +427,16 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
                 # Check if the Pokemon's current stage matches the first evolution in its line
                 self.name = self.evolution_line[1]
                 # Update the Pokemon's name to the next stage
-                self.battle_power *= 1.5
-                self.health = self.get_health() * 1.5
-                self.speed *= 1.5
-                self.defence *= 1.5
+                self.stage += 1
+                self._increase_stats()
                 # Increase each of the stats by 50%
 
             elif self.name == self.evolution_line[1]:
                 # Check if the Pokemon's current stage matches the second evolution in its line
                 self.name = self.evolution_line[2]
                 # Update the Pokemon's name to the next stage
-                self.battle_power *= 1.5
-                self.health = self.get_health() * 1.5
-                self.speed *= 1.5
-                self.defence *= 1.5
+                self.stage += 1
+                self._increase_stats()
                 # Increase each of the stats by 50%
 
             else:
@@ -287,6 +446,52 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
             print('This pokemon cannot evolve')
             # Inform that the Pokemon cannot evolve if it doesn't have an evolution line defined
 
+    def _increase_stats(self) -> None:
+        """
+        Increases the battle power, health, speed and defence of the Pokemon by 50%.
+        """
+        if self.scale != 1:
+            # Fixed-point stats are even before each evolution (see FIXED_POINT_SCALE), so this is exact
+            self.battle_power = self.battle_power * 3 // 2
+            self.health = self.health * 3 // 2
+            self.speed = self.speed * 3 // 2
+            self.defence = self.defence * 3 // 2
+        else:
+            self.battle_power *= EVOLUTION_MULTIPLIER
+            self.health = self.get_health() * EVOLUTION_MULTIPLIER
+            self.speed *= EVOLUTION_MULTIPLIER
+            self.defence *= EVOLUTION_MULTIPLIER
+
+    def to_fixed_point(self) -> None:
+        """
+        Switches the Pokemon to fixed-point mode, where its health, battle power, speed and defence
+        are stored as integers in units of 1 / FIXED_POINT_SCALE. Attacks, defending and evolving
+        then use integer arithmetic only and give exactly the same values as in float mode.
+
+        Raises:
+            ValueError: If a stat is not a multiple of 1 / FIXED_POINT_SCALE.
+        """
+        if self.scale != 1:
+            return
+        stats = (self.health, self.battle_power, self.speed, self.defence)
+        scaled = [stat * FIXED_POINT_SCALE for stat in stats]
+        if any(value != int(value) for value in scaled):
+            raise ValueError(f"The stats of {self.name} cannot be stored in fixed-point")
+        self.health, self.battle_power, self.speed, self.defence = [int(value) for value in scaled]
+        self.scale = FIXED_POINT_SCALE
+
+    def from_fixed_point(self) -> None:
+        """
+        Switches the Pokemon back from fixed-point mode to the usual float stats.
+        Whole values are returned as ints and the rest as floats.
+        """
+        if self.scale == 1:
+            return
+        self.health, self.battle_power, self.speed, self.defence = [
+            stat // FIXED_POINT_SCALE if stat % FIXED_POINT_SCALE == 0 else stat / FIXED_POINT_SCALE
+            for stat in (self.health, self.battle_power, self.speed, self.defence)]
+        self.scale = 1
+
     def is_alive(self) -> bool:
         """
         Checks if the Pokemon is still alive (i.e. has positive health).
@@ -301,6 +506,64 @@ class Pokemon(ABC): # pylint: disable=too-few-public-methods, too-many-instance-
         Return a string representation of the Pokemon instance in the format:
         <name> (Level <level>) with <health> health and <experience> experience
         """
-        return f"{self.name} (Level {self.level}) with {self.get_health()} health and {self.get_experience()} experience"
+        health = self.get_health() if self.scale == 1 else self.health / self.scale
+        return f"{self.name} (Level {self.level}) with {health} health and {self.get_experience()} experience"
+
+
+class Pokemon(BasePokemon): # pylint: disable=too-few-public-methods, too-many-instance-attributes
+    """
+    Represents a base Pokemon class, which stores the state of a Pokemon on the instance.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+
+    Every species (a subclass with a row of the species table in SPECIES_DATA, see
+    pokemon.Species) is added to the species registry when it is defined: SPECIES maps species
+    ids to species classes (in the order they are defined), and SPECIES_BY_NAME maps class names
+    to species classes. Other subclasses are not species, and are not registered.
+
+    Instances only hold the state that changes during battles in __slots__. Data that is the same
+    for every Pokemon of a species (its type and evolution line) is shared on the species class.
+    """
+    __slots__ = ("health", "level", "experience", "stage", "scale", "name", "battle_power", "defence", "speed")
+
+    SPECIES = []
+    SPECIES_BY_NAME = {}
+    SPECIES_ID = None  # Set on each species class when it is registered
+    poketype = None  # Shared by every Pokemon of a species
+    evolution_line = None  # Shared by every Pokemon of a species
+
+    def __init_subclass__(cls, register: bool = None, **kwargs):
+        """
+        Registers a new species class in SPECIES and SPECIES_BY_NAME and gives it a species id.
+        A class that replaces an earlier class of the same name keeps that class's id.
 
+        Args:
+            register (bool): Whether the class is a species. By default, only classes with
+                SPECIES_DATA are species.
+        """
+        super().__init_subclass__(**kwargs)
+        if register is None:
+            register = getattr(cls, "SPECIES_DATA", None) is not None
+        if not register:
+            return
+        previous = Pokemon.SPECIES_BY_NAME.get(cls.__name__)
+        if previous is None:
+            cls.SPECIES_ID = len(Pokemon.SPECIES)
+            Pokemon.SPECIES.append(cls)
+        else:
+            cls.SPECIES_ID = previous.SPECIES_ID
+            Pokemon.SPECIES[cls.SPECIES_ID] = cls
+        Pokemon.SPECIES_BY_NAME[cls.__name__] = cls
 
+    def __init__(self):
+        """
+        Initializes a new instance of the Pokemon class.
+        """
+        self.health = None
+        self.level = None
+        self.battle_power = None
+        self.name = None
+        self.experience = None
+        self.defence = None
+        self.speed = None
+        self.stage = 0  # Number of times the Pokemon has evolved
+        self.scale = 1  # FIXED_POINT_SCALE while the Pokemon is in fixed-point mode
@@ -0,0 +1,331 @@
+"""
+This module contains PokemonPool, which stores the state of many Pokemon as parallel typed
+arrays (one array per stat) instead of one Python object per Pokemon, and PokemonHandle,
+a lightweight Pokemon that only holds its pool and its index in the pool.
+
+A Pokemon in a pool costs a few dozen bytes spread over the arrays, so simulations can hold
+tens of millions of them, and a pass over one stat of every Pokemon reads one contiguous array.
+
+The stats are stored in fixed-point (see Pokemon.to_fixed_point), so health, battle power,
+defence and speed are whole numbers of 1 / FIXED_POINT_SCALE units and every attack, defence
+and evolution gives exactly the same values as the float stats of a Pokemon object.
+"""
+import array
+from pokemon_base import BasePokemon, Pokemon, PokeType, FIXED_POINT_SCALE
+
+
+class PokemonPool:
+    """
+    Stores the health, level, experience, stage, speed, defence, battle power, type and species
+    of many Pokemon as parallel typed arrays, where the Pokemon at index i is made up of the i-th
+    entry of every array.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case (amortised, for
+    the methods that add Pokemon).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty pool.
+
+        Attributes:
+            species (array): The species id of each Pokemon.
+            stage (array): The evolution stage of each Pokemon.
+            poketype (array): The PokeType value of each Pokemon.
+            level (array): The level of each Pokemon.
+            experience (array): The experience of each Pokemon.
+            health (array): The health of each Pokemon, in fixed-point units.
+            battle_power (array): The battle power of each Pokemon, in fixed-point units.
+            defence (array): The defence of each Pokemon, in fixed-point units.
+            speed (array): The speed of each Pokemon, in fixed-point units.
+        """
+        self.species = array.array("H")
+        self.stage = array.array("B")
+        self.poketype = array.array("B")
+        self.level = array.array("L")
+        self.experience = array.array("L")
+        self.health = array.array("q")
+        self.battle_power = array.array("q")
+        self.defence = array.array("q")
+        self.speed = array.array("q")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of Pokemon in the pool.
+        """
+        return len(self.species)
+
+    @staticmethod
+    def _to_fixed(value, name: str) -> int:
+        """
+        Converts a stat to fixed-point units.
+
+        Raises:
+            ValueError: If the stat is not a multiple of 1 / FIXED_POINT_SCALE.
+        """
+        scaled = value * FIXED_POINT_SCALE
+        if scaled != int(scaled):
+            raise ValueError(f"The stats of {name} cannot be stored in fixed-point")
+        return int(scaled)
+
+    def add(self, species, stage: int = 0) -> int:
+        """
+        Adds a new level 1 Pokemon of the given species to the pool, with the base stats of the
+        given evolution stage.
+
+        Args:
+            species (type): The species class of the Pokemon.
+            stage (int): The evolution stage of the Pokemon.
+
+        Returns:
+            int: The index of the new Pokemon in the pool.
+
+        Raises:
+            ValueError: If the species cannot reach the stage.
+        """
+        for stats in (self.species, self.stage, self.poketype, self.level, self.experience,
+                      self.health, self.battle_power, self.defence, self.speed):
+            stats.append(0)
+        index = len(self.species) - 1
+        try:
+            self.reset(index, species, stage)
+        except ValueError:
+            self.pop()
+            raise
+        return index
+
+    def reset(self, index: int, species, stage: int = 0) -> None:
+        """
+        Replaces the Pokemon at the given index with a new level 1 Pokemon of the given species,
+        with the base stats of the given evolution stage.
+
+        Args:
+            index (int): The index of the Pokemon in the pool.
+            species (type): The species class of the new Pokemon.
+            stage (int): The evolution stage of the new Pokemon.
+
+        Raises:
+            ValueError: If the species cannot reach the stage.
+        """
+        species_data = species.SPECIES_DATA
+        if not 0 <= stage <= species_data.final_stage:
+            raise ValueError(f"{species_data.name} cannot reach stage {stage}")
+        name = species_data.names[stage]
+        self.species[index] = species.SPECIES_ID
+        self.stage[index] = stage
+        self.poketype[index] = species_data.poketype.value
+        self.level[index] = 1
+        self.experience[index] = 0
+        self.health[index] = self._to_fixed(species_data.stage_health[stage], name)
+        self.battle_power[index] = self._to_fixed(species_data.stage_battle_power[stage], name)
+        self.defence[index] = self._to_fixed(species_data.stage_defence[stage], name)
+        self.speed[index] = self._to_fixed(species_data.stage_speed[stage], name)
+
+    def pop(self) -> None:
+        """
+        Removes the last Pokemon added to the pool.
+
+        Raises:
+            IndexError: If the pool is empty.
+        """
+        for stats in (self.species, self.stage, self.poketype, self.level, self.experience,
+                      self.health, self.battle_power, self.defence, self.speed):
+            stats.pop()
+
+    def add_many(self, species_ids) -> range:
+        """
+        Adds a new level 1 Pokemon at stage 0 for each species id.
+
+        Args:
+            species_ids: The species ids of the new Pokemon.
+
+        Returns:
+            range: The indices of the new Pokemon in the pool.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the number of species ids.
+        """
+        start = len(self.species)
+        for species_id in species_ids:
+            self.add(Pokemon.SPECIES[species_id])
+        return range(start, len(self.species))
+
+    def add_pokemon(self, pokemon: Pokemon) -> int:
+        """
+        Adds a copy of the current state of a Pokemon object to the pool.
+
+        Args:
+            pokemon (Pokemon): The Pokemon to copy.
+
+        Returns:
+            int: The index of the copy in the pool.
+
+        Raises:
+            ValueError: If a stat of the Pokemon cannot be stored in fixed-point.
+        """
+        scale = pokemon.scale
+        stats = [stat if scale != 1 else self._to_fixed(stat, pokemon.name)
+                 for stat in (pokemon.health, pokemon.battle_power, pokemon.defence, pokemon.speed)]
+        self.species.append(pokemon.SPECIES_ID)
+        self.stage.append(pokemon.stage)
+        self.poketype.append(pokemon.get_poketype().value)
+        self.level.append(pokemon.level)
+        self.experience.append(pokemon.experience)
+        self.health.append(stats[0])
+        self.battle_power.append(stats[1])
+        self.defence.append(stats[2])
+        self.speed.append(stats[3])
+        return len(self.species) - 1
+
+    def handle(self, index: int) -> "PokemonHandle":
+        """
+        Returns a handle for the Pokemon at the given index, which can be used anywhere a
+        Pokemon object can.
+
+        Args:
+            index (int): The index of the Pokemon in the pool.
+
+        Returns:
+            PokemonHandle: A handle for the Pokemon.
+
+        Raises:
+            IndexError: If there is no Pokemon at the index.
+        """
+        if not 0 <= index < len(self.species):
+            raise IndexError("Pokemon index out of range")
+        return PokemonHandle(self, index)
+
+    def species_data(self, index: int):
+        """
+        Returns the species data of the Pokemon at the given index.
+        """
+        return Pokemon.SPECIES[self.species[index]].SPECIES_DATA
+
+    def evolve(self, index: int) -> bool:
+        """
+        Evolves the Pokemon at the given index to the next stage of its evolution line, increasing
+        its battle power, health, speed and defence by 50% (as Pokemon._increase_stats does).
+
+        Returns:
+            bool: True if the Pokemon evolved, False if it is already at the final stage.
+        """
+        stage = self.stage[index]
+        if stage >= self.species_data(index).final_stage:
+            return False
+        self.stage[index] = stage + 1
+        # Stats are even before each evolution (see FIXED_POINT_SCALE), so this is exact
+        self.health[index] = self.health[index] * 3 // 2
+        self.battle_power[index] = self.battle_power[index] * 3 // 2
+        self.defence[index] = self.defence[index] * 3 // 2
+        self.speed[index] = self.speed[index] * 3 // 2
+        return True
+
+    def level_up(self, index: int) -> None:
+        """
+        Increases the level of the Pokemon at the given index by 1, and evolves it if it is not
+        at the final stage of its evolution line.
+        """
+        self.level[index] += 1
+        if self.stage[index] < self.species_data(index).final_stage:
+            self.evolve(index)
+
+    def alive_count(self) -> int:
+        """
+        Returns the number of Pokemon in the pool with positive health.
+
+        Complexity Analysis:
+            Best and worst case are O(n), where n is the number of Pokemon in the pool.
+        """
+        return sum(1 for health in self.health if health > 0)
+
+
+class PokemonHandle(BasePokemon):
+    """
+    A Pokemon whose state lives in a PokemonPool. The handle only holds the pool and an index
+    (BasePokemon has no per-instance storage, so these are its only slots), and every attribute
+    of a Pokemon is read from and written to the pool's arrays, so the inherited methods
+    (attack, defend and the getters) work unchanged.
+
+    Handles are always in fixed-point mode, so they print their health with a decimal point.
+    Two handles for the same index are the same Pokemon.
+    Unless stated otherwise, all methods in this class are O(1) best/worst case.
+    """
+    __slots__ = ("pool", "index")
+
+    scale = FIXED_POINT_SCALE  # Pool stats are always in fixed-point
+
+    def __init__(self, pool: PokemonPool, index: int) -> None:
+        """
+        Initializes a handle for the Pokemon at the given index of the pool.
+
+        Args:
+            pool (PokemonPool): The pool the Pokemon is stored in.
+            index (int): The index of the Pokemon in the pool.
+        """
+        self.pool = pool
+        self.index = index
+
+    def _stat_property(name: str):
+        """
+        Returns a property that reads and writes the given array of the pool.
+        """
+        def getter(self):
+            return getattr(self.pool, name)[self.index]
+
+        def setter(self, value):
+            getattr(self.pool, name)[self.index] = value
+
+        return property(getter, setter)
+
+    health = _stat_property("health")
+    level = _stat_property("level")
+    experience = _stat_property("experience")
+    stage = _stat_property("stage")
+    battle_power = _stat_property("battle_power")
+    defence = _stat_property("defence")
+    speed = _stat_property("speed")
+    del _stat_property
+
+    @property
+    def SPECIES_ID(self) -> int:
+        return self.pool.species[self.index]
+
+    @property
+    def poketype(self) -> PokeType:
+        return PokeType(self.pool.poketype[self.index])
+
+    @property
+    def name(self) -> str:
+        return self.pool.species_data(self.index).names[self.pool.stage[self.index]]
+
+    @property
+    def evolution_line(self) -> tuple:
+        return self.pool.species_data(self.index).evolution_line
+
+    def level_up(self) -> None:
+        """
+        Increases the level of the Pokemon by 1, and evolves it if it is not at the final stage.
+        """
+        self.pool.level_up(self.index)
+
+    def _evolve(self) -> None:
+        """
+        Evolves the Pokemon to the next stage in its evolution line.
+        """
+        if not self.pool.evolve(self.index):
+            print('This pokemon cannot evolve any further')
+
+    def to_fixed_point(self) -> None:
+        """
+        Does nothing, as pool stats are always in fixed-point.
+        """
+
+    def from_fixed_point(self) -> None:
+        """
+        Does nothing, as pool stats are always in fixed-point.
+        """
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PokemonHandle) and self.pool is other.pool and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.pool), self.index))
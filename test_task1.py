@@ -2,7 +2,11 @@ import unittest
 from ed_utils.decorators import number, visibility
 from unittest.mock import patch
 from pokemon_base import TypeEffectiveness, PokeType
+import pokemon_base
+import data_cache
 import io
+import os
+import tempfile
 
 class TestTypeEffectiveness(unittest.TestCase):
     @number("1.1")
@@ -18,6 +22,50 @@ class TestTypeEffectiveness(unittest.TestCase):
     def test_len(self):
         self.assertEqual(len(TypeEffectiveness()), 15)
 
+    @number("1.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_binary_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "type_effectiveness.bin")
+            csv_paths = [pokemon_base.TYPE_EFFECTIVENESS_CSV]
+            # Loading from another working directory builds the binary copy
+            current_dir = os.getcwd()
+            os.chdir(temp_dir)
+            try:
+                rows = data_cache.load_cached(cache_path, csv_paths, pokemon_base.read_type_effectiveness)
+            finally:
+                os.chdir(current_dir)
+            self.assertTrue(os.path.exists(cache_path))
+            self.assertEqual(rows[PokeType.WATER.value][PokeType.GRASS.value], 0.5)
+            # An up to date copy is used without parsing the CSV again
+            cached = data_cache.load_cached(cache_path, csv_paths, lambda: self.fail("CSV parsed again"))
+            self.assertEqual(cached, rows)
+            # A copy built from different contents is rebuilt
+            with open(cache_path, "wb") as cache_file:
+                cache_file.write(b"stale")
+            self.assertEqual(data_cache.load_cached(cache_path, csv_paths, lambda: "rebuilt"), "rebuilt")
+
+    @number("1.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_get_effectiveness_many(self):
+        attack_types = [attack for attack in PokeType for _ in PokeType]
+        defend_types = [defend for _ in PokeType for defend in PokeType]
+        expected = [TypeEffectiveness.get_effectiveness(attack, defend) for attack, defend in zip(attack_types, defend_types)]
+        self.assertEqual(list(TypeEffectiveness.get_effectiveness_many(attack_types, defend_types)), expected)
+        # Integer type values work the same way as PokeTypes
+        self.assertEqual(list(TypeEffectiveness.get_effectiveness_many([2, 14], [1, 0])), [2.0, 0.5])
+        with self.assertRaises(ValueError):
+            TypeEffectiveness.get_effectiveness_many([PokeType.FIRE], [])
+        try:
+            import numpy
+        except ImportError:
+            return
+        # NumPy arrays are checked the same way, and a single type is broadcast against them
+        with self.assertRaises(ValueError):
+            TypeEffectiveness.get_effectiveness_many(numpy.array([2, 14]), numpy.array([1]))
+        self.assertEqual(list(TypeEffectiveness.get_effectiveness_many(numpy.array([2, 14]), numpy.array([1, 0]))), [2.0, 0.5])
+        self.assertEqual(list(TypeEffectiveness.get_effectiveness_many(numpy.array([2, 2]), 1)), [2.0, 2.0])
+
 if __name__ == '__main__':
     unittest.main()
     
\ No newline at end of file
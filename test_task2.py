@@ -3,6 +3,8 @@ from ed_utils.decorators import number, visibility
 from unittest.mock import patch
 from io import StringIO
 import random
+import array
+import hashlib
 from poke_team import *
 from pokemon import *
 from battle_mode import *
@@ -34,6 +36,384 @@ class TestPokeTeam(unittest.TestCase):
         poketeam.choose_randomly()
         self.assertIsNotNone(poketeam[0], " Poketeam's __getitem__ not working correctly")
 
+    @number("2.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_type_vectors(self):
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        members = [poketeam[i] for i in range(len(poketeam))]
+        for poketype in PokeType:
+            self.assertEqual(poketeam.offence_against(poketype),
+                             sum(TypeEffectiveness.get_effectiveness(pokemon.get_poketype(), poketype) for pokemon in members))
+            self.assertEqual(poketeam.defence_against(poketype),
+                             sum(TypeEffectiveness.get_effectiveness(poketype, pokemon.get_poketype()) for pokemon in members))
+        poketeam.remove_member(members[0])
+        poketeam.add_member(Charmander())
+        expected = sum(TypeEffectiveness.get_effectiveness(pokemon.get_poketype(), PokeType.GRASS) for pokemon in members[1:]) + 2.0
+        self.assertEqual(poketeam.offence_against(PokeType.GRASS), expected)
+
+        # After a battle the vectors only describe the members that did not faint
+        from battle import Battle
+        for battle_mode in BattleMode:
+            random.seed(20)
+            trainer1, trainer2 = Trainer('Gary'), Trainer('Ash')
+            battle = Battle(trainer1, trainer2, battle_mode)
+            battle._create_teams()
+            teams = [trainer.get_team() for trainer in (trainer1, trainer2)]
+            members = [[team[i] for i in range(len(team))] for team in teams]
+            with patch('sys.stdout', new=StringIO()):
+                battle.commence_battle()
+            for team, team_members in zip(teams, members):
+                alive = [pokemon for pokemon in team_members if pokemon.get_health() > 0]
+                for poketype in PokeType:
+                    self.assertAlmostEqual(team.offence_against(poketype),
+                                           sum(TypeEffectiveness.get_effectiveness(pokemon.get_poketype(), poketype) for pokemon in alive))
+                    self.assertAlmostEqual(team.defence_against(poketype),
+                                           sum(TypeEffectiveness.get_effectiveness(poketype, pokemon.get_poketype()) for pokemon in alive))
+
+    @number("2.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_species_registry(self):
+        self.assertEqual(len(PokeTeam.POKE_LIST), 77)
+        self.assertIs(Pokemon.SPECIES_BY_NAME["MrMime"], MrMime)
+        for species_id, species in enumerate(Pokemon.SPECIES):
+            self.assertEqual(species.SPECIES_ID, species_id)
+        names = [PokeTeam.POKE_LIST[i].__name__ for i in range(len(PokeTeam.POKE_LIST))]
+        self.assertEqual(names, sorted(names))
+
+        # Only species are registered, other subclasses of Pokemon are left out
+        species_count = len(Pokemon.SPECIES)
+
+        class Wild(Pokemon):
+            __slots__ = ()
+
+        self.assertIsNone(Wild.SPECIES_ID)
+        self.assertNotIn("Wild", Pokemon.SPECIES_BY_NAME)
+        self.assertEqual(len(Pokemon.SPECIES), species_count)
+        self.assertNotIn(Wild, list(get_all_pokemon_types()))
+
+    @number("2.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_species_table(self):
+        self.assertEqual(len(read_species_table()), len(Pokemon.SPECIES))
+        bulbasaur = Bulbasaur()
+        self.assertEqual(str(bulbasaur), "Bulbasaur (Level 1) with 45 health and 0 experience")
+        self.assertEqual((bulbasaur.get_poketype(), bulbasaur.get_battle_power(), bulbasaur.get_defence(), bulbasaur.get_speed()),
+                         (PokeType.GRASS, 14, 20, 4.5))
+        self.assertEqual(list(bulbasaur.get_evolution()), ["Bulbasaur", "Ivysaur", "Venusaur"])
+        self.assertIs(bulbasaur.get_evolution(), Bulbasaur().get_evolution())
+        self.assertFalse(hasattr(bulbasaur, "__dict__"))
+        self.assertIsInstance(MrMime(), Species)
+
+        # Type and evolution line are shared on the class, so instances can be made without them
+        self.assertIsNone(Pokemon().get_poketype())
+
+        class Missingno(Pokemon):
+            __slots__ = ()
+            poketype = PokeType.NORMAL
+
+            def __init__(self):
+                super().__init__()
+                self.name = "Missingno"
+                self.health = self.battle_power = self.defence = self.speed = 10
+                self.level = 1
+                self.experience = 0
+
+        missingno = Missingno()
+        self.assertEqual((missingno.get_name(), missingno.get_poketype(), missingno.get_evolution()),
+                         ("Missingno", PokeType.NORMAL, None))
+        self.assertFalse(hasattr(missingno, "__dict__"))
+
+    @number("2.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_stage_tables(self):
+        bulbasaur = Bulbasaur()
+        bulbasaur.level_up()
+        self.assertEqual((bulbasaur.get_name(), bulbasaur.get_stage()), ("Ivysaur", 1))
+        self.assertEqual((bulbasaur.get_battle_power(), bulbasaur.get_defence(), bulbasaur.get_speed()),
+                         (14 * 1.5, 20 * 1.5, 4.5 * 1.5))
+        bulbasaur.level_up()
+        bulbasaur.level_up()
+        self.assertEqual((bulbasaur.get_name(), bulbasaur.get_stage(), bulbasaur.get_level()), ("Venusaur", 2, 4))
+        self.assertEqual(bulbasaur.get_health(), 45 * 1.5 * 1.5)
+
+        # Snorlax starts part way through its evolution line, so it cannot evolve
+        snorlax = Snorlax()
+        snorlax.level_up()
+        self.assertEqual((snorlax.get_name(), snorlax.get_stage()), ("Snorlax", 0))
+
+        # Evolving increases the current stats, so the damage matrix does not look up Pokemon
+        # whose stats were changed and no longer match the stage tables
+        from damage_matrix import DamageMatrix
+        bulbasaur = Bulbasaur()
+        bulbasaur.battle_power = 100
+        bulbasaur.level_up()
+        self.assertEqual(bulbasaur.get_battle_power(), 150)
+        self.assertEqual(DamageMatrix.get_damage(bulbasaur, snorlax), bulbasaur.attack(snorlax))
+        ivysaur = Bulbasaur()
+        ivysaur.level_up()
+        self.assertNotEqual(DamageMatrix.get_damage(bulbasaur, snorlax), DamageMatrix.get_damage(ivysaur, snorlax))
+        bulbasaur.to_fixed_point()
+        snorlax.to_fixed_point()
+        self.assertEqual(DamageMatrix.get_fixed_damage(bulbasaur, snorlax), bulbasaur.attack(snorlax))
+
+    @number("2.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_regenerate_from_roster(self):
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        self.assertEqual(len(poketeam.roster), len(poketeam))
+        self.assertEqual(poketeam.roster.itemsize, 1)
+        names = [poketeam[i].get_name() for i in range(len(poketeam))]
+        for i in range(len(poketeam)):
+            poketeam[i].level_up()
+        poketeam.assemble_team(BattleMode.ROTATE)
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        self.assertEqual([poketeam[i].get_name() for i in range(len(poketeam))], names)
+        self.assertEqual([poketeam[i].get_level() for i in range(len(poketeam))], [1] * len(names))
+
+        # Rosters can start part way through an evolution line
+        poketeam.roster = array.array('B', [species_code(Bulbasaur.SPECIES_ID, 1), species_code(Snorlax.SPECIES_ID, 0)])
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        self.assertEqual([(poketeam[i].get_name(), poketeam[i].get_stage()) for i in range(2)],
+                         [("Ivysaur", 1), ("Snorlax", 0)])
+        self.assertEqual(from_species_code(poketeam.roster[0]), (Bulbasaur, 1))
+
+    @number("2.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_instance_pool(self):
+        pool = SpeciesPool(capacity=1)
+        bulbasaur = pool.borrow(Bulbasaur)
+        bulbasaur.level_up()
+        bulbasaur.defend(10)
+        pool.give_back(bulbasaur)
+        pool.give_back(Bulbasaur())  # Over capacity, so dropped
+        reused = pool.borrow(Bulbasaur)
+        self.assertIs(reused, bulbasaur)
+        self.assertEqual(str(reused), str(Bulbasaur()))
+        self.assertEqual(reused.get_stage(), 0)
+        self.assertIsNot(pool.borrow(Bulbasaur), bulbasaur)
+        self.assertEqual((pool.hits, pool.misses), (1, 2))
+        self.assertAlmostEqual(pool.hit_rate(), 1 / 3)
+
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        members = [poketeam[i] for i in range(len(poketeam))]
+        poketeam.assemble_team(BattleMode.OPTIMISE)
+        poketeam.assign_team('health')
+        PokeTeam.INSTANCE_POOL.clear()
+        poketeam._give_back_members()
+        hits = PokeTeam.INSTANCE_POOL.hits
+        self.assertIn(PokeTeam.INSTANCE_POOL.borrow(type(members[0])), members)
+        self.assertEqual(PokeTeam.INSTANCE_POOL.hits, hits + 1)
+
+        # Regenerating a team leaves the old members alone, unless they are recycled
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        poketeam.assemble_team(BattleMode.ROTATE)
+        held = poketeam[0]
+        held.level_up()
+        held.defend(5)
+        state = (held.get_name(), held.get_level(), held.get_health(), held.get_stage())
+        PokeTeam.INSTANCE_POOL.clear()
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        self.assertEqual((held.get_name(), held.get_level(), held.get_health(), held.get_stage()), state)
+        self.assertNotIn(held, list(poketeam))
+        old_members = list(poketeam)
+        poketeam.regenerate_team(BattleMode.ROTATE, recycle=True)
+        self.assertCountEqual(map(id, poketeam), map(id, old_members))
+
+    @number("2.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_name_index(self):
+        self.assertEqual(PokeTeam.NAME_INDEX["Ivysaur"], species_code(Bulbasaur.SPECIES_ID, 1))
+        self.assertEqual(PokeTeam.NAME_INDEX["Mr. Mime"], species_code(MrMime.SPECIES_ID, 0))
+        self.assertNotIn("Munchlax", PokeTeam.NAME_INDEX)
+        self.assertEqual(PokeTeam.REGEN_HEALTH[species_code(Bulbasaur.SPECIES_ID, 2)], 45)
+
+        poketeam = PokeTeam()
+        choices = ["Bulbasaur", "Ivysaur", "Mr. Mime", "MrMime", "Pikachu", "Raichu"]
+        with patch('builtins.input', side_effect=choices):
+            poketeam.choose_manually()
+        self.assertEqual([poketeam[i].get_name() for i in range(len(poketeam))],
+                         ["Bulbasaur", "Ivysaur", "Mr. Mime", "Mr. Mime", "Pikachu", "Raichu"])
+        poketeam[1].defend(30)
+        poketeam.regenerate_team(BattleMode.ROTATE)
+        self.assertEqual((poketeam[1].get_name(), poketeam[1].get_health()), ("Ivysaur", 45))
+
+    @number("2.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_indexing_and_iteration(self):
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        chosen = list(poketeam)
+        self.assertEqual(chosen, [poketeam[i] for i in range(len(poketeam))])
+        for battle_mode, expected in ((BattleMode.SET, chosen[::-1]), (BattleMode.ROTATE, chosen)):
+            poketeam.team = ArrayR(len(chosen))
+            for i, pokemon in enumerate(chosen):
+                poketeam.team[i] = pokemon
+            poketeam.assemble_team(battle_mode)
+            container = poketeam.team
+            self.assertEqual(list(poketeam), expected)
+            self.assertEqual([poketeam[i] for i in range(len(poketeam))], expected)
+            self.assertIs(poketeam[-1], expected[-1])
+            self.assertIs(poketeam.team, container)
+            self.assertEqual(len(poketeam), len(chosen))
+            self.assertRaises(IndexError, poketeam.__getitem__, len(chosen))
+
+    @number("2.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_render(self):
+        poketeam = PokeTeam()
+        poketeam.choose_randomly()
+        poketeam.assemble_team(BattleMode.SET)
+        stream = StringIO()
+        poketeam.render(stream)
+        self.assertEqual(stream.getvalue(), str(poketeam))
+        self.assertEqual(str(poketeam), "".join(str(poketeam[i]) + "\n" for i in range(len(poketeam))))
+
+        # Rendering only reads the team, so the stack stays full throughout
+        size = len(poketeam)
+        class CheckingStream:
+            def write(inner_self, text):
+                self.assertEqual(len(poketeam.team), size)
+        top = poketeam.team.peek()
+        poketeam.render(CheckingStream())
+        self.assertIs(poketeam.team.peek(), top)
+
+    @number("2.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_large_teams(self):
+        poketeam = PokeTeam(team_size=200)
+        poketeam.choose_randomly()
+        self.assertEqual((len(poketeam), len(poketeam.roster)), (200, 200))
+        self.assertEqual(PokeTeam().get_team_size(), PokeTeam.TEAM_LIMIT)
+        poketeam.assemble_team(BattleMode.OPTIMISE)
+        poketeam.assign_team('speed')
+        speeds = [pokemon.get_speed() for pokemon in poketeam]
+        self.assertEqual(speeds, sorted(speeds))
+
+        # The offset list keeps items in the same order as ArraySortedList
+        rng = random.Random(5)
+        plain, offset = ArraySortedList(1), OffsetArraySortedList(1)
+        for _ in range(500):
+            if rng.random() < 0.6 or plain.is_empty():
+                key = rng.randint(0, 9)
+                plain.add(ListItem(key, key))
+                offset.add(ListItem(key, key))
+            else:
+                index = rng.choice([0, rng.randrange(len(plain))])
+                self.assertEqual(plain.delete_at_index(index).key, offset.delete_at_index(index).key)
+            self.assertEqual([plain[i].key for i in range(len(plain))], [offset[i].key for i in range(len(offset))])
+
+    @number("2.18")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_generate_many(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        records = PokeTeam.generate_many(1000, 4, rng=7)
+        self.assertEqual((len(records), records.codes.shape, records.codes.itemsize), (1000, (1000, 4), 1))
+        self.assertTrue((records.codes == PokeTeam.generate_many(1000, 4, rng=7).codes).all())
+        self.assertFalse((records.codes == PokeTeam.generate_many(1000, 4, rng=8).codes).all())
+
+        poketeam = records.team(999)
+        self.assertEqual(bytes(poketeam.roster), records[999])
+        self.assertEqual([species_code(pokemon.SPECIES_ID, 0) for pokemon in poketeam], list(records[999]))
+        trainer = records.trainer(0, 'Ash')
+        types = {pokemon.get_poketype() for pokemon in trainer.get_team()}
+        self.assertEqual(trainer.get_pokedex_completion(), round(len(types) / 15, 2))
+
+    @number("2.19")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_special_in_place(self):
+        for size in (2, 3, 4, 9):
+            poketeam = PokeTeam(team_size=size)
+            poketeam.choose_randomly()
+            members = list(poketeam.team)
+
+            poketeam.assemble_team(BattleMode.SET)
+            stack = poketeam.team
+            top = min(3, size)
+            expected = list(poketeam)
+            expected[:top] = expected[:top][::-1]
+            poketeam.special(BattleMode.SET)
+            self.assertIs(poketeam.team, stack)
+            self.assertEqual(list(poketeam), expected)
+
+            poketeam.assemble_team(BattleMode.ROTATE)
+            queue = poketeam.team
+            expected = list(poketeam)
+            expected[3:] = expected[3:][::-1]
+            poketeam.special(BattleMode.ROTATE)
+            self.assertIs(poketeam.team, queue)
+            self.assertEqual(list(poketeam), expected)
+            self.assertEqual([queue.serve() for _ in range(size)], expected)
+
+            # OPTIMISE still rebuilds the sorted list with negated keys, leaving the old list alone
+            poketeam.assemble_team(BattleMode.OPTIMISE)
+            poketeam.assign_team('health')
+            sorted_list = poketeam.team
+            ascending = list(poketeam)
+            poketeam.special(BattleMode.OPTIMISE)
+            self.assertIsNot(poketeam.team, sorted_list)
+            self.assertEqual([sorted_list[i].value for i in range(len(ascending))], ascending)
+            healths = [pokemon.get_health() for pokemon in poketeam]
+            self.assertEqual(healths, sorted(healths, reverse=True))
+            self.assertEqual([poketeam.team[i].key for i in range(len(healths))], [-health for health in healths])
+
+        # Seeded OPTIMISE battles after special print exactly what they printed before special
+        # was changed: the winners of each battle and a digest of everything printed
+        from battle import Battle
+        digest = hashlib.md5()
+        winners = ""
+        for criterion in ('health', 'level', 'defence'):
+            for seed in range(30):
+                random.seed(seed)
+                trainer1, trainer2 = Trainer('Gary'), Trainer('Ash')
+                battle = Battle(trainer1, trainer2, BattleMode.OPTIMISE, criterion=criterion)
+                with patch('sys.stdout', new_callable=StringIO) as stdout:
+                    battle._create_teams()
+                    trainer1.get_team().special(BattleMode.OPTIMISE)
+                    winner = battle.commence_battle()
+                digest.update(stdout.getvalue().encode())
+                winners += winner.get_name()[0] if winner is not None else "-"
+        self.assertEqual(winners, "AGAGGAAGAAAAAAGAGAAGGGGGAAAGAGAAAGGAAAAGAAAGGAGAAGAAGGGAAGAGAGGGGAAAGGAAAGAAGAAGGGGAGAAGAA")
+        self.assertEqual(digest.hexdigest(), "10e1e25176c0b48a73585eb4060442e0")
+
+
+    @number("2.20")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_assign_team_in_bulk(self):
+        poketeam = PokeTeam(team_size=40)
+        poketeam.choose_randomly()
+        poketeam.assemble_team(BattleMode.OPTIMISE)
+        items = [ListItem(poketeam.team[i].value, poketeam.team[i].value.get_level()) for i in range(len(poketeam))]
+        one_by_one = OffsetArraySortedList(1)
+        for item in items:
+            one_by_one.add(item)
+        poketeam.assign_team('level')
+        # All the keys are the same, so only the order of the ties is tested
+        self.assertEqual(list(poketeam), [one_by_one[i].value for i in range(len(one_by_one))])
+
+        # 'attack' sorts by battle power
+        poketeam.assign_team('attack')
+        powers = [pokemon.get_battle_power() for pokemon in poketeam]
+        self.assertEqual(powers, sorted(powers))
+        self.assertIsNone(PokeTeam.criterion_key('luck'))
+
+        rng = random.Random(3)
+        items = [ListItem(i, rng.randint(0, 5)) for i in range(300)]
+        one_by_one = ArraySortedList(1)
+        for item in items:
+            one_by_one.add(item)
+        bulk = OffsetArraySortedList.from_items(items)
+        self.assertEqual([bulk[i].value for i in range(len(bulk))], [one_by_one[i].value for i in range(len(one_by_one))])
+
+
 class TestTrainer(unittest.TestCase):
     @number("2.4")
     @visibility(visibility.VISIBILITY_SHOW)
@@ -77,6 +457,37 @@ class TestTrainer(unittest.TestCase):
 
         self.assertEqual(str(trainer), expected_str, "Trainer Str method is not set up correctly")
 
+    @number("2.21")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_pokedex_bitmask(self):
+        ash, gary = Trainer('Ash'), Trainer('Gary')
+        ash.register_pokemon(Charmander())
+        ash.register_pokemon(Growlithe())
+        ash.register_pokemon(Squirtle())
+        gary.register_pokemon(Squirtle())
+        gary.register_pokemon(Geodude())
+
+        self.assertEqual(ash.pokedex.elems, (1 << PokeType.FIRE.value) | (1 << PokeType.WATER.value))
+        self.assertEqual(ash.get_pokedex_completion(), round(2 / 15, 2))
+        self.assertEqual(len(Trainer.pokedex_union([ash, gary])), 3)
+        self.assertEqual(Trainer.pokedex_intersection([ash, gary]).elems, 1 << PokeType.WATER.value)
+        self.assertEqual(len(Trainer.pokedex_intersection([])), len(PokeType))
+
+    @number("2.22")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_cached_completion(self):
+        ash, gary = Trainer('Ash'), Trainer('Gary')
+        self.assertRaises(ZeroDivisionError, ash.multiplier_against, gary)
+        self.assertTrue(ash.register_pokemon(Charmander()))
+        self.assertFalse(ash.register_pokemon(Growlithe()))
+        self.assertTrue(ash.register_pokemon(Squirtle()))
+        gary.register_pokemon(Pikachu())
+        self.assertEqual(ash.pokedex_count, 2)
+        self.assertEqual(ash.multiplier_against(gary), round(2 / 15, 2) / round(1 / 15, 2))
+        self.assertEqual(gary.multiplier_against(ash), round(1 / 15, 2) / round(2 / 15, 2))
+        for count in range(len(PokeType) + 1):
+            self.assertEqual(Trainer.COMPLETIONS[count], round(count / 15, 2))
+
 
 if __name__ == '__main__':
     unittest.main()
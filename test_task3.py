@@ -135,6 +135,297 @@ class TestBattle(unittest.TestCase):
         # Check loser (Ash's team) - We got Ash!
         self.assertEqual(len(self.trainer2.get_team()), 0, f"{self.trainer2.get_name()} should have no Pokemon left in their team")
 
+    @number("3.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_fixed_ceil_multiply(self):
+        rng = random.Random(TestBattle.DEFAULT_SEED)
+        for _ in range(10000):
+            value = rng.randrange(2000)
+            multiplier = round(rng.randrange(1, 16) / 15, 2) / round(rng.randrange(1, 16) / 15, 2)
+            self.assertEqual(fixed_ceil_multiply(value, multiplier), math.ceil(value / FIXED_POINT_SCALE * multiplier))
+
+    @number("3.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_fixed_point_battles(self):
+        for attacker_species, defender_species in ((Charmander, Bulbasaur), (Bulbasaur, Charmander), (Snorlax, Pikachu)):
+            health = []
+            for fixed_point in (False, True):
+                attacker, defender = attacker_species(), defender_species()
+                if fixed_point:
+                    attacker.to_fixed_point()
+                    defender.to_fixed_point()
+                # attack gives the damage in the units defend takes, in both modes
+                defender.defend(attacker.attack(defender))
+                health.append(defender.get_health() / defender.scale)
+            self.assertEqual(health[0], health[1], f"{attacker_species.__name__} attacking {defender_species.__name__}")
+
+        for battle_mode in BattleMode:
+            results = []
+            for fixed_point in (False, True):
+                random.seed(TestBattle.DEFAULT_SEED)
+                trainer1, trainer2 = Trainer('Gary'), Trainer('Ash')
+                battle = Battle(trainer1, trainer2, battle_mode, fixed_point=fixed_point)
+                battle._create_teams()
+                winner = battle.commence_battle()
+                teams = [[(team[i].get_name(), team[i].get_level(), team[i].get_health()) for i in range(len(team))]
+                         for team in (trainer1.get_team(), trainer2.get_team())]
+                results.append((winner.get_name(), teams))
+            self.assertEqual(results[0], results[1], f"Fixed-point {battle_mode} battle has a different outcome")
+
+
+class TestDamageKernel(unittest.TestCase):
+    def setUp(self) -> None:
+        # Every species at every stage it can reach
+        self.roster = []
+        for species in get_all_pokemon_types():
+            pokemon = species()
+            evolutions = len(pokemon.get_evolution()) - 1 - pokemon.get_evolution().index(pokemon.get_name())
+            for stage in range(evolutions + 1):
+                pokemon = species()
+                for _ in range(stage):
+                    pokemon._evolve()
+                self.roster.append(pokemon)
+
+    @number("3.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_kernel_matches_scalar_rules(self):
+        try:
+            import damage_kernel
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        attackers = [attacker for attacker in self.roster for _ in self.roster]
+        defenders = [defender for _ in self.roster for defender in self.roster]
+        attack_power, _, attack_types = damage_kernel.roster_stats(attackers)
+        _, defence, defend_types = damage_kernel.roster_stats(defenders)
+
+        expected = [attacker.attack(defender) for attacker, defender in zip(attackers, defenders)]
+        self.assertEqual(damage_kernel.attack_many(attack_power, attack_types, defence, defend_types).tolist(), expected)
+
+        for multiplier in (1.0, 0.67 / 0.6, 0.2 / 0.53):
+            expected = []
+            for attacker, defender in zip(attackers, defenders):
+                damage = math.ceil(attacker.attack(defender) * multiplier)
+                expected.append(damage / 2 if damage < defender.get_defence() else damage)
+            actual = damage_kernel.resolve_attacks(attack_power, attack_types, defence, defend_types, multiplier)
+            self.assertEqual(actual.tolist(), expected)
+
+    @number("3.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_damage_matrix(self):
+        from damage_matrix import DamageMatrix
+        self.assertEqual(len(DamageMatrix.load_table()), 231 * 231)
+        for attacker in self.roster:
+            for defender in self.roster:
+                self.assertEqual(DamageMatrix.get_damage(attacker, defender), attacker.attack(defender))
+
+
+class TestPokemonPool(unittest.TestCase):
+    @number("3.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_pool_battles(self):
+        from pokemon_pool import PokemonPool, PokemonHandle
+        # Handles only hold their pool and index, with no storage inherited from their base classes
+        pool = PokemonPool()
+        handle = pool.handle(pool.add(Bulbasaur))
+        self.assertFalse(hasattr(handle, "__dict__"))
+        self.assertEqual([cls for cls in type(handle).__mro__ if getattr(cls, "__slots__", ())], [PokemonHandle])
+        self.assertEqual(PokemonHandle.__slots__, ("pool", "index"))
+        # Evolving in the pool reports whether it happened instead of printing
+        bulbasaur = Bulbasaur()
+        with patch('sys.stdout') as stdout:
+            for _ in range(2):
+                self.assertTrue(pool.evolve(handle.index))
+                bulbasaur._evolve()
+            self.assertFalse(pool.evolve(handle.index))
+        stdout.write.assert_not_called()
+        bulbasaur.to_fixed_point()
+        self.assertEqual((handle.get_name(), handle.get_health(), handle.get_battle_power(), handle.get_defence()),
+                         (bulbasaur.get_name(), bulbasaur.get_health(), bulbasaur.get_battle_power(), bulbasaur.get_defence()))
+
+        for battle_mode in BattleMode:
+            results = []
+            for use_pool in (False, True):
+                random.seed(TestBattle.DEFAULT_SEED)
+                trainer1, trainer2 = Trainer('Gary'), Trainer('Ash')
+                battle = Battle(trainer1, trainer2, battle_mode)
+                trainer1.pick_team('Random')
+                trainer2.pick_team('Random')
+                if use_pool:
+                    # Move both teams into a pool before they are assembled
+                    pool = PokemonPool()
+                    for trainer in (trainer1, trainer2):
+                        team = trainer.get_team()
+                        members = [team[i] for i in range(len(team))]
+                        team.choose_from_pool(pool, [pool.add_pokemon(pokemon) for pokemon in members])
+                battle._assemble_teams()
+                winner = battle.commence_battle()
+                teams = [[(team[i].get_name(), team[i].get_level(), team[i].get_health() / team[i].scale)
+                          for i in range(len(team))] for team in (trainer1.get_team(), trainer2.get_team())]
+                results.append((winner.get_name(), teams))
+            self.assertEqual(results[0], results[1], f"Pool {battle_mode} battle has a different outcome")
+
+    @number("3.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_large_team_battles(self):
+        for battle_mode in BattleMode:
+            random.seed(TestBattle.DEFAULT_SEED)
+            trainer1, trainer2 = Trainer('Gary', team_size=300), Trainer('Ash', team_size=300)
+            battle = Battle(trainer1, trainer2, battle_mode)
+            with patch('sys.stdout'):
+                battle._create_teams()
+                winner = battle.commence_battle()
+            if winner is not None:
+                self.assertGreater(len(winner.get_team()), 0)
+            for trainer in (trainer1, trainer2):
+                if trainer is not winner:
+                    self.assertEqual(len(trainer.get_team()), 0)
+
+
+
+class TestFingerprint(unittest.TestCase):
+    @number("3.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_fingerprints(self):
+        from fingerprint import pokemon_fingerprint, combine
+        from pokemon_pool import PokemonPool
+        # Fingerprints do not depend on the process, the object or how stats are stored
+        self.assertEqual(pokemon_fingerprint(Bulbasaur()), 0xf3180cda12c84217)
+        bulbasaur = Bulbasaur()
+        bulbasaur.to_fixed_point()
+        self.assertEqual(pokemon_fingerprint(bulbasaur), pokemon_fingerprint(Bulbasaur()))
+        pool = PokemonPool()
+        self.assertEqual(pokemon_fingerprint(pool.handle(pool.add(Bulbasaur))), pokemon_fingerprint(Bulbasaur()))
+
+        fingerprints = []
+        for _ in range(2):
+            random.seed(TestBattle.DEFAULT_SEED)
+            battle = Battle(Trainer('Gary'), Trainer('Ash'), BattleMode.ROTATE)
+            battle._create_teams()
+            fingerprints.append(battle.fingerprint())
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertNotEqual(Battle(battle.t_1, battle.t_2, BattleMode.ROTATE, criterion='speed').fingerprint(), fingerprints[1])
+
+        team = battle.t_1.get_team()
+        before = team.fingerprint()
+        pool = PokemonPool()
+        members = [team[i] for i in range(len(team))]
+        pooled = PokeTeam()
+        pooled.choose_from_pool(pool, [pool.add_pokemon(pokemon) for pokemon in members])
+        pooled.assemble_team(BattleMode.ROTATE)
+        self.assertEqual(pooled.fingerprint(), before)
+
+        def rebuilt(order, battle_mode):
+            # A team built from scratch with its members in the given order
+            poketeam = PokeTeam()
+            poketeam.choose_from_roster([team.roster[i] for i in order])
+            poketeam.assemble_team(battle_mode)
+            return poketeam
+
+        # The order of the team is part of its fingerprint, and teams built independently in
+        # the same order have the same fingerprint
+        size = len(team)
+        order = list(range(size))
+        self.assertEqual(rebuilt(order, BattleMode.ROTATE).fingerprint(), before)
+        team.team.append(team.team.serve())
+        rotated = team.fingerprint()
+        self.assertNotEqual(rotated, before)
+        self.assertEqual(rebuilt(order[1:] + order[:1], BattleMode.ROTATE).fingerprint(), rotated)
+        self.assertNotEqual(rebuilt(order, BattleMode.SET).fingerprint(), before)
+        fingerprint = team.member_fingerprint
+        team.special(BattleMode.ROTATE)
+        self.assertNotEqual(team.fingerprint(), rotated)
+        order = order[1:] + order[:1]
+        order[3:] = order[3:][::-1]
+        fresh = rebuilt(order, BattleMode.ROTATE)
+        fresh.fingerprint()
+        self.assertEqual(fingerprint.value(), fresh.member_fingerprint.value())
+        self.assertIs(team.member_fingerprint, fingerprint)
+
+        # A member changed in place is only recorded once it is passed to update_member
+        changed = team.fingerprint()
+        team[1].defend(10)
+        self.assertEqual(team.fingerprint(), changed)
+        team.update_member(team[1])
+        self.assertNotEqual(team.fingerprint(), changed)
+        self.assertEqual(fingerprint.value(), fingerprint.recompute())
+
+        # Battles keep both fingerprints up to date, one change at a time
+        for battle_mode in BattleMode:
+            random.seed(TestBattle.DEFAULT_SEED)
+            battle = Battle(Trainer('Gary', team_size=20), Trainer('Ash', team_size=20), battle_mode)
+            battle._create_teams()
+            battle.fingerprint()
+            fingerprints = [battle.t_1.get_team().member_fingerprint, battle.t_2.get_team().member_fingerprint]
+            battle.commence_battle()
+            for poketeam, fingerprint in zip((battle.t_1.get_team(), battle.t_2.get_team()), fingerprints):
+                self.assertIs(fingerprint.container, poketeam.team)
+                self.assertEqual(len(fingerprint), len(poketeam))
+                self.assertEqual(fingerprint.value(), fingerprint.recompute())
+                self.assertEqual(poketeam.fingerprint(), combine(fingerprint.value(), False))
+
+
+class TestEventSinks(unittest.TestCase):
+    @number("3.18")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_event_sinks(self):
+        from io import StringIO
+        from events import NullSink, TextSink, StructuredSink, EventKind
+        outputs = []
+        for sink in (None, TextSink(StringIO(), buffer_lines=5), NullSink(), StructuredSink()):
+            random.seed(TestBattle.DEFAULT_SEED)
+            battle = Battle(Trainer('Gary'), Trainer('Ash'), BattleMode.SET, sink=sink)
+            with patch('sys.stdout', new_callable=StringIO) as stdout:
+                battle._create_teams()
+                winner = battle.commence_battle()
+            outputs.append((winner.get_name(), stdout.getvalue(), sink))
+
+        printed = outputs[0][1]
+        self.assertIn(" attacks ", printed)
+        self.assertEqual(outputs[1][2].stream.getvalue(), printed)
+        self.assertEqual([output[1] for output in outputs[1:]], ["", "", ""])
+        self.assertEqual(len({output[0] for output in outputs}), 1)
+
+        # Every event but the end of a turn is printed as one line
+        events = [event for event in outputs[3][2].events if event.kind != EventKind.END_TURN]
+        self.assertEqual(len(events), len(printed.splitlines()))
+        attack = events[0]
+        self.assertEqual(attack.kind, EventKind.ATTACK)
+        self.assertEqual(printed.splitlines()[0], f"{attack.subject} attacks {attack.target}: {attack.target} has {round(attack.value)} health")
+
+
+    @number("3.19")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_binary_log_replay(self):
+        from battle_log import BinaryLogSink, replay, HEADER, RECORD
+        for battle_mode in BattleMode:
+            random.seed(TestBattle.DEFAULT_SEED)
+            trainer1, trainer2 = Trainer('Gary', team_size=30), Trainer('Ash', team_size=30)
+            sink = BinaryLogSink()
+            battle = Battle(trainer1, trainer2, battle_mode, sink=sink)
+            battle._create_teams()
+            rosters = [trainer.get_team().roster for trainer in (trainer1, trainer2)]
+            winner = battle.commence_battle()
+            self.assertEqual((len(sink.log) - HEADER.size) % RECORD.size, 0)
+
+            # Regenerate the starting teams from the rosters, assembled the same way
+            teams = []
+            for roster in rosters:
+                team = PokeTeam(team_size=30)
+                team.choose_from_roster(roster)
+                team.assemble_team(battle_mode)
+                if battle_mode == BattleMode.OPTIMISE:
+                    team.assign_team('health')
+                teams.append(team)
+            result = replay(sink.log, teams)
+            self.assertEqual(result.winner, [trainer1, trainer2].index(winner) if winner else None)
+            for trainer, survivors in zip((trainer1, trainer2), result.teams):
+                self.assertEqual([(pokemon.get_name(), pokemon.get_level(), pokemon.get_health() / pokemon.scale) for pokemon in trainer.get_team()],
+                                 [(pokemon.get_name(), pokemon.get_level(), pokemon.get_health() / pokemon.scale) for pokemon in survivors])
+
+            # A log only replays with the teams it was recorded with
+            teams.reverse()
+            self.assertRaises(ValueError, replay, sink.log, teams)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
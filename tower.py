@@ -1,5 +1,6 @@
 from poke_team import Trainer, PokeTeam
 from battle import *
+from events import EventSink, TextSink
 from enum import Enum
 from data_structures.stack_adt import ArrayStack
 from data_structures.queue_adt import CircularQueue
@@ -18,12 +19,13 @@ class BattleTower:
     MIN_LIVES = 2
     MAX_LIVES = 10
 
-    def __init__(self) -> None:
+    def __init__(self, sink: EventSink = None) -> None:
         """
         Initialize a BattleTower instance.
 
         Args:
-            None
+            sink (EventSink): The sink the battles and their results are reported to. By default
+                they are printed, in batches of lines written at the end of each battle.
 
         Returns:
             None
@@ -32,10 +34,12 @@ class BattleTower:
             player_trainer (Trainer): The player's trainer instance.
             enemy_trainers (None): Queue of enemy trainers.
             defeated_counter (int): Counter to track the number of defeated enemy trainers.
+            sink (EventSink): The sink the battles and their results are reported to.
         """
         self.player_trainer = Trainer('default name')  # Initialize player's trainer
         self.enemy_trainers = None  # Initialize enemy trainers
         self.defeated_counter = 0  # Initialize counter for defeated enemy trainers
+        self.sink = sink if sink is not None else TextSink()  # Where battles are reported
 
         # Seed the random number generator
         random.seed(20)
@@ -124,6 +128,12 @@ class BattleTower:
         In this scenario, the loop will iterate through all the Pokémon in both teams.
         Overall, the worst-case time complexity is O(n+m), where n is the maximum number of Pokémon in one team, and m is the number of pokemon in the other team.
 
+        The tower owns the enemy trainers it generates, so the Pokemon an enemy battled with are
+        given back to be reused when its team is regenerated. Sinks should keep what they need to
+        know about a Pokemon (its name or health, as the sinks in events do) rather than the
+        Pokemon itself. The player's trainer belongs to the caller, so its old Pokemon are never
+        reused.
+
         Returns:
             Tuple[Trainer, Trainer, Trainer, int, int]: A tuple containing information about the battle, including 
             the winner trainer, the names of the trainers involved, and the remaining lives of each trainer.
@@ -138,7 +148,7 @@ class BattleTower:
         l_2 = trainer2[1]  # Enemy trainer's lives
 
         # Create a battle instance between the two trainers
-        b = Battle(t_1, t_2, BattleMode.ROTATE)
+        b = Battle(t_1, t_2, BattleMode.ROTATE, sink=self.sink)
         b.teams = (b.t_1.pokemon_team.team, b.t_2.pokemon_team.team)
         
         # Commence the battle and determine the winner
@@ -146,32 +156,34 @@ class BattleTower:
 
         # Process the outcome of the battle
         if winner == t_1:  # Player wins
-            print('You win!')
+            self.sink.battle_result(True)
             self.defeated_counter += 1
             new_lives_t2 = l_2 - 1  # Decrease enemy trainer's lives
             new_tuple2 = (t_2, new_lives_t2)
             new_tuple1 = (t_1, l_1)
         elif winner == t_2:  # Enemy wins
-            print('Enemy wins.')
+            self.sink.battle_result(False)
             new_lives_t1 = l_1 - 1  # Decrease player trainer's lives
             new_tuple1 = (t_1, new_lives_t1)
             new_tuple2 = (t_2, l_2)
 
         # Check if enemy trainer has remaining lives
         if new_tuple2[1] > 0:
-            # Regenerate enemy trainer's team
-            new_tuple2[0].pokemon_team.regenerate_team(BattleMode.ROTATE)
+            # Regenerate enemy trainer's team. The tower made the enemy trainers and the battle is
+            # over, so nothing else holds their old Pokemon and they can be reused
+            new_tuple2[0].pokemon_team.regenerate_team(BattleMode.ROTATE, recycle=True)
             self.enemy_trainers.append(new_tuple2)
         else:
-            print(f"{t_2.get_name()} is out of lives")
+            self.sink.out_of_lives(t_2, False)
 
         # Check if player trainer has remaining lives
         if new_tuple1[1] > 0:
             new_tuple1[0].pokemon_team.regenerate_team(BattleMode.ROTATE)
         else:
-            print("You are out of lives")
+            self.sink.out_of_lives(t_1, True)
 
-        print(f"Defeated enemies: {self.defeated_counter}")
+        self.sink.defeated(self.defeated_counter)
+        self.sink.flush()
         
         # Return battle results
         return (winner.get_name(), t_1.get_name(), t_2.get_name(), new_tuple1[1], new_tuple2[1])